@@ -7,13 +7,18 @@ Checks files modified within the last 2 days for comprehensive coverage.
 
 import os
 import re
+import sys
 import json
+import argparse
 import subprocess
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import List, Dict, Any, Tuple
 from dataclasses import dataclass
 
+# git_changes and diff_scope are shared with the main hooks in <project root>/hooks
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'hooks'))
+
 @dataclass
 class ValidationViolation:
     file_path: str
@@ -49,6 +54,18 @@ class CodeValidator:
             print(f"Error getting modified files: {e}")
             return []
 
+    def get_uncommitted_files(self) -> List[str]:
+        """Get modified, added and untracked files by reading .git/index in-process"""
+        try:
+            from git_changes import detect_changes
+            
+            changes = detect_changes(self.project_root, ('.cs', '.ts', '.tsx'), {'node_modules', 'bin', 'obj'})
+            print(f"Git index: {len(changes.modified)} modified, {len(changes.added)} added, {len(changes.untracked)} untracked")
+            return changes.all()
+        except Exception as e:
+            print(f"Error reading git index: {e}")
+            return []
+
     def validate_single_class_per_file(self, file_path: str) -> List[ValidationViolation]:
         """Validate that each file contains only one public class"""
         violations = []
@@ -78,8 +95,9 @@ class CodeValidator:
         except Exception as e:
             print(f"Error validating {file_path}: {e}")
             
-        return violations    def 
-validate_xml_documentation(self, file_path: str) -> List[ValidationViolation]:
+        return violations
+
+    def validate_xml_documentation(self, file_path: str) -> List[ValidationViolation]:
         """Validate XML documentation for public members"""
         violations = []
         
@@ -177,8 +195,9 @@ validate_xml_documentation(self, file_path: str) -> List[ValidationViolation]:
         except Exception as e:
             print(f"Error validating secrets in {file_path}: {e}")
             
-        return violations    def
- validate_incomplete_implementations(self, file_path: str) -> List[ValidationViolation]:
+        return violations
+
+    def validate_incomplete_implementations(self, file_path: str) -> List[ValidationViolation]:
         """Validate no incomplete implementations"""
         violations = []
         
@@ -215,8 +234,8 @@ validate_xml_documentation(self, file_path: str) -> List[ValidationViolation]:
             
         return violations
 
-    def validate_all_files(self, files: List[str]) -> Dict[str, Any]:
-        """Run all validations on the provided files"""
+    def validate_all_files(self, files: List[str], diff=None) -> Dict[str, Any]:
+        """Run all validations on the provided files, keeping only violations on changed lines when given a DiffScope"""
         all_violations = []
         
         for file_path in files:
@@ -230,6 +249,13 @@ validate_xml_documentation(self, file_path: str) -> List[ValidationViolation]:
             file_violations.extend(self.validate_hardcoded_secrets(file_path))
             file_violations.extend(self.validate_incomplete_implementations(file_path))
             
+            if diff is not None:
+                with open(self.project_root / file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                    content = f.read()
+                changed = diff.changed(file_path, content)
+                diff.record(file_path, content)
+                file_violations = [v for v in file_violations if changed.contains(v.line_number)]
+                
             all_violations.extend(file_violations)
             
         # Categorize violations
@@ -254,8 +280,9 @@ validate_xml_documentation(self, file_path: str) -> List[ValidationViolation]:
             },
             'compliance_score': round(compliance_score, 1),
             'violations': all_violations
-        }    def g
-enerate_report(self, results: Dict[str, Any]) -> str:
+        }
+
+    def generate_report(self, results: Dict[str, Any]) -> str:
         """Generate a formatted validation report"""
         violations = results['violations']
         
@@ -297,6 +324,14 @@ enerate_report(self, results: Dict[str, Any]) -> str:
 
 def main():
     """Main execution function"""
+    parser = argparse.ArgumentParser(description='MeAndMyDog Code Validation Hook')
+    parser.add_argument('--changes', choices=['index', 'commits'], default='index',
+                        help='find changed files from the git index and working tree (default) or from commits in the last 2 days')
+    parser.add_argument('--diff', action='store_true', help='report only violations on lines changed since --diff-base')
+    parser.add_argument('--diff-base', choices=['head', 'index', 'snapshot'], default='head',
+                        help='with --diff, compare against HEAD (default), the git index, or the last --diff snapshot')
+    args = parser.parse_args()
+    
     print("Starting validation hook...")
     project_root = os.getcwd()
     print(f"Working directory: {project_root}")
@@ -305,9 +340,13 @@ def main():
     print("🔍 MeAndMyDog Code Validation Hook")
     print("=" * 50)
     
-    # Get recently modified files
-    print("📁 Getting recently modified files (last 2 days)...")
-    modified_files = validator.get_recently_modified_files(days=2)
+    # Get changed files
+    if args.changes == 'index':
+        print("📁 Getting uncommitted changes from the git index...")
+        modified_files = validator.get_uncommitted_files()
+    else:
+        print("📁 Getting recently modified files (last 2 days)...")
+        modified_files = validator.get_recently_modified_files(days=2)
     
     if not modified_files:
         print("ℹ️  No recently modified files found via git. Checking all C# and TypeScript files...")
@@ -336,7 +375,12 @@ def main():
     
     # Run validation
     print("🔍 Running validation checks...")
-    results = validator.validate_all_files(modified_files)
+    diff = None
+    if args.diff:
+        from diff_scope import DiffScope
+        
+        diff = DiffScope(Path(project_root), args.diff_base)
+    results = validator.validate_all_files(modified_files, diff)
     
     # Generate and save report
     report = validator.generate_report(results)
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Startup budget tests for the code validation hook.
+A per-save run validates one file in a fresh interpreter, so its cold start
+must stay within the budget over a bare interpreter, and its imports must
+not grow past the -X importtime baseline recorded next to this file.
+Run from the project root: python -m unittest discover -s hooks/benchmarks
+Re-record the baseline after an intended import change with:
+python hooks/validation-benchmark.py startup --record-importtime
+"""
+
+import importlib.util
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+def load_benchmarks():
+    """Import validation-benchmark.py, whose hyphenated name rules out a plain import"""
+    spec = importlib.util.spec_from_file_location('validation_benchmark',
+                                                  Path(__file__).resolve().parents[1] / 'validation-benchmark.py')
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+benchmarks = load_benchmarks()
+
+class StartupTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cls.bare, cls.cold, cls.importtime = benchmarks.measure_startup(
+                Path(temp_dir) / 'corpus', files=200, seed=0, dependency_files=2000, repeat=5)
+
+    def test_one_file_run_within_budget(self):
+        overhead_ms = (self.cold - self.bare) * 1000
+        self.assertLessEqual(overhead_ms, benchmarks.STARTUP_BUDGET_MS,
+                             f"single-file validation took {overhead_ms:.0f} ms over the bare interpreter")
+
+    def test_imports_within_recorded_baseline(self):
+        baseline = benchmarks.IMPORTTIME_BASELINE.read_text(encoding='utf-8')
+        self.assertEqual(benchmarks.importtime_regressions(baseline, self.importtime), [])
+
+if __name__ == '__main__':
+    unittest.main()
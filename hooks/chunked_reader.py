@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Bounded-memory chunked reads of large source files for the code validation hook.
+A file over the size threshold is read a fixed number of characters at a
+time and handed to the rules as a series of chunks instead of one string.
+Every chunk holds whole lines and starts with the last few lines of the
+previous chunk as read-only context, so rules that look at the lines above a
+match (XML documentation) still see them; rule patterns only search the
+chunk's own lines, so nothing is reported twice.
+
+C# chunks are only cut at line breaks that no lexer token spans: a cut never
+falls inside a block comment or a verbatim or raw string, so the spans lexed
+from a chunk are the spans the whole file would have. A token longer than a
+chunk makes that chunk grow until it holds the token.
+
+Matches cannot cross from one chunk into the next, so chunked results equal
+whole-file results for rule patterns that do not span line breaks, the same
+constraint the secret scanner places on its patterns.
+"""
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, TextIO
+
+import csharp_lexer
+
+@dataclass
+class Chunk:
+    """Whole lines of a file: context lines from before the chunk, then the chunk's own lines"""
+    text: str
+    first_line: int  # 1-based line number of the first line of text
+    start: int  # offset in text where the chunk's own lines begin
+    spans: Optional[List[csharp_lexer.Span]] = None  # lexer spans of the own lines, as offsets in text
+
+    @property
+    def own(self) -> str:
+        """The chunk's own lines, which consecutive chunks tile without overlap"""
+        return self.text[self.start:]
+
+def safe_cut(text: str, spans: Optional[List[csharp_lexer.Span]], limit: int) -> int:
+    """Offset just past the last line break before limit that no token spans, or 0 when there is none"""
+    cut = text.rfind('\n', 0, limit) + 1
+    if spans is None:
+        return cut
+    ends = [end for _, end, _ in spans]
+    while cut:
+        index = bisect_right(ends, cut - 1)
+        if index == len(spans) or spans[index][0] > cut - 1:
+            return cut
+        # The line break belongs to a multi-line token: cut before the line the token starts on
+        cut = text.rfind('\n', 0, spans[index][0]) + 1
+    return 0
+
+def iter_chunks(handle: TextIO, chunk_chars: int, context_lines: int, lex: bool = False) -> Iterator[Chunk]:
+    """Chunks of about chunk_chars characters read from a text handle; lex cuts C# only between tokens"""
+    context: List[str] = []
+    first_line = 1  # line number of the first pending line
+    pending = ''
+    limit = chunk_chars
+    at_end = False
+    yielded = False
+    while True:
+        while not at_end and len(pending) < limit:
+            piece = handle.read(chunk_chars)
+            at_end = not piece
+            pending += piece
+        if at_end and yielded and not pending:
+            return
+        spans = csharp_lexer.lex(pending) if lex else None
+        cut = len(pending) if at_end else safe_cut(pending, spans, limit)
+        if not at_end and not cut:
+            # No line break to cut at yet: read on until the line or token ends
+            limit = len(pending) + chunk_chars
+            continue
+
+        own = pending[:cut]
+        prefix = ''.join(line + '\n' for line in context)
+        if spans is not None:
+            spans = [(start + len(prefix), end + len(prefix), kind) for start, end, kind in spans if start < cut]
+        yield Chunk(prefix + own, first_line - len(context), len(prefix), spans)
+        yielded = True
+        if at_end:
+            return
+
+        lines = own[:-1].rsplit('\n', context_lines)
+        context = (context + lines)[-context_lines:] if context_lines else []
+        first_line += own.count('\n')
+        pending = pending[cut:]
+        limit = chunk_chars
@@ -5,470 +5,2799 @@ Validates code against established standards and architecture rules.
 Checks files modified within the last 2 days for comprehensive coverage.
 """
 
+import io
 import os
 import re
 import json
-import subprocess
+import contextlib
+import time
+import hashlib
+import argparse
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import accumulate
 from pathlib import Path
-from typing import List, Dict, Any, Tuple
-from dataclasses import dataclass
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Pattern, Tuple
+from dataclasses import dataclass, field
 
-@dataclass
-class ValidationViolation:
-    file_path: str
-    line_number: int
+import csharp_lexer
+import generated_code
+import lazy_regex
+import secret_scanner
+from violation_baseline import BASELINE_FILE, CONTEXT_LINES
+
+# Per-save runs start a fresh interpreter, so modules only some runs need (the process pool, the daemon's
+# sockets, git subprocesses, the Razor tokenizer) are imported where they are used
+
+@dataclass(frozen=True)
+class ViolationKind:
+    """Rule metadata shared by every violation of the same type"""
     violation_type: str
     severity: str  # 'error', 'warning', 'info'
     rule_id: str
-    message: str
-    suggestion: str
+
+@lru_cache(maxsize=None)
+def violation_kind(violation_type: str, severity: str, rule_id: str) -> ViolationKind:
+    return ViolationKind(violation_type, severity, rule_id)
+
+# One copy of each file path, message and suggestion, however many violations repeat it
+_SHARED_STRINGS: Dict[str, str] = {}
+
+def shared_string(value: str) -> str:
+    return _SHARED_STRINGS.setdefault(value, value)
+
+class ValidationViolation:
+    """A single violation: a slotted record pointing at shared metadata and strings"""
+    
+    FIELDS = ('file_path', 'line_number', 'violation_type', 'severity', 'rule_id', 'message', 'suggestion')
+    __slots__ = ('file_path', 'line_number', 'kind', 'message', 'suggestion')
+    
+    def __init__(self, file_path: str, line_number: int, violation_type: str, severity: str, rule_id: str,
+                 message: str, suggestion: str):
+        self.file_path = shared_string(file_path)
+        self.line_number = line_number
+        self.kind = violation_kind(violation_type, severity, rule_id)
+        self.message = shared_string(message)
+        self.suggestion = shared_string(suggestion)
+        
+    @property
+    def violation_type(self) -> str:
+        return self.kind.violation_type
+        
+    @property
+    def severity(self) -> str:
+        return self.kind.severity
+        
+    @property
+    def rule_id(self) -> str:
+        return self.kind.rule_id
+        
+    def astuple(self) -> Tuple[Any, ...]:
+        return (self.file_path, self.line_number, self.kind.violation_type, self.kind.severity, self.kind.rule_id,
+                self.message, self.suggestion)
+        
+    def to_dict(self) -> Dict[str, Any]:
+        """Field name to value, in declaration order, for JSON output"""
+        return dict(zip(self.FIELDS, self.astuple()))
+        
+    def __reduce__(self):
+        # Rebuild through __init__ so violations from worker processes share metadata again
+        return ValidationViolation, self.astuple()
+        
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, ValidationViolation):
+            return NotImplemented
+        return self.astuple() == other.astuple()
+        
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return 'ValidationViolation(' + ', '.join(f'{name}={value!r}' for name, value in self.to_dict().items()) + ')'
+
+@dataclass(frozen=True)
+class ScanPattern:
+    """A compiled rule pattern and the lowercase literals at least one of which every match contains"""
+    regex: Pattern
+    triggers: Tuple[str, ...]
+    description: str = ''
+    scope: str = 'text'  # C# spans searched: 'text', 'code', 'comments', 'strings' or 'literals'
+    min_entropy: float = 0.0  # secret patterns: bits per character the 'value' group must reach
+
+@dataclass(frozen=True)
+class Rule:
+    """A registered rule: the check that runs it, the files it applies to and the patterns that gate it"""
+    rule_id: str
+    check: str
+    severity: str  # 'error', 'warning', 'info'
+    extensions: Optional[Tuple[str, ...]]  # None = every file
+    patterns: Tuple[ScanPattern, ...]
+    violation_type: str = ''
+    message: str = ''
+    suggestion: str = ''
+    cross_file: bool = False  # checked against the symbol index after the per-file rules, never cached
+    checks_generated: bool = False  # also runs on generated code, which every other rule skips
+    file_scoped: bool = False  # violations concern the whole file, whatever line they name
+    triggers: Tuple[str, ...] = field(init=False)
+
+    def __post_init__(self):
+        # A pattern without trigger literals cannot be prefiltered, so neither can its rule
+        if any(not pattern.triggers for pattern in self.patterns):
+            triggers = ()
+        else:
+            triggers = tuple(t for pattern in self.patterns for t in pattern.triggers)
+        object.__setattr__(self, 'triggers', triggers)
+
+class RuleRegistry:
+    """Rules in report order, indexed by id and, on first use, by file extension"""
+    
+    def __init__(self, rules: List[Rule]):
+        self.rules = list(rules)
+        self._by_id = {rule.rule_id: rule for rule in self.rules}
+        self._by_extension: Dict[str, Tuple[Rule, ...]] = {}
+        
+    def __getitem__(self, rule_id: str) -> Rule:
+        return self._by_id[rule_id]
+        
+    def for_extension(self, extension: str) -> Tuple[Rule, ...]:
+        """Rules that apply to files with an extension, so a .cshtml file never enters C#-only rules"""
+        rules = self._by_extension.get(extension)
+        if rules is None:
+            rules = tuple(rule for rule in self.rules if rule.extensions is None or extension in rule.extensions)
+            self._by_extension[extension] = rules
+        return rules
+
+@dataclass
+class FileContext:
+    """A source file read and decoded once, shared by every validation rule"""
+    file_path: str
+    extension: str
+    content: str
+    prefilter: bool = True
+    lexer: bool = True
+    count_matches: bool = False
+    match_count: int = 0
+    _lines: Optional[List[str]] = None
+    _line_starts: Optional[List[int]] = None
+    _folded: Optional[str] = None
+    windows: Optional[List[Tuple[int, int]]] = None  # diff-scoped runs and chunks: offset ranges rule patterns search
+    first_line: int = 1  # chunks of large files: line number of the content's first line
+    _spans: Optional[List[Tuple[int, int, str]]] = None
+    _blanked: Optional[str] = None
+    _views: Dict[Tuple[str, bool], str] = field(default_factory=dict)
+    # Chunks of large files: index of the rule pattern behind each violation, by id, to restore whole-file order
+    pattern_ranks: Optional[Dict[int, int]] = None
+
+    @property
+    def lines(self) -> List[str]:
+        """Content split into lines, built on first use"""
+        if self._lines is None:
+            self._lines = self.content.split('\n')
+        return self._lines
+
+    @property
+    def line_starts(self) -> List[int]:
+        """Offset of the first character of every line, built once per file"""
+        if self._line_starts is None:
+            self._line_starts = [0]
+            self._line_starts.extend(accumulate(len(line) + 1 for line in self.lines[:-1]))
+        return self._line_starts
+
+    def line_number(self, offset: int) -> int:
+        """1-based line number of a character offset"""
+        return bisect_right(self.line_starts, offset) + self.first_line - 1
+
+    def position(self, offset: int) -> Tuple[int, int]:
+        """1-based (line, column) of a character offset"""
+        line_number = self.line_number(offset)
+        return line_number, offset - self.line_starts[line_number - self.first_line] + 1
+
+    def line_text(self, line_number: int) -> str:
+        """Text of a 1-based line without its line terminator"""
+        return self.lines[line_number - self.first_line].rstrip('\r')
+
+    def violation(self, offset: int, pattern_index: int = 0, **fields) -> ValidationViolation:
+        """Create a violation located at a character offset, found by the rule pattern at pattern_index"""
+        violation = ValidationViolation(file_path=self.file_path, line_number=self.line_number(offset), **fields)
+        if self.pattern_ranks is not None:
+            self.pattern_ranks[id(violation)] = pattern_index
+        return violation
+
+    @property
+    def folded(self) -> str:
+        """Case-folded content for trigger literal searches, built on first use"""
+        if self._folded is None:
+            self._folded = self.content.casefold()
+        return self._folded
+
+    def contains_any(self, literals: Tuple[str, ...]) -> bool:
+        """Fast substring check of lowercase literals against the case-folded content (none = always)"""
+        if not self.prefilter or not literals:
+            return True
+        folded = self.folded
+        return any(literal in folded for literal in literals)
+
+    def view(self, scope: str, whole_file: bool = False) -> str:
+        """C# content with the spans outside a scope blanked, offsets kept; other files are never masked.
+        Diff-scoped views only mask the windows and leave the rest blank, unless whole_file is set"""
+        if scope == 'text' or not self.lexer or self.extension != '.cs':
+            return self.content
+        regions = None if whole_file else self.windows
+        view = self._views.get((scope, regions is None))
+        if view is None:
+            if self._spans is None:
+                self._spans = csharp_lexer.lex(self.content)
+            if self._blanked is None:
+                self._blanked = csharp_lexer.blank(self.content)
+            view = csharp_lexer.mask(self.content, self._spans, csharp_lexer.SCOPES[scope], regions, self._blanked)
+            self._views[(scope, regions is None)] = view
+        return view
+
+    def restrict_to_lines(self, ranges: Iterable[Tuple[int, int]]):
+        """Limit pattern searches to 1-based inclusive line ranges"""
+        line_starts = self.line_starts
+        first = self.first_line
+        self._views.clear()
+        self.windows = [(line_starts[start - first],
+                         line_starts[end - first + 1] - 1 if end - first + 1 < len(line_starts) else len(self.content))
+                        for start, end in ranges]
+
+    def regions(self) -> List[Tuple[int, int]]:
+        """Offset ranges rule patterns search: the diff windows, or the whole file"""
+        return self.windows if self.windows is not None else [(0, len(self.content))]
+
+    def finditer(self, pattern: ScanPattern, whole_file: bool = False) -> Iterator[Any]:
+        """Matches of a rule pattern in its scope, confirmed by regex only when a trigger literal is present;
+        whole_file ignores diff windows for rules that need every match, such as class counts"""
+        if not self.contains_any(pattern.triggers):
+            return iter(())
+        view = self.view(pattern.scope, whole_file)
+        if self.windows is None or whole_file:
+            matches = pattern.regex.finditer(view)
+        else:
+            matches = (match for start, end in self.windows for match in pattern.regex.finditer(view, start, end))
+        return self._counted(matches) if self.count_matches else matches
+
+    def _counted(self, matches: Iterator[Any]) -> Iterator[Any]:
+        """Pass matches through, tallying them for the run profile"""
+        for match in matches:
+            self.match_count += 1
+            yield match
+
+def parse_public_declaration(line: str) -> Optional[Tuple[str, str]]:
+    """(kind, name) of a public type or member declared on a line, in time linear in its length"""
+    words = line.split()
+    position = 0
+    while position < len(words) and words[position] in DECLARATION_MODIFIERS:
+        position += 1
+    if position == len(words):
+        return None
+        
+    keyword = words[position]
+    if keyword in TYPE_KEYWORDS:
+        kind = keyword
+        if keyword == 'record' and position + 1 < len(words) and words[position + 1] in ('class', 'struct'):
+            position += 1
+            kind = f'record {words[position]}'
+        if position + 1 == len(words):
+            return None
+        name = re.match(r'\w*', words[position + 1]).group(0)
+        return (kind, name) if name else None
+        
+    # Members: the identifier right before the parameter list, body, initializer or terminator
+    text = ' '.join(words[position:])
+    cut = len(text)
+    for terminator in '({=;':
+        index = text.find(terminator)
+        if index != -1:
+            cut = min(cut, index)
+    head = text[:cut].rstrip()
+    if head.endswith(']') and 'this[' in head:
+        return ('member', 'this')
+    if head.endswith('>'):
+        # Drop a generic parameter list such as Get<T>
+        depth = 0
+        for index in range(len(head) - 1, -1, -1):
+            depth += {'>': 1, '<': -1}.get(head[index], 0)
+            if depth == 0:
+                head = head[:index].rstrip()
+                break
+    end = len(head)
+    start = end
+    while start > 0 and (head[start - 1].isalnum() or head[start - 1] == '_'):
+        start -= 1
+    name = head[start:end]
+    return ('member', name) if name and not name[0].isdigit() else None
+
+def has_xml_doc_above(ctx: 'FileContext', line_number: int) -> bool:
+    """Whether a /// block precedes a line, looking past attributes, directives and blank lines. An attribute
+    spanning lines is walked up to its opening bracket by counting the brackets and parentheses it closes"""
+    depth = 0  # brackets and parentheses closed below the current line and not yet opened
+    for previous in range(line_number - 1, max(0, line_number - 1 - XML_DOC_LOOKBACK_LINES), -1):
+        text = ctx.line_text(previous).strip()
+        if text.startswith('///'):
+            return True
+        if depth or text.startswith('[') or text.endswith(']'):
+            depth = max(0, depth + text.count(']') + text.count(')') - text.count('[') - text.count('('))
+            continue
+        if not text or text.startswith('#'):
+            continue
+        return False
+    return False
+
+def nearby_lines(ctx: FileContext, line_numbers: Iterable[int]) -> Dict[int, str]:
+    """Text of the lines a baseline fingerprint hashes around each 1-based line number, '' past either end"""
+    count = len(ctx.lines)
+    return {number: ctx.line_text(number) if 1 <= number <= count else ''
+            for line_number in line_numbers
+            for number in range(line_number - CONTEXT_LINES, line_number + CONTEXT_LINES + 1)}
+
+def iter_chunk_contexts(path: Path, file_path: str, chunk_chars: int, lexer: bool = True,
+                        **options) -> Iterator[FileContext]:
+    """Contexts over consecutive chunks of a large file, read in bounded memory; each searches only its own
+    lines and keeps the XML documentation lookback's worth of preceding lines as context"""
+    import chunked_reader
+    
+    extension = os.path.splitext(file_path)[1].lower()
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        for chunk in chunked_reader.iter_chunks(f, chunk_chars, XML_DOC_LOOKBACK_LINES,
+                                                lex=lexer and extension == '.cs'):
+            yield FileContext(file_path=file_path, extension=extension, content=chunk.text, lexer=lexer,
+                              windows=[(chunk.start, len(chunk.text))], first_line=chunk.first_line,
+                              _spans=chunk.spans, **options)
+
+# Source files the validator looks at, and directories it never descends into; config files only get the secret scan
+CODE_EXTENSIONS = ('.cs', '.ts', '.tsx', '.cshtml')
+CONFIG_EXTENSIONS = ('.json', '.config')
+SOURCE_EXTENSIONS = CODE_EXTENSIONS + CONFIG_EXTENSIONS
+EXCLUDED_DIRS = {'node_modules', 'bin', 'obj', '.git', 'packages', '.validation-cache'}
+# The hook's own output, which would otherwise be validated as a config file
+EXCLUDED_FILES = {BASELINE_FILE}
+EXCLUDED_SUBDIRS = {('wwwroot', 'lib')}
+
+def is_pruned_dir(relative_dir: str, name: str) -> bool:
+    """Whether the walker skips a directory, given its parent's relative path"""
+    return name in EXCLUDED_DIRS or (os.path.basename(relative_dir), name) in EXCLUDED_SUBDIRS
+
+# Rule patterns, compiled once per process
+CLASS_DECLARATION = ScanPattern(
+    lazy_regex.compile(r'^[ \t]*(?:\[[^\]\n]*\][ \t]*)*public\s+(?:partial\s+)?class\s+(\w+)', re.MULTILINE),
+    ('class',), scope='code')
+PUBLIC_DECLARATION = ScanPattern(lazy_regex.compile(r'^[ \t]*public\b[^\n]*', re.MULTILINE), ('public',), scope='code')
+DECLARATION_MODIFIERS = {
+    'public', 'static', 'virtual', 'override', 'abstract', 'sealed', 'async', 'readonly', 'new', 'extern',
+    'unsafe', 'required', 'const', 'volatile', 'event', 'implicit', 'explicit', 'partial', 'file', 'ref'
+}
+TYPE_KEYWORDS = {'class', 'record', 'interface', 'enum', 'struct'}
+# Lines walked back over when looking for a /// block above a declaration
+XML_DOC_LOOKBACK_LINES = 20
+# Files of at least this many bytes are read and validated in chunks of LARGE_FILE_CHUNK_CHARS characters
+LARGE_FILE_THRESHOLD = 128 * 1024
+LARGE_FILE_CHUNK_CHARS = 64 * 1024
+# Checks that parse a file as a whole; files they apply to are always read in one piece
+WHOLE_FILE_CHECKS = ('_check_inline_css_javascript',)
+# Lines around each changed hunk that diff-scoped runs scan too, so matches that start just outside it are seen
+DIFF_CONTEXT_LINES = 3
+CONSOLE_STATEMENT = ScanPattern(
+    lazy_regex.compile(r'console\.(log|error|warn|info|debug)\s*\(', re.MULTILINE),
+    ('console.',))
+SECRET_PATTERNS = [
+    ScanPattern(lazy_regex.compile(r'password123', re.IGNORECASE), ('password123',), 'hardcoded test password', 'literals'),
+    ScanPattern(lazy_regex.compile(r'admin["\'\s]*:["\'\s]*admin', re.IGNORECASE), ('admin',), 'hardcoded admin credentials', 'literals'),
+    ScanPattern(lazy_regex.compile(r'test@example\.com', re.IGNORECASE), ('test@example.com',), 'hardcoded test email', 'literals'),
+    ScanPattern(lazy_regex.compile(r'default-secret-key', re.IGNORECASE), ('default-secret-key',), 'hardcoded default secret', 'literals'),
+    ScanPattern(lazy_regex.compile(r'localhost.*password', re.IGNORECASE), ('localhost',), 'hardcoded localhost password', 'literals'),
+    ScanPattern(lazy_regex.compile(r'-----BEGIN (?:[A-Z]+ )*PRIVATE KEY-----'), ('-----begin',), 'private key block', 'literals'),
+    ScanPattern(lazy_regex.compile(r'\beyJ[\w-]{10,}\.eyJ[\w-]{10,}\.[\w-]{10,}'), ('eyj',), 'JSON web token', 'literals'),
+    ScanPattern(lazy_regex.compile(r'\bAIza[\w-]{35}'), ('aiza',), 'Google API key', 'literals'),
+]
+# Generic detectors, run after every specific signature (configured ones included) so those name the finding
+GENERIC_SECRET_PATTERNS = [
+    ScanPattern(lazy_regex.compile(r'(?:^|[;"\'])\s*(?:password|pwd)\s*=\s*(?P<value>[^;"\'\s]{4,})', re.IGNORECASE | re.MULTILINE),
+                ('password', 'pwd'), 'connection string password', 'literals'),
+    ScanPattern(lazy_regex.compile(r'(?:secret|token|api_?key|passw(?:or)?d)\w*["\']?\s*[:=]\s*["\'](?P<value>[^"\'\s]{16,})["\']',
+                           re.IGNORECASE),
+                ('secret', 'token', 'apikey', 'api_key', 'password', 'passwd'), 'high-entropy credential value',
+                min_entropy=3.5),
+]
+INCOMPLETE_PATTERNS = [
+    ScanPattern(lazy_regex.compile(r'throw new NotImplementedException', re.IGNORECASE), ('notimplementedexception',), 'NotImplementedException found', 'code'),
+    ScanPattern(lazy_regex.compile(r'\/\/\s*TODO', re.IGNORECASE), ('todo',), 'TODO comment found', 'comments'),
+    ScanPattern(lazy_regex.compile(r'\/\/\s*FIXME', re.IGNORECASE), ('fixme',), 'FIXME comment found', 'comments'),
+    ScanPattern(lazy_regex.compile(r'\/\/\s*HACK', re.IGNORECASE), ('hack',), 'HACK comment found', 'comments')
+]
+# Gate for the Razor tokenizer: a view without any of these cannot hold inline CSS or JavaScript
+INLINE_MARKUP = ScanPattern(lazy_regex.compile(r'<style\b|<script\b|\bstyle\s*=|\bon\w+\s*=', re.IGNORECASE),
+                            ('<style', '<script', 'style', 'on'))
+EVENT_HANDLER_NAME = lazy_regex.compile(r'on\w+')
+RAZOR_VARIABLE_SCRIPT = lazy_regex.compile(r'^\s*var\s+\w+\s*=\s*@')
+NAMESPACE_DECLARATION = lazy_regex.compile(r'^[ \t]*namespace\s+([\w.]+)', re.MULTILINE)
+DBSET_PROPERTY = ScanPattern(lazy_regex.compile(r'\bDbSet<\s*(\w+)\s*>'), ('dbset<',))
+USING_ALIAS = lazy_regex.compile(r'^[ \t]*using\s+(\w+)\s*=\s*([\w.]+)\s*;', re.MULTILINE)
+ENTITY_CONFIGURATION = lazy_regex.compile(r'\b(?:Entity|IEntityTypeConfiguration)<\s*(\w+)')
+HAS_KEY = ScanPattern(lazy_regex.compile(r'\.HasKey\s*\('), ('haskey',))
+CLASS_BASE = lazy_regex.compile(r'[ \t]*(?:<[^>\n]*>)?[ \t]*(?:\([^)\n]*\))?[ \t]*:[ \t]*([\w.]+)')
+PROPERTY_DECLARATION = ScanPattern(
+    lazy_regex.compile(r'^[ \t]*public\s+(?:(?:virtual|override|required|new|static)\s+)*[\w.<>?,\[\] ]+?\s+(\w+)\s*\{', re.MULTILINE),
+    ('public',))
+KEY_ATTRIBUTE = lazy_regex.compile(r'[\[,]\s*(?:[\w.]*\.)?Key\s*(?:Attribute)?\s*[\],(]')
+TYPE_DECLARATION = lazy_regex.compile(
+    r'^[ \t]*((?:(?:public|internal|private|protected|static|sealed|abstract|partial|file|readonly|ref|unsafe|new)\s+)*)'
+    r'(class|record\s+struct|record\s+class|record|interface|enum|struct)\s+(\w+)', re.MULTILINE)
+
+# Built-in rules in report order; project-specific ones are appended from STANDARDS_CONFIG
+BUILTIN_RULES = [
+    Rule('class_single_per_file', '_check_single_class_per_file', 'error', CODE_EXTENSIONS, (CLASS_DECLARATION,)),
+    Rule('xml_documentation_required', '_check_xml_documentation', 'warning', ('.cs',), (PUBLIC_DECLARATION,)),
+    Rule('no_console_statements', '_check_console_statements', 'error', ('.ts', '.tsx'), (CONSOLE_STATEMENT,)),
+    Rule('no_hardcoded_secrets', '_check_hardcoded_secrets', 'error', None,
+         tuple(SECRET_PATTERNS + GENERIC_SECRET_PATTERNS), checks_generated=True),
+    Rule('no_incomplete_implementations', '_check_incomplete_implementations', 'error', ('.cs',), tuple(INCOMPLETE_PATTERNS)),
+    Rule('no_inline_css_javascript', '_check_inline_css_javascript', 'error', ('.cshtml',),
+         (INLINE_MARKUP,)),
+    Rule('no_duplicate_type_names', '_check_duplicate_type_names', 'error', ('.cs',), (), cross_file=True),
+    Rule('no_duplicate_file_names', '_check_duplicate_file_names', 'error', ('.cs',), (), cross_file=True,
+         file_scoped=True),
+    Rule('primary_key_naming', '_check_primary_key_names', 'error', ('.cs',), (), cross_file=True),
+]
+
+# Coding standards hook whose "validation" block adds secret signatures and pattern rules
+STANDARDS_CONFIG = Path(__file__).with_name('coding-standards-hook.json')
+SEVERITIES = ('error', 'warning', 'info')
+
+def compile_configured_pattern(spec: Dict[str, Any], default_scope: str = 'text') -> ScanPattern:
+    """Compile a pattern from the standards config; triggers are optional lowercase literals"""
+    scope = spec.get('scope', default_scope)
+    if scope != 'text' and scope not in csharp_lexer.SCOPES:
+        raise ValueError(f"scope must be one of text, {', '.join(csharp_lexer.SCOPES)}")
+    flags = re.MULTILINE if spec.get('caseSensitive') else re.MULTILINE | re.IGNORECASE
+    return ScanPattern(
+        re.compile(spec['pattern'], flags),
+        tuple(trigger.casefold() for trigger in spec.get('triggers', [])),
+        spec.get('description', ''),
+        scope,
+        float(spec.get('minEntropy', 0.0)))
+
+def configured_rule(spec: Dict[str, Any]) -> Rule:
+    """Build a pattern rule declared in the standards config"""
+    if spec.get('severity', 'error') not in SEVERITIES:
+        raise ValueError(f"severity must be one of {', '.join(SEVERITIES)}")
+    extensions = spec.get('extensions')
+    if extensions is not None:
+        extensions = tuple(ext.lower() if ext.startswith('.') else f'.{ext.lower()}' for ext in extensions)
+    patterns = spec.get('patterns') or [spec]
+    return Rule(
+        rule_id=spec['id'],
+        check='_check_configured_pattern',
+        severity=spec.get('severity', 'error'),
+        extensions=extensions,
+        patterns=tuple(compile_configured_pattern(pattern) for pattern in patterns),
+        violation_type=spec.get('type', spec['id']),
+        message=spec.get('message', f"Rule {spec['id']} matched"),
+        suggestion=spec.get('suggestion', ''),
+        checks_generated=bool(spec.get('checkGenerated', False)))
+
+@lru_cache(maxsize=None)
+def load_rule_registry(config_path: Path = STANDARDS_CONFIG) -> RuleRegistry:
+    """Built-in rules plus the config's extra secret signatures and pattern rules, compiled once per process"""
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            settings = json.load(f).get('validation', {})
+    except FileNotFoundError:
+        settings = {}
+    except (OSError, ValueError) as e:
+        print(f"Warning: Could not load rules from {config_path}: {e}")
+        settings = {}
+        
+    rules = list(BUILTIN_RULES)
+    extra_secrets = []
+    for spec in settings.get('secretPatterns', []):
+        try:
+            extra_secrets.append(compile_configured_pattern(spec, default_scope='literals'))
+        except (KeyError, ValueError, re.error) as e:
+            print(f"Warning: Skipping secret pattern {spec.get('pattern')!r}: {e}")
+    if extra_secrets:
+        index = next(i for i, rule in enumerate(rules) if rule.rule_id == 'no_hardcoded_secrets')
+        secrets = rules[index]
+        rules[index] = Rule(secrets.rule_id, secrets.check, secrets.severity, secrets.extensions,
+                            tuple(SECRET_PATTERNS) + tuple(extra_secrets) + tuple(GENERIC_SECRET_PATTERNS),
+                            checks_generated=secrets.checks_generated)
+        
+    for spec in settings.get('rules', []):
+        try:
+            rules.append(configured_rule(spec))
+        except (KeyError, ValueError, re.error) as e:
+            print(f"Warning: Skipping rule {spec.get('id')!r}: {e}")
+    return RuleRegistry(rules)
+
+# Modules whose code decides rule results, fingerprinted with this file
+RULE_HELPERS = ('csharp_lexer.py', 'generated_code.py', 'razor_tokenizer.py', 'secret_scanner.py')
+
+@lru_cache(maxsize=None)
+def rule_set_version() -> str:
+    """Fingerprint of the validator and tokenizer sources and rule config, so editing any rule invalidates cached results"""
+    digest = hashlib.sha256(Path(__file__).read_bytes())
+    for helper in RULE_HELPERS:
+        digest.update(Path(__file__).with_name(helper).read_bytes())
+    try:
+        digest.update(STANDARDS_CONFIG.read_bytes())
+    except OSError:
+        pass
+    return digest.hexdigest()[:16]
+
+class ResultCache:
+    """On-disk violations per file, keyed by (path, size, mtime_ns) with a content hash fallback"""
+    
+    CACHE_DIR = '.validation-cache'
+    CACHE_FILE = 'results.json'
+    
+    def __init__(self, project_root: Path, version: str):
+        self.path = project_root / self.CACHE_DIR / self.CACHE_FILE
+        self.version = version
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+        
+    def load(self):
+        """Load cached entries, discarding them if they were written by a different rule set"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == self.version:
+                self.entries = data.get('files', {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not load validation cache: {e}")
+            
+    def save(self):
+        """Write the cache atomically if anything changed"""
+        if not self.dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_suffix('.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': self.version, 'files': self.entries}, f, separators=(',', ':'))
+            os.replace(temp_path, self.path)
+            self.dirty = False
+        except OSError as e:
+            print(f"Warning: Could not save validation cache: {e}")
+            
+    @staticmethod
+    def digest(content: str) -> str:
+        """Content hash used when the stat fingerprint alone does not match"""
+        return hashlib.sha1(content.encode('utf-8', errors='ignore')).hexdigest()
+        
+    def get(self, file_path: str, size: int, mtime_ns: int) -> Optional[List[ValidationViolation]]:
+        """Cached violations if the stat fingerprint is unchanged"""
+        entry = self.entries.get(file_path)
+        if entry is None or entry['size'] != size or entry['mtime_ns'] != mtime_ns:
+            return None
+        self.hits += 1
+        return self._violations(file_path, entry)
+        
+    def get_by_content(self, file_path: str, size: int, mtime_ns: int, digest: str) -> Optional[List[ValidationViolation]]:
+        """Cached violations if only the mtime moved and the content hash is unchanged"""
+        entry = self.entries.get(file_path)
+        if entry is None or entry['size'] != size or entry['sha1'] != digest:
+            return None
+        entry['mtime_ns'] = mtime_ns
+        self.dirty = True
+        self.hits += 1
+        return self._violations(file_path, entry)
+        
+    def has_entry(self, file_path: str, size: int) -> bool:
+        """Whether a same-sized entry exists that a content hash could still match"""
+        entry = self.entries.get(file_path)
+        return entry is not None and entry['size'] == size
+        
+    def put(self, file_path: str, size: int, mtime_ns: int, digest: str, violations: List[ValidationViolation]):
+        """Store freshly computed violations for a file"""
+        self.misses += 1
+        self.dirty = True
+        self.entries[file_path] = {
+            'size': size,
+            'mtime_ns': mtime_ns,
+            'sha1': digest,
+            'violations': [[v.line_number, v.violation_type, v.severity, v.rule_id, v.message, v.suggestion]
+                           for v in violations]
+        }
+        
+    @staticmethod
+    def _violations(file_path: str, entry: Dict[str, Any]) -> List[ValidationViolation]:
+        return [ValidationViolation(file_path, *fields) for fields in entry['violations']]
+
+@dataclass(frozen=True)
+class TypeDeclaration:
+    """A type declared somewhere under src/"""
+    name: str
+    kind: str
+    namespace: str
+    file_path: str
+    line_number: int
+    partial: bool
+
+def parse_type_declarations(ctx: FileContext) -> Dict[str, Any]:
+    """Namespace and [name, kind, line, partial] of every type a C# file, or a chunk of one, declares"""
+    namespace = ''
+    types = []
+    for start, end in ctx.regions():
+        namespace_match = NAMESPACE_DECLARATION.search(ctx.content, start, end) if not namespace else None
+        if namespace_match:
+            namespace = namespace_match.group(1)
+        for match in TYPE_DECLARATION.finditer(ctx.content, start, end):
+            kind = ' '.join(match.group(2).split())
+            types.append([match.group(3), kind, ctx.line_number(match.start()), 'partial' in match.group(1).split()])
+    return {'namespace': namespace, 'types': types}
+
+def parse_key_arguments(arguments: str) -> List[str]:
+    """Property names passed to HasKey: a lambda, an anonymous type, strings or nameof()"""
+    if '=>' in arguments:
+        return re.findall(r'\w+\.(\w+)', arguments.split('=>', 1)[1])
+    return re.findall(r'"(\w+)"', arguments) + re.findall(r'nameof\((?:\w+\.)*(\w+)\)', arguments)
+
+def parse_entity_facts(ctx: FileContext) -> Dict[str, Any]:
+    """DbSet registrations, HasKey configuration and key-candidate properties declared in a C# file"""
+    content = ctx.content
+    # Type aliases such as "using ServiceProviderEntity = ...Entities.ServiceProvider;" name the real class
+    aliases = {match.group(1): match.group(2).split('.')[-1] for match in USING_ALIAS.finditer(content)}
+    dbsets = [[aliases.get(match.group(1), match.group(1)), ctx.line_number(match.start())]
+              for match in ctx.finditer(DBSET_PROPERTY)]
+    
+    # HasKey belongs to the closest preceding Entity<T> or IEntityTypeConfiguration<T>
+    keys = []
+    configurations = None
+    for match in ctx.finditer(HAS_KEY):
+        if configurations is None:
+            configurations = [(m.start(), aliases.get(m.group(1), m.group(1)))
+                              for m in ENTITY_CONFIGURATION.finditer(content)]
+        index = bisect_right(configurations, (match.start(),)) - 1
+        if index < 0:
+            continue
+        depth = 1
+        position = match.end()
+        while position < len(content) and depth:
+            depth += {'(': 1, ')': -1}.get(content[position], 0)
+            position += 1
+        keys.append([configurations[index][1], parse_key_arguments(content[match.end():position - 1]),
+                     ctx.line_number(match.start())])
+        
+    # Properties belong to the closest preceding class; only [Key] and Id-like ones are kept
+    classes = []
+    for match in TYPE_DECLARATION.finditer(content):
+        if match.group(2).split()[0] in ('class', 'record'):
+            base = CLASS_BASE.match(content, match.end())
+            classes.append([match.group(3), base.group(1).split('.')[-1] if base else '',
+                            ctx.line_number(match.start()), [], match.start()])
+    class_starts = [entry[4] for entry in classes]
+    for match in ctx.finditer(PROPERTY_DECLARATION):
+        index = bisect_right(class_starts, match.start()) - 1
+        if index < 0:
+            continue
+        owner = classes[index]
+        name = match.group(1)
+        line_number = ctx.line_number(match.start())
+        is_key = False
+        for previous in range(line_number - 1, max(0, line_number - 6), -1):
+            text = ctx.line_text(previous).strip()
+            if not (text.startswith('[') or text.endswith(']')):
+                break
+            if KEY_ATTRIBUTE.search(text):
+                is_key = True
+        if is_key or name == 'Id' or name == f'{owner[0]}Id':
+            owner[3].append([name, line_number, is_key])
+    return {'dbsets': dbsets, 'keys': keys, 'classes': [entry[:4] for entry in classes]}
+
+class SourceIndex(ABC):
+    """Facts parsed from C# files in a scope, persisted and re-parsed only for files whose stat changed"""
+    
+    INDEX_FILE = ''
+    SCOPE = ''
+    EXCLUDED_PARTS: Tuple[str, ...] = ()
+    
+    def __init__(self, project_root: Path, version: str, persist: bool = True, large_file_threshold: int = 0):
+        self.project_root = project_root
+        self.path = project_root / ResultCache.CACHE_DIR / self.INDEX_FILE
+        self.version = version
+        self.persist = persist
+        self.large_file_threshold = large_file_threshold
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.parsed = 0
+        self.dirty = False
+        
+    @classmethod
+    def covers(cls, file_path: str) -> bool:
+        """Whether a relative path is a C# file this index records"""
+        return (file_path.startswith(cls.SCOPE) and file_path.endswith('.cs')
+                and not any(part in cls.EXCLUDED_PARTS for part in file_path.split(os.sep)[:-1]))
+        
+    @abstractmethod
+    def parse(self, ctx: FileContext) -> Dict[str, Any]:
+        """Facts of one file, stored as its index entry"""
+        
+    def parse_chunks(self, chunks: Iterator[FileContext]) -> Optional[Dict[str, Any]]:
+        """Facts of a large file from its chunks, or None when the parser needs the file in one piece"""
+        return None
+        
+    @abstractmethod
+    def rebuild(self):
+        """Derive the lookup tables from the entries after they change"""
+        
+    def load(self):
+        """Load persisted entries, discarding them if they were written by a different parser"""
+        if not self.persist:
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == self.version:
+                self.entries = data.get('files', {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not load {self.INDEX_FILE}: {e}")
+            
+    def save(self):
+        """Write the index atomically if anything changed"""
+        if not self.persist or not self.dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_suffix('.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': self.version, 'files': self.entries}, f, separators=(',', ':'))
+            os.replace(temp_path, self.path)
+            self.dirty = False
+        except OSError as e:
+            print(f"Warning: Could not save {self.INDEX_FILE}: {e}")
+            
+    def refresh(self, inventory: List[Tuple[str, float, int]]):
+        """Re-parse new and changed files, drop deleted ones, then rebuild the lookup tables"""
+        present = set()
+        for file_path, mtime, size in inventory:
+            if self.covers(file_path):
+                present.add(file_path)
+                self._update(file_path, mtime, size)
+            
+        for file_path in [f for f in self.entries if f not in present]:
+            del self.entries[file_path]
+            self.dirty = True
+            
+        self.rebuild()
+        
+    def refresh_files(self, file_paths: List[str]):
+        """Bring only some files up to date, trusting the persisted entries of every other file"""
+        for file_path in file_paths:
+            if not self.covers(file_path):
+                continue
+            try:
+                stat = os.stat(self.project_root / file_path)
+            except OSError:
+                if self.entries.pop(file_path, None) is not None:
+                    self.dirty = True
+                continue
+            self._update(file_path, stat.st_mtime, stat.st_size)
+        self.rebuild()
+        
+    def _update(self, file_path: str, mtime: float, size: int):
+        """Re-parse a file unless its recorded stat data still matches"""
+        entry = self.entries.get(file_path)
+        if entry is not None and entry['size'] == size and entry['mtime'] == mtime:
+            return
+        path = self.project_root / file_path
+        try:
+            facts = None
+            if 0 < self.large_file_threshold <= size:
+                facts = self.parse_chunks(iter_chunk_contexts(path, file_path, LARGE_FILE_CHUNK_CHARS, lexer=False))
+            if facts is None:
+                with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                    content = f.read()
+                facts = self.parse(FileContext(file_path=file_path, extension='.cs', content=content))
+        except OSError as e:
+            print(f"Error reading {file_path}: {e}")
+            return
+        self.entries[file_path] = {'size': size, 'mtime': mtime, **facts}
+        self.parsed += 1
+        self.dirty = True
+
+class SymbolIndex(SourceIndex):
+    """Types declared across src/**/*.cs"""
+    
+    INDEX_FILE = 'symbols.json'
+    SCOPE = 'src' + os.sep
+    
+    def __init__(self, project_root: Path, version: str, persist: bool = True, large_file_threshold: int = 0):
+        super().__init__(project_root, version, persist, large_file_threshold)
+        self.by_name: Dict[str, List[TypeDeclaration]] = {}
+        self.by_file_name: Dict[str, List[str]] = {}
+        
+    def parse(self, ctx: FileContext) -> Dict[str, Any]:
+        return parse_type_declarations(ctx)
+        
+    def parse_chunks(self, chunks: Iterator[FileContext]) -> Optional[Dict[str, Any]]:
+        facts = {'namespace': '', 'types': []}
+        for ctx in chunks:
+            chunk_facts = parse_type_declarations(ctx)
+            facts['namespace'] = facts['namespace'] or chunk_facts['namespace']
+            facts['types'].extend(chunk_facts['types'])
+        return facts
+        
+    def rebuild(self):
+        """Index declarations by type name and files by file name"""
+        self.by_name = {}
+        self.by_file_name = {}
+        for file_path, entry in self.entries.items():
+            self.by_file_name.setdefault(os.path.basename(file_path).lower(), []).append(file_path)
+            for name, kind, line_number, partial in entry['types']:
+                self.by_name.setdefault(name, []).append(
+                    TypeDeclaration(name, kind, entry['namespace'], file_path, line_number, partial))
+                
+    def declared_in(self, file_path: str) -> List[TypeDeclaration]:
+        """Types a file declares, as recorded by the last refresh"""
+        entry = self.entries.get(file_path)
+        if entry is None:
+            return []
+        return [TypeDeclaration(name, kind, entry['namespace'], file_path, line_number, partial)
+                for name, kind, line_number, partial in entry['types']]
+                
+    def duplicates_of(self, declaration: TypeDeclaration) -> List[TypeDeclaration]:
+        """Same-named types in other files, ignoring other parts of the same partial type"""
+        return [other for other in self.by_name.get(declaration.name, ())
+                if other.file_path != declaration.file_path
+                and not (declaration.partial and other.partial and other.namespace == declaration.namespace)]
+                
+    def files_named(self, file_path: str) -> List[str]:
+        """Other files under src/ with the same file name"""
+        return [other for other in self.by_file_name.get(os.path.basename(file_path).lower(), ())
+                if other != file_path]
+
+@dataclass(frozen=True)
+class PrimaryKey:
+    """The primary key EF Core will use for a DbSet entity, and where it is declared"""
+    entity: str
+    properties: Tuple[str, ...]
+    file_path: str
+    line_number: int
+    source: str  # 'HasKey', '[Key]' or 'convention'
+
+class EntityIndex(SourceIndex):
+    """DbSet entities of the API and their primary keys, from HasKey, [Key] or the Id convention"""
+    
+    INDEX_FILE = 'entities.json'
+    SCOPE = os.path.join('src', 'API', 'MeAndMyDog.API') + os.sep
+    EXCLUDED_PARTS = ('Migrations',)
+    # Base classes followed when looking for an inherited key
+    MAX_BASE_DEPTH = 5
+    
+    def __init__(self, project_root: Path, version: str, persist: bool = True, large_file_threshold: int = 0):
+        super().__init__(project_root, version, persist, large_file_threshold)
+        self.keys_by_file: Dict[str, List[PrimaryKey]] = {}
+        
+    def parse(self, ctx: FileContext) -> Dict[str, Any]:
+        return parse_entity_facts(ctx)
+        
+    def rebuild(self):
+        """Resolve every DbSet entity's key and index it by the file that declares it"""
+        entities = {}
+        configured = {}
+        classes = {}
+        for file_path, entry in sorted(self.entries.items()):
+            for entity, _ in entry['dbsets']:
+                entities.setdefault(entity, file_path)
+            for entity, properties, line_number in entry['keys']:
+                configured[entity] = PrimaryKey(entity, tuple(properties), file_path, line_number, 'HasKey')
+            for name, base, _, properties in entry['classes']:
+                classes.setdefault(name, (file_path, base, properties))
+                
+        self.keys_by_file = {}
+        for entity in entities:
+            key = configured.get(entity) or self._declared_key(entity, classes)
+            if key is not None:
+                self.keys_by_file.setdefault(key.file_path, []).append(key)
+                
+    def _declared_key(self, entity: str, classes: Dict[str, Tuple[str, str, List[Any]]]) -> Optional[PrimaryKey]:
+        """Key from [Key] attributes, else an Id or {Entity}Id property, searching up the base classes"""
+        name = entity
+        for _ in range(self.MAX_BASE_DEPTH):
+            if name not in classes:
+                return None
+            file_path, base, properties = classes[name]
+            keyed = [p for p in properties if p[2]]
+            if keyed:
+                return PrimaryKey(entity, tuple(p[0] for p in keyed), file_path, keyed[0][1], '[Key]')
+            for prop_name, line_number, _ in properties:
+                if prop_name in ('Id', f'{entity}Id'):
+                    return PrimaryKey(entity, (prop_name,), file_path, line_number, 'convention')
+            name = base
+        return None
+        
+    def keys_declared_in(self, file_path: str) -> List[PrimaryKey]:
+        """Entity keys whose HasKey call or key property lives in a file"""
+        return self.keys_by_file.get(file_path, [])
+
+class ViolationCounter:
+    """Running totals by severity, so counting never needs the violations kept in memory"""
+    
+    def __init__(self):
+        self.by_severity = {'error': 0, 'warning': 0, 'info': 0}
+        self.files_with_errors = set()
+        self.total = 0
+        
+    def add(self, violations: List[ValidationViolation]):
+        for violation in violations:
+            self.by_severity[violation.severity] = self.by_severity.get(violation.severity, 0) + 1
+            if violation.severity == 'error':
+                self.files_with_errors.add(violation.file_path)
+        self.total += len(violations)
+
+@dataclass
+class ProfileStats:
+    """Wall time, bytes scanned, regex matches and violations of one rule or file"""
+    seconds: float = 0.0
+    bytes_scanned: int = 0
+    matches: int = 0
+    violations: int = 0
+    runs: int = 0
+
+    def add(self, other: 'ProfileStats'):
+        self.seconds += other.seconds
+        self.bytes_scanned += other.bytes_scanned
+        self.matches += other.matches
+        self.violations += other.violations
+        self.runs += other.runs
+
+class RunProfile:
+    """Instrumentation of one run: stage timings plus per-rule and per-file statistics"""
+    
+    STAGES = ('discovery', 'read', 'index', 'validate', 'report')
+    
+    def __init__(self, top: int = 10):
+        self.top = top
+        self.stages: Dict[str, float] = {}
+        self.rules: Dict[str, ProfileStats] = {}
+        self.files: Dict[str, ProfileStats] = {}
+        
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        """Add the wall time of a block to a stage; stages may nest (read and index fall inside validate)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - started
+            
+    def file(self, file_path: str) -> ProfileStats:
+        return self.files.setdefault(file_path, ProfileStats())
+        
+    def record_rule(self, rule_id: str, file_path: str, seconds: float, bytes_scanned: int, matches: int,
+                    violations: int):
+        """One rule run against one file; its matches also count towards the file"""
+        self.rules.setdefault(rule_id, ProfileStats()).add(ProfileStats(seconds, bytes_scanned, matches, violations, 1))
+        self.file(file_path).matches += matches
+        
+    def record_file(self, file_path: str, seconds: float, violations: int):
+        """Time spent on a file, including its read, cache lookups and cross-file rules"""
+        stats = self.file(file_path)
+        stats.seconds += seconds
+        stats.violations += violations
+        stats.runs = 1
+        
+    def merge(self, other: 'RunProfile'):
+        """Fold in the profile of a worker process"""
+        for name, seconds in other.stages.items():
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+        for table, other_table in ((self.rules, other.rules), (self.files, other.files)):
+            for key, stats in other_table.items():
+                table.setdefault(key, ProfileStats()).add(stats)
+                
+    @staticmethod
+    def slowest(table: Dict[str, ProfileStats], count: int) -> List[Tuple[str, ProfileStats]]:
+        return sorted(table.items(), key=lambda item: item[1].seconds, reverse=True)[:count]
+        
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serialisable form with every rule and the slowest files"""
+        return {
+            'stages': {name: round(seconds, 6) for name, seconds in self.stages.items()},
+            'rules': {rule_id: stats.__dict__ for rule_id, stats in self.slowest(self.rules, len(self.rules))},
+            'slowest_files': [{'file_path': file_path, **stats.__dict__}
+                              for file_path, stats in self.slowest(self.files, self.top)]
+        }
+        
+    def report_lines(self) -> Iterator[str]:
+        """Markdown tables of the stage timings and the slowest rules and files"""
+        yield "## Performance Profile"
+        yield ""
+        yield "| Stage | Seconds |"
+        yield "|-------|---------|"
+        for name in sorted(self.stages, key=lambda name: self.STAGES.index(name) if name in self.STAGES else 99):
+            yield f"| {name} | {self.stages[name]:.3f} |"
+        yield ""
+        for title, table in (('Rule', self.rules), ('File', self.files)):
+            yield f"| {title} | Seconds | Runs | Bytes Scanned | Matches | Violations |"
+            yield f"|{'-' * (len(title) + 2)}|---------|------|---------------|---------|------------|"
+            for key, stats in self.slowest(table, self.top):
+                yield (f"| {key} | {stats.seconds:.4f} | {stats.runs} | {stats.bytes_scanned} | {stats.matches} "
+                       f"| {stats.violations} |")
+            yield ""
+            
+    def print_top(self):
+        """Stage timings and the slowest rules and files on the console"""
+        print("Profile:")
+        print("   Stages: " + ', '.join(f"{name} {seconds:.3f}s" for name, seconds in self.stages.items()))
+        for title, table in (('rules', self.rules), ('files', self.files)):
+            print(f"   Slowest {title}:")
+            for key, stats in self.slowest(table, self.top):
+                print(f"      {stats.seconds * 1000:9.2f} ms  {stats.bytes_scanned:>10} B  {stats.matches:>6} matches  "
+                      f"{stats.violations:>5} violations  {key}")
+
+class ViolationStream:
+    """Writes violations as JSON Lines, and optionally SARIF 2.1.0, while files are being validated"""
+    
+    SARIF_LEVELS = {'error': 'error', 'warning': 'warning', 'info': 'note'}
+    
+    def __init__(self, jsonl_path: Path, sarif_path: Optional[Path] = None):
+        self.jsonl_path = jsonl_path
+        self.counter = ViolationCounter()
+        jsonl_path.parent.mkdir(parents=True, exist_ok=True)
+        self._jsonl = open(jsonl_path, 'w', encoding='utf-8')
+        self._sarif = None
+        if sarif_path is not None:
+            sarif_path.parent.mkdir(parents=True, exist_ok=True)
+            self._sarif = open(sarif_path, 'w', encoding='utf-8')
+            self._sarif.write('{"$schema":"https://json.schemastore.org/sarif-2.1.0.json","version":"2.1.0",'
+                              '"runs":[{"tool":{"driver":{"name":"MeAndMyDog Code Validation Hook",'
+                              '"informationUri":"https://github.com/th3dixon/MeAndMyDoggyV2"}},"results":[')
+            
+    def write(self, violations: List[ValidationViolation]):
+        """Append one file's violations to every output and the running totals"""
+        for violation in violations:
+            self._jsonl.write(json.dumps(violation.to_dict(), separators=(',', ':')) + '\n')
+            if self._sarif is not None:
+                result = {
+                    'ruleId': violation.rule_id,
+                    'level': self.SARIF_LEVELS.get(violation.severity, 'none'),
+                    'message': {'text': violation.message},
+                    'locations': [{'physicalLocation': {
+                        'artifactLocation': {'uri': violation.file_path.replace(os.sep, '/')},
+                        'region': {'startLine': max(violation.line_number, 1)}
+                    }}],
+                    'properties': {'violationType': violation.violation_type, 'suggestion': violation.suggestion}
+                }
+                separator = ',' if self.counter.total else ''
+                self._sarif.write(separator + json.dumps(result, separators=(',', ':')))
+            self.counter.add([violation])
+            
+    def close(self):
+        self._jsonl.close()
+        if self._sarif is not None:
+            self._sarif.write(']}]}\n')
+            self._sarif.close()
+
+def read_violations(jsonl_path: Path, severity: Optional[str] = None) -> Iterator[ValidationViolation]:
+    """Violations from a JSON Lines stream, one at a time, optionally of a single severity"""
+    with open(jsonl_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            record = json.loads(line)
+            if severity is None or record['severity'] == severity:
+                yield ValidationViolation(**record)
+
+def _validate_batch(project_root: str, file_paths: List[str], profile: bool = False,
+                    large_file_threshold: int = LARGE_FILE_THRESHOLD,
+                    generated: Optional[Dict[str, Tuple[Optional[str], int]]] = None,
+                    baseline_lines: Optional[Dict[str, List[int]]] = None
+                    ) -> Tuple[List[Tuple[str, int, int, str, List[ValidationViolation], Optional[Dict[int, str]]]],
+                               Optional[RunProfile], Optional[generated_code.GeneratedCodeStats]]:
+    """Worker entry point: validate a batch of files, returning fingerprints alongside violations; generated
+    holds the parent's (reason, size) classification of each file, None when generated code is validated.
+    With a baseline, baseline_lines holds each file's cross-file violation lines, and the lines around those and
+    the file's own violations are sent back, so the parent fingerprints them without reading the file again"""
+    validator = CodeValidator(project_root, profile=profile, large_file_threshold=large_file_threshold,
+                              classify_generated=False)
+    if generated is not None:
+        validator.generated = generated
+        validator.generated_stats = generated_code.GeneratedCodeStats()
+    results = []
+    for file_path in file_paths:
+        started = time.perf_counter()
+        try:
+            stat = os.stat(validator.project_root / file_path)
+            size, mtime_ns = stat.st_size, stat.st_mtime_ns
+        except OSError:
+            size, mtime_ns = -1, -1
+        ctx = None
+        if validator.is_large_file(file_path, size):
+            sha1 = hashlib.sha1()
+            violations = validator.validate_large_file(file_path, sha1)
+            digest = sha1.hexdigest()
+        else:
+            ctx = validator.load_file_context(file_path)
+            violations = validator.validate_file(file_path, ctx) if ctx is not None else None
+            digest = ResultCache.digest(ctx.content) if ctx is not None else ''
+        if violations is None:
+            results.append((file_path, size, mtime_ns, '', [], None))
+            continue
+        if validator.profile is not None:
+            validator.profile.record_file(file_path, time.perf_counter() - started, len(violations))
+        lines = None
+        if baseline_lines is not None and ctx is not None:
+            line_numbers = [violation.line_number for violation in violations] + baseline_lines.get(file_path, [])
+            lines = nearby_lines(ctx, line_numbers) if line_numbers else None
+        results.append((file_path, size, mtime_ns, digest, violations, lines))
+    return results, validator.profile, validator.generated_stats
+
+def size_balanced_batches(sized_files: List[Tuple[str, int]], batch_count: int) -> List[List[str]]:
+    """Spread files over batches largest first, each going to the lightest batch so far"""
+    batches = [[] for _ in range(batch_count)]
+    loads = [0] * batch_count
+    for file_path, size in sorted(sized_files, key=lambda item: item[1], reverse=True):
+        lightest = loads.index(min(loads))
+        batches[lightest].append(file_path)
+        loads[lightest] += max(size, 1)
+    return [batch for batch in batches if batch]
 
 class CodeValidator:
-    def __init__(self, project_root: str):
+    # Batches per worker; more than one lets the pool rebalance around slow files
+    BATCHES_PER_JOB = 4
+
+    def __init__(self, project_root: str, use_cache: bool = False, jobs: int = 1,
+                 registry: Optional[RuleRegistry] = None, profile: bool = False, top: int = 10,
+                 large_file_threshold: int = LARGE_FILE_THRESHOLD, classify_generated: bool = True):
         self.project_root = Path(project_root)
+        self.registry = registry if registry is not None else load_rule_registry()
         self.violations: List[ValidationViolation] = []
+        self.jobs = max(1, jobs)
+        self.use_prefilter = True
+        self.use_lexer = True
+        self._inventory: Optional[List[Tuple[str, float, int]]] = None
+        self.cache: Optional[ResultCache] = None
+        self.use_cache = use_cache
+        self._indexes: Dict[type, SourceIndex] = {}
+        self.profile: Optional[RunProfile] = RunProfile(top) if profile else None
+        self.diff: Optional[Any] = None  # a diff_scope.DiffScope in diff-scoped runs
+        self.explicit_files: Optional[List[str]] = None  # paths named on the command line, if any
+        self.baseline: Optional[Any] = None  # a violation_baseline.ViolationBaseline when known violations are hidden
+        self.last_context: Optional[FileContext] = None  # the file validate_file last ran on, for baseline lines
+        self._worker_lines: Dict[str, Dict[int, str]] = {}  # lines around violations that workers sent back
+        self._cross_file: Dict[str, List[ValidationViolation]] = {}  # cross-file violations found before dispatch
+        self.large_file_threshold = large_file_threshold  # bytes; 0 reads every file in one piece
+        self.defer_saves = False  # the daemon writes the caches and indexes when idle instead of after each run
+        self.chunk_chars = LARGE_FILE_CHUNK_CHARS
+        # Generated files only get the rules that check generated code; None validates them like any other file
+        self.classifier: Optional[generated_code.GeneratedCodeClassifier] = None
+        self.generated: Dict[str, Tuple[Optional[str], int]] = {}  # path -> (reason or None, size) this run
+        self.generated_stats: Optional[generated_code.GeneratedCodeStats] = None
+        if classify_generated:
+            self.classifier = generated_code.GeneratedCodeClassifier(
+                self.project_root, rule_set_version(), ResultCache.CACHE_DIR, persist=use_cache)
+            self.classifier.load()
+            self.generated_stats = generated_code.GeneratedCodeStats()
+        if use_cache:
+            # Results without generated-code skipping are cached apart, so neither mode reuses the other's
+            self.cache = ResultCache(self.project_root,
+                                     rule_set_version() if classify_generated else f'{rule_set_version()}-generated')
+            self.cache.load()
         
+    def walk_source_files(self) -> List[Tuple[str, float, int]]:
+        """Walk the tree once, pruning excluded directories, and stat each source file a single time"""
+        if self._inventory is not None:
+            return self._inventory
+            
+        inventory = []
+        pending = [('', str(self.project_root))]
+        while pending:
+            relative_dir, directory = pending.pop()
+            try:
+                entries = os.scandir(directory)
+            except OSError as e:
+                print(f"   Warning: Could not read {directory}: {e}")
+                continue
+                
+            with entries:
+                for entry in entries:
+                    relative_path = os.path.join(relative_dir, entry.name) if relative_dir else entry.name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            # Prune build/dependency directories before descending
+                            if not is_pruned_dir(relative_dir, entry.name):
+                                pending.append((relative_path, entry.path))
+                        elif entry.name.endswith(SOURCE_EXTENSIONS) and entry.name not in EXCLUDED_FILES:
+                            stat = entry.stat()
+                            inventory.append((relative_path, stat.st_mtime, stat.st_size))
+                    except OSError as e:
+                        print(f"   Warning: Could not check {entry.path}: {e}")
+                        
+        inventory.sort()
+        self._inventory = inventory
+        return inventory
+
+    def update_inventory(self, file_paths: Iterable[str]) -> List[str]:
+        """Re-stat only the given files in the walked inventory, adding, updating or dropping their entries;
+        returns the ones that are still source files"""
+        inventory = self.walk_source_files()
+        present = []
+        for file_path in sorted(set(file_paths)):
+            position = bisect_left(inventory, (file_path,))
+            if position < len(inventory) and inventory[position][0] == file_path:
+                del inventory[position]
+            if not file_path.endswith(SOURCE_EXTENSIONS) or self._in_excluded_dir(file_path.replace(os.sep, '/')):
+                continue
+            try:
+                stat = os.stat(self.project_root / file_path)
+            except OSError:
+                continue  # deleted
+            inventory.insert(position, (file_path, stat.st_mtime, stat.st_size))
+            present.append(file_path)
+        return present
+
     def get_recently_modified_files(self, days: int = 2) -> List[str]:
         """Get files modified within the last N days using filesystem timestamps"""
         try:
             cutoff_time = datetime.now() - timedelta(days=days)
-            recently_modified = []
+            cutoff_timestamp = cutoff_time.timestamp()
             
             print(f"Looking for files modified after: {cutoff_time.strftime('%Y-%m-%d %H:%M:%S')}")
             
-            # Search for C#, TypeScript, and Razor files recursively
-            for ext in ['.cs', '.ts', '.tsx', '.cshtml']:
-                pattern = f'**/*{ext}'
-                for file_path in self.project_root.glob(pattern):
-                    # Skip common build/dependency directories
-                    path_str = str(file_path)
-                    if any(skip_dir in path_str for skip_dir in ['node_modules', 'bin', 'obj', '.git', 'packages', 'wwwroot/lib']):
-                        continue
-                    
-                    try:
-                        # Get file modification time
-                        mod_time = datetime.fromtimestamp(file_path.stat().st_mtime)
-                        
-                        if mod_time > cutoff_time:
-                            relative_path = str(file_path.relative_to(self.project_root))
-                            recently_modified.append(relative_path)
-                            print(f"   Found: {relative_path} (modified: {mod_time.strftime('%Y-%m-%d %H:%M:%S')})")
-                    except (OSError, ValueError) as e:
-                        print(f"   Warning: Could not check {file_path}: {e}")
-                        continue
+            # Filter the C#, TypeScript, and Razor inventory on the mtime from its single stat
+            recent = [entry for entry in self.walk_source_files() if entry[1] > cutoff_timestamp]
             
             # Sort by modification time (newest first)
-            recently_modified.sort(key=lambda f: os.path.getmtime(self.project_root / f), reverse=True)
-            return recently_modified
+            recent.sort(key=lambda entry: entry[1], reverse=True)
+            for relative_path, mtime, _ in recent:
+                print(f"   Found: {relative_path} (modified: {datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M:%S')})")
+            return [relative_path for relative_path, _, _ in recent]
             
         except Exception as e:
             print(f"Error getting recently modified files: {e}")
             return []
 
+    def get_uncommitted_files(self) -> List[str]:
+        """Get modified, added and untracked files by reading .git/index in-process"""
+        try:
+            from git_changes import detect_changes
+            
+            changes = detect_changes(self.project_root, SOURCE_EXTENSIONS, EXCLUDED_DIRS)
+            print(f"Git index: {len(changes.modified)} modified, {len(changes.added)} added, {len(changes.untracked)} untracked")
+            return [os.path.normpath(f) for f in changes.all() if not self._in_excluded_dir(f)]
+        except Exception as e:
+            print(f"Error reading git index: {e}")
+            return []
+
+    def get_committed_files(self, days: int = 2) -> List[str]:
+        """Get files added or modified by commits in the last N days using git log"""
+        import subprocess
+        
+        try:
+            since_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+            result = subprocess.run([
+                'git', 'log', '--since', since_date, '--name-only', '--pretty=format:', '--diff-filter=AM'
+            ], capture_output=True, text=True, cwd=self.project_root)
+            
+            if result.returncode == 0:
+                files = dict.fromkeys(f.strip() for f in result.stdout.split('\n') if f.strip())
+                return [os.path.normpath(f) for f in files
+                        if f.endswith(SOURCE_EXTENSIONS) and not self._in_excluded_dir(f)
+                        and os.path.exists(self.project_root / f)]
+            else:
+                print(f"Git command failed: {result.stderr}")
+                return []
+        except Exception as e:
+            print(f"Error getting committed files: {e}")
+            return []
+
+    @staticmethod
+    def _in_excluded_dir(relative_path: str) -> bool:
+        """Whether a slash-separated relative path lies under a pruned directory or is one of the hook's own files"""
+        parts = relative_path.split('/')
+        if parts[-1] in EXCLUDED_FILES:
+            return True
+        parts = parts[:-1]
+        return (any(part in EXCLUDED_DIRS for part in parts)
+                or any(pair in EXCLUDED_SUBDIRS for pair in zip(parts, parts[1:])))
+
+    def get_all_source_files(self) -> List[str]:
+        """Get every C#, TypeScript, and Razor file outside build/dependency directories"""
+        return [relative_path for relative_path, _, _ in self.walk_source_files()]
+
+    def load_file_context(self, file_path: str) -> Optional[FileContext]:
+        """Read and decode a file once for all rules"""
+        started = time.perf_counter()
+        try:
+            with open(self.project_root / file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                content = f.read()
+        except Exception as e:
+            print(f"Error reading {file_path}: {e}")
+            return None
+            
+        if self.profile is not None:
+            self.profile.stages['read'] = self.profile.stages.get('read', 0.0) + time.perf_counter() - started
+            self.profile.file(file_path).bytes_scanned = len(content)
+        return FileContext(
+            file_path=file_path,
+            extension=os.path.splitext(file_path)[1].lower(),
+            content=content,
+            prefilter=self.use_prefilter,
+            lexer=self.use_lexer,
+            count_matches=self.profile is not None
+        )
+
+    def rules_for(self, file_path: str) -> Tuple[Rule, ...]:
+        """Per-file rules that apply to a file, resolved from its extension alone"""
+        return tuple(rule for rule in self.registry.for_extension(os.path.splitext(file_path)[1].lower())
+                     if not rule.cross_file)
+
+    def cross_file_rules_for(self, file_path: str) -> Tuple[Rule, ...]:
+        """Source index rules that apply to a file; each rule checks its own index's scope"""
+        return tuple(rule for rule in self.registry.for_extension(os.path.splitext(file_path)[1].lower())
+                     if rule.cross_file)
+
+    def generated_reason(self, file_path: str) -> Optional[str]:
+        """Why a file is generated code, classified from its name and header once per run; None for hand-written code"""
+        entry = self.generated.get(file_path)
+        if entry is None:
+            if self.classifier is None:
+                return None
+            started = time.perf_counter()
+            reason, size, header_bytes = self.classifier.classify(file_path)
+            self.generated_stats.classify_seconds += time.perf_counter() - started
+            self.generated_stats.header_bytes += header_bytes
+            if reason is not None:
+                self.generated_stats.record_file(reason, size)
+            entry = self.generated[file_path] = (reason, size)
+        return entry[0]
+
+    def rules_to_run(self, file_path: str, cross_file: bool = False) -> Tuple[Rule, ...]:
+        """The rules for a file that run this time: on generated code only those that check it, recording the
+        runs skipped"""
+        rules = self.cross_file_rules_for(file_path) if cross_file else self.rules_for(file_path)
+        if not rules or self.generated_reason(file_path) is None:
+            return rules
+        kept = tuple(rule for rule in rules if rule.checks_generated)
+        if self.generated_stats is not None:
+            # Index lookups scan nothing, so skipped cross-file runs are counted but not priced
+            size = 0 if cross_file else self.generated[file_path][1]
+            for rule in rules:
+                if not rule.checks_generated:
+                    self.generated_stats.record_skip(rule.rule_id, size)
+        return kept
+
+    def source_index(self, index_class: type) -> SourceIndex:
+        """A source index loaded and brought up to date on first use"""
+        index = self._indexes.get(index_class)
+        if index is None:
+            with self.profile.stage('index') if self.profile is not None else contextlib.nullcontext():
+                index = index_class(self.project_root, rule_set_version(), persist=self.use_cache,
+                                    large_file_threshold=self.large_file_threshold)
+                index.load()
+                # Per-save runs name their files: refresh just those against the persisted index, without a walk
+                if self.explicit_files is not None and index.entries:
+                    index.refresh_files(self.explicit_files)
+                else:
+                    index.refresh(self.walk_source_files())
+            self._indexes[index_class] = index
+        return index
+
+    @property
+    def symbols(self) -> SymbolIndex:
+        """Types declared under src/"""
+        return self.source_index(SymbolIndex)
+
+    @property
+    def entities(self) -> EntityIndex:
+        """DbSet entities of the API and their primary keys"""
+        return self.source_index(EntityIndex)
+
+    def validate_cross_file(self, file_path: str) -> List[ValidationViolation]:
+        """Run the symbol index rules for a file; cheap lookups, so they are never cached"""
+        violations = []
+        for rule in self.rules_to_run(file_path, cross_file=True):
+            started = time.perf_counter()
+            found = getattr(self, rule.check)(file_path, rule)
+            if self.profile is not None:
+                self.profile.record_rule(rule.rule_id, file_path, time.perf_counter() - started, 0, 0, len(found))
+            violations.extend(found)
+        return violations
+
+    def run_rule(self, rule: Rule, ctx: FileContext) -> List[ValidationViolation]:
+        """Run one registered rule against a loaded file"""
+        return getattr(self, rule.check)(ctx, rule)
+
+    def _run_single_rule(self, rule_id: str, file_path: str) -> List[ValidationViolation]:
+        """Load a file and run one rule against it, honouring the rule's extensions"""
+        rule = self.registry[rule_id]
+        if rule.cross_file:
+            return getattr(self, rule.check)(file_path, rule) if rule in self.cross_file_rules_for(file_path) else []
+        if rule not in self.rules_for(file_path):
+            return []
+        ctx = self.load_file_context(file_path)
+        return self.run_rule(rule, ctx) if ctx is not None else []
+
     def validate_single_class_per_file(self, file_path: str) -> List[ValidationViolation]:
         """Validate that each file contains only one public class"""
+        return self._run_single_rule('class_single_per_file', file_path)
+
+    def validate_xml_documentation(self, file_path: str) -> List[ValidationViolation]:
+        """Validate XML documentation for public members"""
+        return self._run_single_rule('xml_documentation_required', file_path)
+
+    def validate_console_statements(self, file_path: str) -> List[ValidationViolation]:
+        """Validate no console statements in production code"""
+        return self._run_single_rule('no_console_statements', file_path)
+
+    def validate_hardcoded_secrets(self, file_path: str) -> List[ValidationViolation]:
+        """Validate no hardcoded secrets or test data"""
+        return self._run_single_rule('no_hardcoded_secrets', file_path)
+
+    def validate_inline_css_javascript(self, file_path: str) -> List[ValidationViolation]:
+        """Validate that CSS and JavaScript are not inline in .cshtml files"""
+        return self._run_single_rule('no_inline_css_javascript', file_path)
+
+    def validate_incomplete_implementations(self, file_path: str) -> List[ValidationViolation]:
+        """Validate no incomplete implementations"""
+        return self._run_single_rule('no_incomplete_implementations', file_path)
+
+    def validate_duplicate_type_names(self, file_path: str) -> List[ValidationViolation]:
+        """Validate that no type name is declared in more than one file under src/"""
+        return self._run_single_rule('no_duplicate_type_names', file_path)
+
+    def validate_duplicate_file_names(self, file_path: str) -> List[ValidationViolation]:
+        """Validate that no two files under src/ share a file name"""
+        return self._run_single_rule('no_duplicate_file_names', file_path)
+
+    def validate_primary_key_names(self, file_path: str) -> List[ValidationViolation]:
+        """Validate that database entity primary keys are named {TableName}Id"""
+        return self._run_single_rule('primary_key_naming', file_path)
+
+    def _check_single_class_per_file(self, ctx: FileContext, rule: Rule) -> List[ValidationViolation]:
+        """Check that the file contains only one public class"""
         violations = []
         
         try:
-            with open(self.project_root / file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+            # Diff-scoped runs count the whole file only when a declaration lies in a changed window
+            if ctx.windows is not None and not any(ctx.finditer(CLASS_DECLARATION)):
+                return []
                 
             # Find all public class declarations
-            class_pattern = r'^\s*(?:\/\/\/.*\n)*\s*(?:\[.*\]\s*)*public\s+(?:partial\s+)?class\s+(\w+)'
-            matches = list(re.finditer(class_pattern, content, re.MULTILINE))
-            
-            if len(matches) > 1:
-                class_names = [match.group(1) for match in matches]
-                for i, match in enumerate(matches):
-                    line_number = content[:match.start()].count('\n') + 1
-                    violations.append(ValidationViolation(
-                        file_path=file_path,
-                        line_number=line_number,
-                        violation_type='multiple_classes_per_file',
-                        severity='error',
-                        rule_id='class_single_per_file',
-                        message=f'Multiple public classes found in file: {", ".join(class_names)}',
-                        suggestion=f'Move class "{match.group(1)}" to its own file: {match.group(1)}.cs'
-                    ))
+            violations = self._class_violations(ctx.file_path, self._class_declarations(ctx, whole_file=True), rule)
                     
         except Exception as e:
-            print(f"Error validating {file_path}: {e}")
+            print(f"Error validating {ctx.file_path}: {e}")
             
         return violations
         
-    def validate_xml_documentation(self, file_path: str) -> List[ValidationViolation]:
-        """Validate XML documentation for public members"""
+    @staticmethod
+    def _class_declarations(ctx: FileContext, whole_file: bool = False) -> List[Tuple[int, str]]:
+        """(line, name) of every public class declaration the context searches"""
+        return [(ctx.line_number(match.start()), match.group(1))
+                for match in ctx.finditer(CLASS_DECLARATION, whole_file=whole_file)]
+        
+    @staticmethod
+    def _class_violations(file_path: str, declarations: List[Tuple[int, str]], rule: Rule) -> List[ValidationViolation]:
+        """One violation per public class of a file that declares more than one"""
+        if len(declarations) <= 1:
+            return []
+        class_names = ', '.join(name for _, name in declarations)
+        return [ValidationViolation(
+                    file_path=file_path,
+                    line_number=line_number,
+                    violation_type='multiple_classes_per_file',
+                    severity=rule.severity,
+                    rule_id=rule.rule_id,
+                    message=f'Multiple public classes found in file: {class_names}',
+                    suggestion=f'Move class "{name}" to its own file: {name}.cs'
+                ) for line_number, name in declarations]
+        
+    def _check_xml_documentation(self, ctx: FileContext, rule: Rule) -> List[ValidationViolation]:
+        """Check XML documentation for public types and members"""
         violations = []
         
-        if not file_path.endswith('.cs'):
-            return violations
-            
         try:
-            with open(self.project_root / file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+            # Each public declaration line, then a bounded walk back over attributes and blank lines
+            for match in ctx.finditer(PUBLIC_DECLARATION):
+                declaration = parse_public_declaration(match.group(0))
+                if declaration is None:
+                    continue
+                kind, name = declaration
                 
-            # Find public classes without XML documentation
-            class_pattern = r'(?:^|\n)(\s*)(?:(?!\/\/\/).*\n)*\s*public\s+(?:partial\s+)?class\s+(\w+)'
-            for match in re.finditer(class_pattern, content, re.MULTILINE):
-                preceding_text = content[:match.start()]
-                lines_before = preceding_text.split('\n')[-5:]  # Check last 5 lines
-                
-                has_xml_doc = any('///' in line for line in lines_before)
-                if not has_xml_doc:
-                    line_number = preceding_text.count('\n') + 1
-                    violations.append(ValidationViolation(
-                        file_path=file_path,
-                        line_number=line_number,
-                        violation_type='missing_xml_documentation',
-                        severity='warning',
-                        rule_id='xml_documentation_required',
-                        message=f'Public class "{match.group(2)}" missing XML documentation',
-                        suggestion=f'Add /// <summary> documentation above class "{match.group(2)}"'
-                    ))
+                line_number = ctx.line_number(match.start())
+                if has_xml_doc_above(ctx, line_number):
+                    continue
+                    
+                violations.append(ctx.violation(
+                    match.start(),
+                    violation_type='missing_xml_documentation',
+                    severity=rule.severity,
+                    rule_id=rule.rule_id,
+                    message=f'Public {kind} "{name}" missing XML documentation',
+                    suggestion=f'Add /// <summary> documentation above {kind} "{name}"'
+                ))
                     
         except Exception as e:
-            print(f"Error validating XML documentation in {file_path}: {e}")
+            print(f"Error validating XML documentation in {ctx.file_path}: {e}")
             
         return violations
 
-    def validate_console_statements(self, file_path: str) -> List[ValidationViolation]:
-        """Validate no console statements in production code"""
+    def _check_console_statements(self, ctx: FileContext, rule: Rule) -> List[ValidationViolation]:
+        """Check for console statements in production code"""
         violations = []
         
-        if not file_path.endswith(('.ts', '.tsx')):
-            return violations
-            
         try:
-            with open(self.project_root / file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                
             # Find console statements
-            console_pattern = r'console\.(log|error|warn|info|debug)\s*\('
-            for match in re.finditer(console_pattern, content, re.MULTILINE):
-                line_number = content[:match.start()].count('\n') + 1
-                violations.append(ValidationViolation(
-                    file_path=file_path,
-                    line_number=line_number,
+            for match in ctx.finditer(CONSOLE_STATEMENT):
+                violations.append(ctx.violation(
+                    match.start(),
                     violation_type='production_debug_code',
-                    severity='error',
-                    rule_id='no_console_statements',
+                    severity=rule.severity,
+                    rule_id=rule.rule_id,
                     message=f'Console statement found: console.{match.group(1)}()',
                     suggestion='Replace with proper logging service or remove for production'
                 ))
                 
         except Exception as e:
-            print(f"Error validating console statements in {file_path}: {e}")
+            print(f"Error validating console statements in {ctx.file_path}: {e}")
             
         return violations
 
-    def validate_hardcoded_secrets(self, file_path: str) -> List[ValidationViolation]:
-        """Validate no hardcoded secrets or test data"""
+    def _check_hardcoded_secrets(self, ctx: FileContext, rule: Rule) -> List[ValidationViolation]:
+        """Check for hardcoded secrets or test data, prefiltered on every pattern's triggers in one pass"""
         violations = []
         
         try:
-            with open(self.project_root / file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+            for index, match in secret_scanner.scanner_for(rule.patterns).scan(ctx):
+                violations.append(ctx.violation(
+                    match.start(),
+                    pattern_index=index,
+                    violation_type='hardcoded_secret',
+                    severity=rule.severity,
+                    rule_id=rule.rule_id,
+                    message=f'Hardcoded secret detected: {rule.patterns[index].description}',
+                    suggestion='Move to configuration or environment variables'
+                ))
                 
-            # Patterns for hardcoded secrets
-            secret_patterns = [
-                (r'password123', 'hardcoded test password'),
-                (r'admin["\'\s]*:["\'\s]*admin', 'hardcoded admin credentials'),
-                (r'test@example\.com', 'hardcoded test email'),
-                (r'default-secret-key', 'hardcoded default secret'),
-                (r'localhost.*password', 'hardcoded localhost password')
-            ]
-            
-            for pattern, description in secret_patterns:
-                for match in re.finditer(pattern, content, re.IGNORECASE):
-                    line_number = content[:match.start()].count('\n') + 1
-                    violations.append(ValidationViolation(
-                        file_path=file_path,
-                        line_number=line_number,
-                        violation_type='hardcoded_secret',
-                        severity='error',
-                        rule_id='no_hardcoded_secrets',
-                        message=f'Hardcoded secret detected: {description}',
-                        suggestion='Move to configuration or environment variables'
-                    ))
-                    
         except Exception as e:
-            print(f"Error validating secrets in {file_path}: {e}")
+            print(f"Error validating secrets in {ctx.file_path}: {e}")
             
         return violations
         
-    def validate_inline_css_javascript(self, file_path: str) -> List[ValidationViolation]:
-        """Validate that CSS and JavaScript are not inline in .cshtml files"""
-        violations = []
+    def _check_inline_css_javascript(self, ctx: FileContext, rule: Rule) -> List[ValidationViolation]:
+        """Check that CSS and JavaScript are not inline in .cshtml files, from one pass of the Razor tokenizer"""
+        import razor_tokenizer
+        
+        styles, style_attributes, scripts, handlers = [], [], [], []
         
-        if not file_path.endswith('.cshtml'):
-            return violations
-            
         try:
-            with open(self.project_root / file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+            if not any(ctx.finditer(INLINE_MARKUP)):
+                return []
                 
-            # Check for <style> tags
-            style_pattern = r'<style\b[^>]*>(.*?)</style>'
-            for match in re.finditer(style_pattern, content, re.IGNORECASE | re.DOTALL):
-                # Allow empty style tags or ones with just whitespace
-                style_content = match.group(1).strip()
-                if style_content and not style_content.isspace():
-                    line_number = content[:match.start()].count('\n') + 1
-                    violations.append(ValidationViolation(
-                        file_path=file_path,
-                        line_number=line_number,
-                        violation_type='inline_css',
-                        severity='error',
-                        rule_id='no_inline_css',
-                        message='Inline CSS found in <style> tag',
-                        suggestion='Move CSS to a separate .css file in wwwroot/css/ and reference it with a <link> tag'
-                    ))
-                    
-            # Check for style attributes
-            style_attr_pattern = r'style\s*=\s*["\']([^"\']+)["\']'
-            for match in re.finditer(style_attr_pattern, content, re.IGNORECASE):
-                # Skip if it's a Razor expression (contains @)
-                style_value = match.group(1)
-                if '@' not in style_value:
-                    line_number = content[:match.start()].count('\n') + 1
-                    violations.append(ValidationViolation(
-                        file_path=file_path,
-                        line_number=line_number,
-                        violation_type='inline_style_attribute',
-                        severity='error',
-                        rule_id='no_style_attributes',
-                        message=f'Inline style attribute found: style="{style_value}"',
-                        suggestion='Use CSS classes instead of inline styles'
-                    ))
-                    
-            # Check for <script> tags with inline JavaScript
-            script_pattern = r'<script\b[^>]*>(.*?)</script>'
-            for match in re.finditer(script_pattern, content, re.IGNORECASE | re.DOTALL):
-                script_content = match.group(1).strip()
-                # Allow empty script tags or ones that just reference external files
-                if 'src=' not in match.group(0) and script_content and not script_content.isspace():
+            for token in razor_tokenizer.tokenize(ctx.content):
+                if isinstance(token, razor_tokenizer.RawText):
+                    # Allow empty <style>/<script> elements and scripts that reference external files
+                    content = ctx.content[token.start:token.end].strip()
+                    if not content:
+                        continue
+                    if token.element.name.lower() == 'style':
+                        styles.append(ctx.violation(
+                            token.element.offset,
+                            violation_type='inline_css',
+                            severity=rule.severity,
+                            rule_id='no_inline_css',
+                            message='Inline CSS found in <style> tag',
+                            suggestion='Move CSS to a separate .css file in wwwroot/css/ and reference it with a <link> tag'
+                        ))
                     # Skip if it's just setting a variable from Razor
-                    if not re.match(r'^\s*var\s+\w+\s*=\s*@', script_content):
-                        line_number = content[:match.start()].count('\n') + 1
-                        violations.append(ValidationViolation(
-                            file_path=file_path,
-                            line_number=line_number,
+                    elif token.element.attribute('src') is None and not RAZOR_VARIABLE_SCRIPT.match(content):
+                        scripts.append(ctx.violation(
+                            token.element.offset,
                             violation_type='inline_javascript',
-                            severity='error',
+                            severity=rule.severity,
                             rule_id='no_inline_javascript',
                             message='Inline JavaScript found in <script> tag',
                             suggestion='Move JavaScript to a separate .js file in wwwroot/js/ and reference it with <script src="">'
                         ))
-                        
-            # Check for event handler attributes (onclick, onchange, etc.)
-            event_handler_pattern = r'\bon\w+\s*=\s*["\']([^"\']+)["\']'
-            for match in re.finditer(event_handler_pattern, content, re.IGNORECASE):
-                event_handler = match.group(0).split('=')[0].strip()
-                line_number = content[:match.start()].count('\n') + 1
+                    continue
+                    
+                for attribute in token.attributes:
+                    if not attribute.quoted or not attribute.value:
+                        continue
+                    name = attribute.name.lower()
+                    # Skip style values that are Razor expressions (contain @)
+                    if name == 'style' and '@' not in attribute.value:
+                        style_attributes.append(ctx.violation(
+                            attribute.offset,
+                            violation_type='inline_style_attribute',
+                            severity=rule.severity,
+                            rule_id='no_style_attributes',
+                            message=f'Inline style attribute found: style="{attribute.value}"',
+                            suggestion='Use CSS classes instead of inline styles'
+                        ))
+                    elif EVENT_HANDLER_NAME.fullmatch(name):
+                        handlers.append(ctx.violation(
+                            attribute.offset,
+                            violation_type='inline_event_handler',
+                            severity=rule.severity,
+                            rule_id='no_inline_event_handlers',
+                            message=f'Inline event handler found: {attribute.name}',
+                            suggestion='Use addEventListener in a separate JavaScript file or use a JavaScript framework event binding'
+                        ))
+                    
+        except Exception as e:
+            print(f"Error validating inline CSS/JavaScript in {ctx.file_path}: {e}")
+            
+        # Reported by kind, as the per-pattern scans did
+        return styles + style_attributes + scripts + handlers
+        
+    def _check_incomplete_implementations(self, ctx: FileContext, rule: Rule) -> List[ValidationViolation]:
+        """Check for incomplete implementations"""
+        violations = []
+        
+        try:
+            for index, pattern in enumerate(rule.patterns):
+                for match in ctx.finditer(pattern):
+                    violations.append(ctx.violation(
+                        match.start(),
+                        pattern_index=index,
+                        violation_type='incomplete_implementation',
+                        severity=rule.severity,
+                        rule_id=rule.rule_id,
+                        message=f'Incomplete implementation: {pattern.description}',
+                        suggestion='Complete the implementation before committing'
+                    ))
+                    
+        except Exception as e:
+            print(f"Error validating implementations in {ctx.file_path}: {e}")
+            
+        return violations
+
+    def _check_duplicate_type_names(self, file_path: str, rule: Rule) -> List[ValidationViolation]:
+        """Check the file's types against every other type declared under src/"""
+        violations = []
+        if not SymbolIndex.covers(file_path):
+            return violations
+        
+        try:
+            for declaration in self.symbols.declared_in(file_path):
+                duplicates = self.symbols.duplicates_of(declaration)
+                if not duplicates:
+                    continue
+                locations = ', '.join(f'{d.file_path}:{d.line_number}' for d in duplicates[:3])
+                if len(duplicates) > 3:
+                    locations += f' and {len(duplicates) - 3} more'
                 violations.append(ValidationViolation(
                     file_path=file_path,
-                    line_number=line_number,
-                    violation_type='inline_event_handler',
-                    severity='error',
-                    rule_id='no_inline_event_handlers',
-                    message=f'Inline event handler found: {event_handler}',
-                    suggestion='Use addEventListener in a separate JavaScript file or use a JavaScript framework event binding'
+                    line_number=declaration.line_number,
+                    violation_type='duplicate_type_name',
+                    severity=rule.severity,
+                    rule_id=rule.rule_id,
+                    message=f'{declaration.kind.title()} "{declaration.name}" is also declared in {locations}',
+                    suggestion=f'Rename "{declaration.name}" or reuse the existing type; type names must be unique system-wide'
                 ))
-                    
+                
         except Exception as e:
-            print(f"Error validating inline CSS/JavaScript in {file_path}: {e}")
+            print(f"Error validating duplicate type names in {file_path}: {e}")
             
         return violations
-        
-    def validate_incomplete_implementations(self, file_path: str) -> List[ValidationViolation]:
-        """Validate no incomplete implementations"""
+
+    def _check_duplicate_file_names(self, file_path: str, rule: Rule) -> List[ValidationViolation]:
+        """Check the file's name against every other file under src/"""
         violations = []
-        
-        if not file_path.endswith('.cs'):
+        if not SymbolIndex.covers(file_path):
             return violations
+        
+        try:
+            others = self.symbols.files_named(file_path)
+            if others:
+                violations.append(ValidationViolation(
+                    file_path=file_path,
+                    line_number=1,
+                    violation_type='duplicate_file_name',
+                    severity=rule.severity,
+                    rule_id=rule.rule_id,
+                    message=f'File name "{os.path.basename(file_path)}" is also used by {", ".join(others)}',
+                    suggestion='Rename the file and the class it contains so file names are unique'
+                ))
+                
+        except Exception as e:
+            print(f"Error validating duplicate file names in {file_path}: {e}")
             
+        return violations
+
+    def _check_primary_key_names(self, file_path: str, rule: Rule) -> List[ValidationViolation]:
+        """Check that entity keys declared in the file follow the {TableName}Id convention"""
+        violations = []
+        if not EntityIndex.covers(file_path):
+            return violations
+        
         try:
-            with open(self.project_root / file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+            for key in self.entities.keys_declared_in(file_path):
+                # Composite keys (join tables) have no single {TableName}Id to follow
+                if len(key.properties) != 1:
+                    continue
+                expected = f'{key.entity}Id'
+                if key.properties[0] == expected:
+                    continue
+                violations.append(ValidationViolation(
+                    file_path=file_path,
+                    line_number=key.line_number,
+                    violation_type='primary_key_naming',
+                    severity=rule.severity,
+                    rule_id=rule.rule_id,
+                    message=f'Primary key of entity "{key.entity}" is "{key.properties[0]}" ({key.source}), expected "{expected}"',
+                    suggestion=f'Rename the key to {expected} and add a migration for the column rename'
+                ))
                 
-            # Patterns for incomplete implementations
-            incomplete_patterns = [
-                (r'throw new NotImplementedException', 'NotImplementedException found'),
-                (r'\/\/\s*TODO', 'TODO comment found'),
-                (r'\/\/\s*FIXME', 'FIXME comment found'),
-                (r'\/\/\s*HACK', 'HACK comment found')
-            ]
-            
-            for pattern, description in incomplete_patterns:
-                for match in re.finditer(pattern, content, re.IGNORECASE):
-                    line_number = content[:match.start()].count('\n') + 1
-                    violations.append(ValidationViolation(
-                        file_path=file_path,
-                        line_number=line_number,
-                        violation_type='incomplete_implementation',
-                        severity='error',
-                        rule_id='no_incomplete_implementations',
-                        message=f'Incomplete implementation: {description}',
-                        suggestion='Complete the implementation before committing'
+        except Exception as e:
+            print(f"Error validating primary key names in {file_path}: {e}")
+            
+        return violations
+
+    def _check_configured_pattern(self, ctx: FileContext, rule: Rule) -> List[ValidationViolation]:
+        """Check a pattern rule declared in the coding standards config"""
+        violations = []
+        
+        try:
+            for index, pattern in enumerate(rule.patterns):
+                for match in ctx.finditer(pattern):
+                    violations.append(ctx.violation(
+                        match.start(),
+                        pattern_index=index,
+                        violation_type=rule.violation_type,
+                        severity=rule.severity,
+                        rule_id=rule.rule_id,
+                        message=rule.message,
+                        suggestion=rule.suggestion
                     ))
                     
         except Exception as e:
-            print(f"Error validating implementations in {file_path}: {e}")
+            print(f"Error validating {rule.rule_id} in {ctx.file_path}: {e}")
             
         return violations
 
-    def validate_all_files(self, files: List[str]) -> Dict[str, Any]:
-        """Run all validations on the provided files"""
+    def validate_file(self, file_path: str, ctx: Optional[FileContext] = None) -> List[ValidationViolation]:
+        """Run every applicable rule on one file, reading it at most once"""
+        # Skip files no rule applies to, or generated files no remaining rule checks, before touching the disk
+        rules = self.rules_to_run(file_path)
+        if not rules:
+            return []
+            
+        # Read the file once and run every applicable rule against it; large files are read in chunks
+        if ctx is None:
+            if self.is_large_file(file_path):
+                return self.validate_large_file(file_path, rules=rules) or []
+            ctx = self.load_file_context(file_path)
+            if ctx is None:
+                return []
+        self.last_context = ctx
+                
+        # Skip rules, and with them the whole file, when none of their trigger literals occur
+        violations = []
+        for rule in rules:
+            if ctx.contains_any(rule.triggers):
+                if self.profile is None and self.generated_stats is None:
+                    violations.extend(self.run_rule(rule, ctx))
+                else:
+                    violations.extend(self._run_profiled_rule(rule, ctx))
+        return violations
+
+    def is_large_file(self, file_path: str, size: Optional[int] = None) -> bool:
+        """Whether a file is validated in chunks: at least the threshold in bytes, and no rule needs it whole"""
+        if self.large_file_threshold <= 0:
+            return False
+        if size is None:
+            try:
+                size = os.path.getsize(self.project_root / file_path)
+            except OSError:
+                return False
+        return size >= self.large_file_threshold and not any(
+            rule.check in WHOLE_FILE_CHECKS for rule in self.rules_for(file_path))
+        
+    def validate_large_file(self, file_path: str, digest: Optional[Any] = None,
+                            rules: Optional[Tuple[Rule, ...]] = None) -> Optional[List[ValidationViolation]]:
+        """Validate a file chunk by chunk in bounded memory, finding what validate_file would; digest, a hashlib
+        object, is fed the content as it is read. None when the file cannot be read"""
+        if rules is None:
+            rules = self.rules_to_run(file_path)
+        found: List[List[ValidationViolation]] = [[] for _ in rules]
+        declarations: List[Tuple[int, str]] = []
+        ranks: Dict[int, int] = {}
+        chunks = iter_chunk_contexts(self.project_root / file_path, file_path, self.chunk_chars, lexer=self.use_lexer,
+                                     prefilter=self.use_prefilter, count_matches=self.profile is not None,
+                                     pattern_ranks=ranks)
+        try:
+            while True:
+                started = time.perf_counter()
+                ctx = next(chunks, None)
+                if self.profile is not None:
+                    self.profile.stages['read'] = self.profile.stages.get('read', 0.0) + time.perf_counter() - started
+                if ctx is None:
+                    break
+                start = ctx.windows[0][0]
+                if digest is not None:
+                    digest.update(ctx.content[start:].encode('utf-8', errors='ignore'))
+                if self.profile is not None:
+                    self.profile.file(file_path).bytes_scanned += len(ctx.content) - start
+                for rule, violations in zip(rules, found):
+                    if not ctx.contains_any(rule.triggers):
+                        continue
+                    started = time.perf_counter()
+                    matches_before = ctx.match_count
+                    # Class counts span the whole file, so only the declarations are collected per chunk
+                    if rule.check == '_check_single_class_per_file':
+                        declarations.extend(self._class_declarations(ctx))
+                        chunk_violations = []
+                    else:
+                        chunk_violations = self.run_rule(rule, ctx)
+                        violations.extend(chunk_violations)
+                    elapsed = time.perf_counter() - started
+                    if self.profile is not None:
+                        self.profile.record_rule(rule.rule_id, file_path, elapsed, len(ctx.content) - start,
+                                                 ctx.match_count - matches_before, len(chunk_violations))
+                    if self.generated_stats is not None:
+                        self.generated_stats.record_scan(rule.rule_id, elapsed, len(ctx.content) - start)
+        except Exception as e:
+            print(f"Error reading {file_path}: {e}")
+            return None
+            
         all_violations = []
+        for rule, violations in zip(rules, found):
+            if rule.check == '_check_single_class_per_file':
+                violations = self._class_violations(file_path, declarations, rule)
+            elif len(rule.patterns) > 1:
+                # Multi-pattern rules report pattern by pattern; the stable sort keeps each pattern's file order
+                violations.sort(key=lambda violation: ranks.get(id(violation), 0))
+            all_violations.extend(violations)
+        return all_violations
         
+    def _validate_changed_lines(self, file_path: str) -> List[ValidationViolation]:
+        """Diff-scoped validation: patterns search the changed hunks and their context, structural rules still
+        see the whole file, and only violations on changed lines are kept"""
+        if not self.rules_for(file_path) and not self.cross_file_rules_for(file_path):
+            return []
+        ctx = self.load_file_context(file_path)
+        if ctx is None:
+            return []
+        changed = self.diff.changed(file_path, ctx.content)
+        violations = []
+        if changed:
+            ctx.restrict_to_lines(changed.expanded(DIFF_CONTEXT_LINES, len(ctx.lines)))
+            violations = [violation for violation in self.validate_file(file_path, ctx) + self.validate_cross_file(file_path)
+                          if changed.contains(violation.line_number)]
+        self.diff.record(file_path, ctx.content)
+        return violations
+
+    def _run_profiled_rule(self, rule: Rule, ctx: FileContext) -> List[ValidationViolation]:
+        """Run a rule, recording its time, the bytes it scanned, its regex matches and its violations"""
+        matches_before = ctx.match_count
+        started = time.perf_counter()
+        found = self.run_rule(rule, ctx)
+        elapsed = time.perf_counter() - started
+        if self.profile is not None:
+            self.profile.record_rule(rule.rule_id, ctx.file_path, elapsed, len(ctx.content),
+                                     ctx.match_count - matches_before, len(found))
+        if self.generated_stats is not None:
+            # The rate generated files would have been scanned at, had their rules run
+            self.generated_stats.record_scan(rule.rule_id, elapsed, len(ctx.content))
+        return found
+
+    def _validate_cached(self, file_path: str) -> List[ValidationViolation]:
+        """Validate a file through the result cache, re-scanning only when it changed"""
+        if not self.rules_for(file_path):
+            return []
+        try:
+            stat = os.stat(self.project_root / file_path)
+        except OSError:
+            return self.validate_file(file_path)
+            
+        cached = self.cache.get(file_path, stat.st_size, stat.st_mtime_ns)
+        if cached is not None:
+            return cached
+            
+        # Large files are hashed while they are validated, so they are read once either way
+        if self.is_large_file(file_path, stat.st_size):
+            digest = hashlib.sha1()
+            violations = self.validate_large_file(file_path, digest)
+            if violations is None:
+                return []
+            if self.cache.has_entry(file_path, stat.st_size):
+                cached = self.cache.get_by_content(file_path, stat.st_size, stat.st_mtime_ns, digest.hexdigest())
+                if cached is not None:
+                    return cached
+            self.cache.put(file_path, stat.st_size, stat.st_mtime_ns, digest.hexdigest(), violations)
+            return violations
+            
+        ctx = self.load_file_context(file_path)
+        if ctx is None:
+            return []
+        digest = ResultCache.digest(ctx.content)
+        if self.cache.has_entry(file_path, stat.st_size):
+            cached = self.cache.get_by_content(file_path, stat.st_size, stat.st_mtime_ns, digest)
+            if cached is not None:
+                return cached
+                
+        violations = self.validate_file(file_path, ctx)
+        self.cache.put(file_path, stat.st_size, stat.st_mtime_ns, digest, violations)
+        return violations
+
+    def _iter_parallel(self, files: List[str]) -> Iterator[Tuple[str, List[ValidationViolation]]]:
+        """Validate files across a process pool, yielding them in input order as soon as each is ready"""
+        ready: Dict[str, List[ValidationViolation]] = {}
+        pending = []
         for file_path in files:
-            print(f"Validating: {file_path}")
-            
-            # Run all validation rules
-            file_violations = []
-            file_violations.extend(self.validate_single_class_per_file(file_path))
-            file_violations.extend(self.validate_xml_documentation(file_path))
-            file_violations.extend(self.validate_console_statements(file_path))
-            file_violations.extend(self.validate_hardcoded_secrets(file_path))
-            file_violations.extend(self.validate_incomplete_implementations(file_path))
-            file_violations.extend(self.validate_inline_css_javascript(file_path))
-            
-            all_violations.extend(file_violations)
-            
-        # Categorize violations
-        violations_by_severity = {
-            'error': [v for v in all_violations if v.severity == 'error'],
-            'warning': [v for v in all_violations if v.severity == 'warning'],
-            'info': [v for v in all_violations if v.severity == 'info']
-        }
+            if not self.rules_for(file_path):
+                ready[file_path] = []
+                continue
+            try:
+                stat = os.stat(self.project_root / file_path)
+            except OSError:
+                pending.append((file_path, 0))
+                continue
+            cached = self.cache.get(file_path, stat.st_size, stat.st_mtime_ns) if self.cache is not None else None
+            if cached is not None:
+                ready[file_path] = cached
+            else:
+                pending.append((file_path, stat.st_size))
+                
+        # Only files finished ahead of an unfinished earlier file are held back
+        position = 0
+        def flush():
+            nonlocal position
+            while position < len(files) and files[position] in ready:
+                file_path = files[position]
+                position += 1
+                yield file_path, ready.pop(file_path)
+                
+        yield from flush()
+        if pending:
+            from concurrent.futures import ProcessPoolExecutor, as_completed
+            
+            batches = size_balanced_batches(pending, self.jobs * self.BATCHES_PER_JOB)
+            # Classified here, so the verdicts are cached and counted once, and workers never read a header
+            generated = None
+            if self.classifier is not None:
+                for file_path, _ in pending:
+                    self.generated_reason(file_path)
+                generated = self.generated
+            # With a baseline, cross-file violations are found first, so workers send back the lines around them
+            # along with the lines around the files' own violations
+            baseline_lines = None
+            if self.baseline is not None:
+                baseline_lines = {}
+                for file_path, _ in pending:
+                    self._cross_file[file_path] = self.validate_cross_file(file_path)
+                    baseline_lines[file_path] = [violation.line_number for violation in self._cross_file[file_path]]
+            with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+                futures = [executor.submit(_validate_batch, str(self.project_root), batch, self.profile is not None,
+                                           self.large_file_threshold,
+                                           {path: generated[path] for path in batch} if generated is not None else None,
+                                           {path: baseline_lines[path] for path in batch}
+                                           if baseline_lines is not None else None)
+                           for batch in batches]
+                for future in as_completed(futures):
+                    batch_results, batch_profile, batch_generated = future.result()
+                    if batch_profile is not None:
+                        self.profile.merge(batch_profile)
+                    if batch_generated is not None:
+                        self.generated_stats.add(batch_generated)
+                    for file_path, size, mtime_ns, digest, violations, lines in batch_results:
+                        if lines is not None:
+                            self._worker_lines[file_path] = lines
+                        if self.cache is not None and size >= 0 and digest:
+                            cached = None
+                            if self.cache.has_entry(file_path, size):
+                                cached = self.cache.get_by_content(file_path, size, mtime_ns, digest)
+                            if cached is None:
+                                self.cache.put(file_path, size, mtime_ns, digest, violations)
+                        ready[file_path] = violations
+                    yield from flush()
+        yield from flush()
+
+    def iter_violations(self, files: List[str]) -> Iterator[Tuple[str, List[ValidationViolation]]]:
+        """Violations file by file in input order, so reports match a serial run byte for byte"""
+        if self.jobs > 1 and len(files) > self.jobs and self.diff is None:
+            for file_path, violations in self._iter_parallel(files):
+                print(f"Validating: {file_path}")
+                started = time.perf_counter()
+                cross_file = self._cross_file.pop(file_path, None)
+                if cross_file is None:
+                    cross_file = self.validate_cross_file(file_path)
+                if self.profile is not None:
+                    self.profile.record_file(file_path, time.perf_counter() - started, len(cross_file))
+                yield file_path, violations + cross_file
+        else:
+            for file_path in files:
+                print(f"Validating: {file_path}")
+                started = time.perf_counter()
+                
+                # Diff-scoped results cover part of a file, so they neither come from nor go to the cache
+                if self.diff is not None:
+                    violations = self._validate_changed_lines(file_path)
+                elif self.cache is not None:
+                    violations = self._validate_cached(file_path) + self.validate_cross_file(file_path)
+                else:
+                    violations = self.validate_file(file_path) + self.validate_cross_file(file_path)
+                if self.profile is not None:
+                    self.profile.record_file(file_path, time.perf_counter() - started, len(violations))
+                yield file_path, violations
+                
+        if not self.defer_saves:
+            self.save_state()
+
+    def save_state(self):
+        """Write the result cache, generated-code verdicts and source indexes where they changed"""
+        if self.cache is not None:
+            self.cache.save()
+        if self.classifier is not None:
+            self.classifier.save()
+        for index in self._indexes.values():
+            index.save()
+
+    def validate_all_files(self, files: List[str], stream: Optional['ViolationStream'] = None) -> Dict[str, Any]:
+        """Run all validations on the provided files, writing to a stream instead of keeping them if given"""
+        all_violations = []
+        counter = stream.counter if stream is not None else ViolationCounter()
+        # Classifications and their statistics are per run; the classifier's cache catches unchanged files
+        self.generated = {}
+        if self.classifier is not None:
+            self.generated_stats = generated_code.GeneratedCodeStats()
+        if self.baseline is not None:
+            self.baseline.suppressed = 0
+        self._worker_lines = {}
+        self._cross_file = {}
         
+        for file_path, violations in self.iter_violations(files):
+            # Known violations are dropped here, after the result cache, which keeps every violation
+            if self.baseline is not None:
+                violations = self.baseline.new_violations(file_path, violations,
+                                                          self.baseline_lines(file_path, violations))
+            self.last_context = None
+            if stream is not None:
+                stream.write(violations)
+            else:
+                counter.add(violations)
+                all_violations.extend(violations)
+                
+        if stream is not None:
+            stream.close()
+            
         # Calculate compliance score
         total_files = len(files)
-        files_with_errors = len(set(v.file_path for v in violations_by_severity['error']))
-        compliance_score = max(0, 100 - (files_with_errors / max(total_files, 1)) * 100)
+        compliance_score = max(0, 100 - (len(counter.files_with_errors) / max(total_files, 1)) * 100)
         
         return {
             'total_files_checked': total_files,
-            'total_violations': len(all_violations),
+            'total_violations': counter.total,
             'violations_by_severity': {
-                'errors': len(violations_by_severity['error']),
-                'warnings': len(violations_by_severity['warning']),
-                'info': len(violations_by_severity['info'])
+                'errors': counter.by_severity['error'],
+                'warnings': counter.by_severity['warning'],
+                'info': counter.by_severity['info']
             },
             'compliance_score': round(compliance_score, 1),
-            'violations': all_violations
+            'cache': {
+                'hits': self.cache.hits if self.cache is not None else 0,
+                'misses': self.cache.misses if self.cache is not None else 0
+            },
+            'violations': all_violations,
+            'violations_file': str(stream.jsonl_path) if stream is not None else None,
+            'profile': self.profile,
+            'generated': self.generated_stats,
+            'baseline': (os.path.relpath(self.baseline.path, self.project_root)
+                         if self.baseline is not None else None),
+            'baseline_suppressed': self.baseline.suppressed if self.baseline is not None else 0
         }
         
-    def generate_report(self, results: Dict[str, Any]) -> str:
-        """Generate a formatted validation report"""
-        violations = results['violations']
-        
-        report = []
-        report.append("# Code Validation Report")
-        report.append(f"**Files Checked**: {results['total_files_checked']}")
-        report.append(f"**Compliance Score**: {results['compliance_score']}/100")
-        report.append(f"**Total Violations**: {results['total_violations']}")
-        report.append("")
+    def baseline_lines(self, file_path: str, violations: List[ValidationViolation]) -> Optional[Dict[int, str]]:
+        """Lines around a file's violations from a copy already in memory: the file validate_file last ran on, or
+        what a worker sent back. None for cache hits and chunked files, which the baseline reads line by line"""
+        lines = self._worker_lines.pop(file_path, None)
+        if lines is None and self.last_context is not None and self.last_context.file_path == file_path:
+            lines = nearby_lines(self.last_context, [violation.line_number for violation in violations])
+        return lines
+
+    @staticmethod
+    def _report_lines(results: Dict[str, Any], violations_of: Any) -> Iterator[str]:
+        """Markdown report lines; violations_of(severity) yields that severity's violations in run order"""
+        yield "# Code Validation Report"
+        yield f"**Files Checked**: {results['total_files_checked']}"
+        if results.get('baseline'):
+            yield f"**Compliance Score**: {results['compliance_score']}/100 (new violations only)"
+        else:
+            yield f"**Compliance Score**: {results['compliance_score']}/100"
+        yield f"**Total Violations**: {results['total_violations']}"
+        if results.get('baseline'):
+            yield (f"**Known Violations**: {results['baseline_suppressed']} recorded in {results['baseline']}, "
+                   f"neither reported nor scored")
+        yield ""
         
         # Summary by severity
-        report.append("## Summary")
-        report.append(f"- **Errors**: {results['violations_by_severity']['errors']}")
-        report.append(f"- **Warnings**: {results['violations_by_severity']['warnings']}")
-        report.append(f"- **Info**: {results['violations_by_severity']['info']}")
-        report.append("")
+        yield "## Summary"
+        yield f"- **Errors**: {results['violations_by_severity']['errors']}"
+        yield f"- **Warnings**: {results['violations_by_severity']['warnings']}"
+        yield f"- **Info**: {results['violations_by_severity']['info']}"
+        yield ""
         
-        if violations:
-            report.append("## Violations")
+        if results.get('profile') is not None:
+            yield from results['profile'].report_lines()
+        if results.get('generated') is not None and results['generated'].files:
+            # Savings and timings only with --stats, so the report otherwise depends on the tree alone
+            yield from results['generated'].report_lines(timings=results.get('profile') is not None)
+            
+        if results['total_violations']:
+            yield "## Violations"
             
             # Group by severity
+            counts = {'error': 'errors', 'warning': 'warnings', 'info': 'info'}
             for severity in ['error', 'warning', 'info']:
-                severity_violations = [v for v in violations if v.severity == severity]
-                if severity_violations:
+                if results['violations_by_severity'][counts[severity]]:
                     icon = {'error': 'ERROR', 'warning': 'WARNING', 'info': 'INFO'}[severity]
-                    report.append(f"### {icon}: {severity.title()} Issues")
+                    yield f"### {icon}: {severity.title()} Issues"
                     
-                    for violation in severity_violations:
-                        report.append(f"**File**: `{violation.file_path}:{violation.line_number}`")
-                        report.append(f"**Rule**: {violation.rule_id}")
-                        report.append(f"**Message**: {violation.message}")
-                        report.append(f"**Suggestion**: {violation.suggestion}")
-                        report.append("")
+                    for violation in violations_of(severity):
+                        yield f"**File**: `{violation.file_path}:{violation.line_number}`"
+                        yield f"**Rule**: {violation.rule_id}"
+                        yield f"**Message**: {violation.message}"
+                        yield f"**Suggestion**: {violation.suggestion}"
+                        yield ""
         else:
-            report.append("## SUCCESS: No Violations Found")
-            report.append("All checked files comply with coding standards!")
+            yield "## SUCCESS: No Violations Found"
+            yield "All checked files comply with coding standards!"
+            
+    def generate_report(self, results: Dict[str, Any]) -> str:
+        """Generate a formatted validation report"""
+        violations = results['violations']
+        return "\n".join(self._report_lines(results, lambda severity: (v for v in violations if v.severity == severity)))
+        
+    def write_report(self, results: Dict[str, Any], report_file: Path):
+        """Render the report straight to disk, re-reading the JSON Lines stream once per severity"""
+        if results.get('violations_file') is None:
+            with open(report_file, 'w', encoding='utf-8') as f:
+                f.write(self.generate_report(results))
+            return
             
-        return "\n".join(report)
+        violations_file = Path(results['violations_file'])
+        with open(report_file, 'w', encoding='utf-8') as f:
+            for index, line in enumerate(self._report_lines(
+                    results, lambda severity: read_violations(violations_file, severity))):
+                f.write(f"\n{line}" if index else line)
 
-def main():
-    """Main execution function"""
-    print("Starting validation hook...")
-    project_root = os.getcwd()
-    print(f"Working directory: {project_root}")
-    validator = CodeValidator(project_root)
-    
-    print("*** MeAndMyDog Code Validation Hook ***")
-    print("=" * 50)
-    
-    # Get recently modified files using filesystem timestamps
-    print("Getting recently modified files (last 2 days)...")
-    modified_files = validator.get_recently_modified_files(days=2)
+@dataclass
+class ValidationResult:
+    """Outcome of a validation run for in-process callers and --json"""
+    files_checked: int
+    total_violations: int
+    errors: int
+    warnings: int
+    info: int
+    compliance_score: float
+    violations: List[ValidationViolation]
+    report_path: Optional[str] = None
+    violations_file: Optional[str] = None
+    cache_hits: int = 0
+    cache_misses: int = 0
+    profile: Optional[Dict[str, Any]] = None
+    generated: Optional[Dict[str, Any]] = None
+    baseline: Optional[str] = None  # the baseline file known violations were hidden by, if any
+    baseline_suppressed: int = 0
+    output: str = ''
+
+    @property
+    def has_errors(self) -> bool:
+        return self.errors > 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serialisable form, used by --json"""
+        data = {name: value for name, value in self.__dict__.items() if name not in ('violations', 'output')}
+        data['has_errors'] = self.has_errors
+        data['violations'] = [violation.to_dict() for violation in self.violations]
+        return data
+
+def normalize_paths(project_root: str, paths: List[str]) -> List[str]:
+    """Explicit paths as project-relative source files, dropping other files and pruned directories"""
+    files = []
+    for path in paths:
+        relative_path = os.path.normpath(os.path.relpath(os.path.join(project_root, path), project_root))
+        if (relative_path.endswith(SOURCE_EXTENSIONS) and not relative_path.startswith('..')
+                and not CodeValidator._in_excluded_dir(relative_path.replace(os.sep, '/'))
+                and os.path.isfile(os.path.join(project_root, relative_path))):
+            files.append(relative_path)
+    return list(dict.fromkeys(files))
+
+def profile_output_refusal(project_root: str, path: str) -> Optional[str]:
+    """Why profile stacks must not overwrite a path, or None: source files and files git tracks are never replaced"""
+    if path.lower().endswith(SOURCE_EXTENSIONS):
+        return 'it is a source file'
+    relative_path = os.path.relpath(os.path.join(project_root, path), project_root)
+    if relative_path.startswith('..'):
+        return None
+    try:
+        from git_changes import find_git_dir, read_index
+        
+        git_dir = find_git_dir(Path(project_root))
+        if git_dir is not None and relative_path.replace(os.sep, '/') in {
+                entry.path for entry in read_index(git_dir).entries}:
+            return 'git tracks it'
+    except (OSError, ValueError):
+        pass
+    return None
+
+def discover_files(validator: CodeValidator, changes: str = 'mtime') -> List[str]:
+    """Changed files by mtime, git index or recent commits, falling back to every source file; 'all' lists every
+    source file"""
+    if changes == 'all':
+        return validator.get_all_source_files()
+    # Get changed files from filesystem timestamps, the git index, or recent commits
+    if changes == 'index':
+        print("Getting uncommitted changes from the git index...")
+        modified_files = validator.get_uncommitted_files()
+    elif changes == 'commits':
+        print("Getting files changed by commits (last 2 days)...")
+        modified_files = validator.get_committed_files(days=2)
+    else:
+        print("Getting recently modified files (last 2 days)...")
+        modified_files = validator.get_recently_modified_files(days=2)
     
     if not modified_files:
         print("INFO: No recently modified files found. Checking all C#, TypeScript, and Razor files as fallback...")
         # Fallback to checking all files if no recent modifications
-        all_files = []
-        for ext in ['.cs', '.ts', '.tsx', '.cshtml']:
-            for file_path in Path(project_root).rglob(f'*{ext}'):
-                if ('node_modules' not in str(file_path) and 
-                    'bin' not in str(file_path) and 
-                    'obj' not in str(file_path) and
-                    'packages' not in str(file_path) and
-                    'wwwroot/lib' not in str(file_path) and
-                    '.git' not in str(file_path)):
-                    all_files.append(str(file_path.relative_to(project_root)))
+        all_files = validator.get_all_source_files()
         print(f"Found {len(all_files)} total files")
         # Don't limit files - check all of them for comprehensive validation
         modified_files = all_files
-        
-    if not modified_files:
+    return modified_files
+
+def validate_and_report(validator: CodeValidator, files: List[str], jsonl: Optional[str] = None,
+                        sarif: Optional[str] = None, collect_violations: bool = True) -> ValidationResult:
+    """Validate files, streaming violations to JSON Lines (and SARIF), then render the Markdown report"""
+    project_root = validator.project_root
+    if not files:
         print("INFO: No C#, TypeScript, or Razor files found.")
-        return
+        return ValidationResult(0, 0, 0, 0, 0, 100.0, [])
         
-    print(f"Found {len(modified_files)} files to validate:")
-    for file in modified_files[:10]:  # Show first 10
+    print(f"Found {len(files)} files to validate:")
+    for file in files[:10]:  # Show first 10
         print(f"   - {file}")
-    if len(modified_files) > 10:
-        print(f"   ... and {len(modified_files) - 10} more")
+    if len(files) > 10:
+        print(f"   ... and {len(files) - 10} more")
     print()
     
     # Run validation
     print("Running validation checks...")
-    results = validator.validate_all_files(modified_files)
-    
-    # Generate and save report
-    report = validator.generate_report(results)
+    profile = validator.profile
+    jsonl_path = project_root / (jsonl or os.path.join(ResultCache.CACHE_DIR, 'violations.jsonl'))
+    stream = ViolationStream(jsonl_path, project_root / sarif if sarif else None)
+    with profile.stage('validate') if profile is not None else contextlib.nullcontext():
+        results = validator.validate_all_files(files, stream=stream)
     
-    # Save report to file
-    report_file = Path(project_root) / "CODE_VALIDATION_REPORT.md"
-    with open(report_file, 'w', encoding='utf-8') as f:
-        f.write(report)
+    # Render the report from the violation stream and save it
+    report_file = project_root / "CODE_VALIDATION_REPORT.md"
+    with profile.stage('report') if profile is not None else contextlib.nullcontext():
+        validator.write_report(results, report_file)
     
     print(f"Validation complete! Report saved to: {report_file}")
+    print(f"Violations streamed to: {results['violations_file']}")
+    if sarif:
+        print(f"SARIF written to: {project_root / sarif}")
+    if profile is not None:
+        profile.print_top()
+        
+    return ValidationResult(
+        files_checked=results['total_files_checked'],
+        total_violations=results['total_violations'],
+        errors=results['violations_by_severity']['errors'],
+        warnings=results['violations_by_severity']['warnings'],
+        info=results['violations_by_severity']['info'],
+        compliance_score=results['compliance_score'],
+        violations=list(read_violations(jsonl_path)) if collect_violations else [],
+        report_path=str(report_file),
+        violations_file=results['violations_file'],
+        cache_hits=results['cache']['hits'],
+        cache_misses=results['cache']['misses'],
+        profile=profile.to_dict() if profile is not None else None,
+        generated=results['generated'].to_dict() if results['generated'] is not None else None,
+        baseline=results['baseline'],
+        baseline_suppressed=results['baseline_suppressed']
+    )
+
+def new_baseline(project_root: Path, path: str, registry: Optional[RuleRegistry] = None) -> Any:
+    """A violation_baseline.ViolationBaseline that knows which of the registry's rules are file-scoped"""
+    from violation_baseline import ViolationBaseline
+    
+    registry = registry if registry is not None else load_rule_registry()
+    return ViolationBaseline(project_root, path, (rule.rule_id for rule in registry.rules if rule.file_scoped))
+
+def load_baseline(project_root: Path, path: str, registry: Optional[RuleRegistry] = None) -> Optional[Any]:
+    """The violation baseline at path, or None when there is none yet"""
+    baseline = new_baseline(project_root, path, registry)
+    return baseline if baseline.load() else None
+
+def update_baseline(project_root: str, path: str, result: ValidationResult, files: Optional[List[str]] = None) -> int:
+    """Rewrite the baseline entries of the validated files (every file when None) from a run's violation stream in
+    one pass; returns the fingerprints the baseline holds"""
+    baseline = new_baseline(Path(project_root), path)
+    baseline.load()
+    return baseline.update(files, read_violations(Path(result.violations_file)))
+
+def run_validation(project_root: Optional[str] = None, changes: str = 'mtime', use_cache: bool = True,
+                   jobs: int = 1, jsonl: Optional[str] = None, sarif: Optional[str] = None,
+                   collect_violations: bool = True, quiet: bool = False,
+                   files: Optional[List[str]] = None, profile: bool = False, top: int = 10,
+                   diff: Optional[str] = None, large_file_threshold: int = LARGE_FILE_THRESHOLD,
+                   include_generated: bool = False, baseline: Optional[str] = BASELINE_FILE) -> ValidationResult:
+    """Validate explicit files, or find changed ones; quiet captures progress into result.output.
+    diff names a diff_scope baseline ('head', 'index' or 'snapshot') to check only the lines changed since it;
+    files of at least large_file_threshold bytes are validated in chunks (0 reads every file whole);
+    include_generated runs every rule on generated code too; violations recorded in the baseline file, when it
+    exists, are neither reported nor counted, so the compliance score covers new violations only (None reports
+    every violation)"""
+    if quiet:
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            result = run_validation(project_root, changes, use_cache, jobs, jsonl, sarif, collect_violations,
+                                    files=files, profile=profile, top=top, diff=diff,
+                                    large_file_threshold=large_file_threshold, include_generated=include_generated,
+                                    baseline=baseline)
+        result.output = output.getvalue()
+        return result
+        
+    print("Starting validation hook...")
+    project_root = project_root or os.getcwd()
+    print(f"Working directory: {project_root}")
+    validator = CodeValidator(project_root, use_cache=use_cache, jobs=jobs, profile=profile, top=top,
+                              large_file_threshold=large_file_threshold, classify_generated=not include_generated)
+    if diff:
+        from diff_scope import DiffScope
+        
+        validator.diff = DiffScope(validator.project_root, diff)
+    if baseline:
+        validator.baseline = load_baseline(validator.project_root, baseline, validator.registry)
+    
+    print("*** MeAndMyDog Code Validation Hook ***")
+    print("=" * 50)
+    if validator.diff is not None:
+        print(f"Checking only lines changed since the {validator.diff.baseline} baseline")
+    if validator.baseline is not None:
+        print(f"Reporting only violations not in {baseline} ({len(validator.baseline.fingerprints)} known)")
+    
+    with validator.profile.stage('discovery') if profile else contextlib.nullcontext():
+        if files:
+            files = validator.explicit_files = normalize_paths(project_root, files)
+        else:
+            files = discover_files(validator, changes)
+    return validate_and_report(validator, files, jsonl, sarif, collect_violations)
+
+class ValidationDaemon:
+    """A warm validator that follows file changes and answers validation requests on a local socket"""
+    
+    ENDPOINT_FILE = 'daemon.json'
+    SOCKET_FILE = 'daemon.sock'
+    SAVE_DELAY = 2.0  # seconds of quiet before revalidated results and indexes are written to disk
+    
+    def __init__(self, project_root: str, debounce: float = 0.2, force_polling: bool = False,
+                 large_file_threshold: int = LARGE_FILE_THRESHOLD):
+        import secrets
+        
+        self.project_root = Path(project_root)
+        self.debounce = debounce
+        self.force_polling = force_polling
+        self.validator = CodeValidator(project_root, use_cache=True, large_file_threshold=large_file_threshold)
+        self.validator.defer_saves = True
+        self.endpoint_path = self.project_root / ResultCache.CACHE_DIR / self.ENDPOINT_FILE
+        self.token = secrets.token_hex(16)
+        self.pending: set = set()
+        self.rescan = False
+        self.last_event = 0.0
+        self.save_due: Optional[float] = None  # monotonic time unsaved results are written at
+        self.running = False
+        self.server = None
+        self.watcher = None
+        
+    def start(self):
+        """Warm the caches and indexes, start watching and open the endpoint"""
+        from file_watcher import create_watcher
+        
+        started = time.perf_counter()
+        files = self.validator.get_all_source_files()
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.validator.validate_all_files(files)
+        self.save()
+        print(f"Warmed {len(files)} files in {(time.perf_counter() - started) * 1000:.0f} ms")
+        
+        root = str(self.project_root)
+        self.watcher = create_watcher(
+            root, is_pruned_dir, lambda name: name.endswith(SOURCE_EXTENSIONS),
+            lambda: {path: (mtime, size) for path, mtime, size in CodeValidator(root).walk_source_files()},
+            force_polling=self.force_polling)
+        print(f"Watching with {type(self.watcher).__name__}")
+        
+        self.server, endpoint = self._listen()
+        self.endpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        descriptor = os.open(self.endpoint_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as f:
+            json.dump({**endpoint, 'token': self.token, 'pid': os.getpid()}, f)
+        print(f"Listening on {endpoint.get('path') or endpoint.get('port')}")
+        
+    def _listen(self) -> Tuple['socket.socket', Dict[str, Any]]:
+        """A Unix socket in the cache directory, or a loopback TCP port where AF_UNIX is missing"""
+        import socket
+        
+        if hasattr(socket, 'AF_UNIX'):
+            path = str(self.project_root / ResultCache.CACHE_DIR / self.SOCKET_FILE)
+            if os.path.exists(path):
+                if request_daemon(str(self.project_root), {'command': 'status'}, timeout=1.0) is not None:
+                    raise RuntimeError('another validation daemon is already running for this project')
+                os.unlink(path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            server.bind(path)
+            os.chmod(path, 0o600)
+            endpoint = {'family': 'unix', 'path': path}
+        else:
+            server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            server.bind(('127.0.0.1', 0))
+            endpoint = {'family': 'tcp', 'host': '127.0.0.1', 'port': server.getsockname()[1]}
+        server.listen(8)
+        return server, endpoint
+        
+    def serve_forever(self):
+        """Single-threaded loop: collect changes, revalidate after a quiet period, answer requests"""
+        import select
+        
+        self.running = True
+        while self.running:
+            timeout = None
+            if self.pending or self.rescan:
+                timeout = max(0.0, self.debounce - (time.monotonic() - self.last_event))
+            elif self.save_due is not None:
+                timeout = max(0.0, self.save_due - time.monotonic())
+            if self.watcher.fileno() is None:
+                timeout = self.watcher.timeout() if timeout is None else min(timeout, self.watcher.timeout())
+            sources = [self.server] + ([self.watcher] if self.watcher.fileno() is not None else [])
+            readable, _, _ = select.select(sources, [], [], timeout)
+            
+            if self.watcher in readable or self.watcher.fileno() is None:
+                changed = self.watcher.read()
+                if changed is None:
+                    self.rescan = True
+                    self.last_event = time.monotonic()
+                elif changed:
+                    self.pending.update(changed)
+                    self.last_event = time.monotonic()
+                    
+            if (self.pending or self.rescan) and time.monotonic() - self.last_event >= self.debounce:
+                self.apply_changes()
+            elif self.save_due is not None and time.monotonic() >= self.save_due:
+                self.save()
+                
+            if self.server in readable:
+                connection, _ = self.server.accept()
+                with connection:
+                    self.handle(connection)
+                    
+    def apply_changes(self):
+        """Update the inventory and indexes for the coalesced changed files and revalidate them; only lost
+        events or a removed or moved-out directory re-walk the whole tree"""
+        started = time.perf_counter()
+        changed, rescan = self.pending, self.rescan
+        self.pending, self.rescan = set(), False
+        
+        validator = self.validator
+        if rescan:
+            validator._inventory = None
+            inventory = validator.walk_source_files()
+            for index in validator._indexes.values():
+                index.refresh(inventory)
+            targets = [path for path, _, _ in inventory]
+        else:
+            targets = validator.update_inventory(changed)
+            for index in validator._indexes.values():
+                index.refresh_files(sorted(changed))
+        with contextlib.redirect_stdout(io.StringIO()):
+            for file_path in targets:
+                validator._validate_cached(file_path)
+        # Writing the cache and indexes costs more than the revalidation, so bursts of saves share one write
+        self.schedule_save()
+        elapsed = (time.perf_counter() - started) * 1000
+        summary = f"rescanned {len(targets)} files" if rescan else f"revalidated {len(targets)} of {len(changed)} changed files"
+        print(f"{datetime.now().strftime('%H:%M:%S')} {summary} in {elapsed:.1f} ms")
+              
+    def handle(self, connection: 'socket.socket'):
+        """Answer one newline-terminated JSON request with one JSON response"""
+        try:
+            connection.settimeout(5.0)
+            data = b''
+            while not data.endswith(b'\n'):
+                chunk = connection.recv(65536)
+                if not chunk:
+                    break
+                data += chunk
+            request = json.loads(data or b'{}')
+            if not isinstance(request, dict) or request.get('token') != self.token:
+                response = {'error': 'invalid token'}
+            elif request.get('command') == 'status':
+                response = {'status': 'running', 'files': len(self.validator.walk_source_files()),
+                            'pending': len(self.pending)}
+            elif request.get('command') == 'stop':
+                self.running = False
+                response = {'status': 'stopping'}
+            else:
+                try:
+                    response = self.validate(request)
+                except Exception as e:
+                    # A malformed request fails alone instead of stopping the daemon
+                    print(f"Error validating for a client: {e!r}")
+                    response = {'error': f'validation failed: {e!r}'}
+            connection.sendall(json.dumps(response).encode('utf-8') + b'\n')
+        except (OSError, ValueError) as e:
+            print(f"Error handling request: {e}")
+            
+    def validate(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate requested paths (or the changed set) against the warm caches and write the report"""
+        if self.pending or self.rescan:
+            self.apply_changes()
+        started = time.perf_counter()
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            paths = request.get('paths') or []
+            if paths:
+                files = normalize_paths(str(self.project_root), paths)
+            else:
+                files = discover_files(self.validator, request.get('changes', 'mtime'))
+            if request.get('diff'):
+                from diff_scope import DiffScope
+                
+                self.validator.diff = DiffScope(self.project_root, request['diff'])
+            if request.get('baseline'):
+                self.validator.baseline = load_baseline(self.project_root, request['baseline'], self.validator.registry)
+            try:
+                result = validate_and_report(self.validator, files, request.get('jsonl'), request.get('sarif'),
+                                             collect_violations=bool(request.get('violations')))
+            finally:
+                self.validator.diff = None
+                self.validator.baseline = None
+                self.schedule_save()
+        response = result.to_dict()
+        response['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        print(f"{datetime.now().strftime('%H:%M:%S')} validated {result.files_checked} files "
+              f"for a client in {response['elapsed_ms']} ms")
+        return response
+        
+    def schedule_save(self):
+        """Write what changed once the daemon has been idle for SAVE_DELAY seconds"""
+        self.save_due = time.monotonic() + self.SAVE_DELAY
+        
+    def save(self):
+        """Write the revalidated results and refreshed indexes, so in-process runs start from them"""
+        self.save_due = None
+        self.validator.save_state()
+            
+    def close(self):
+        """Save, stop watching and remove the socket and endpoint files"""
+        import socket
+        
+        if self.save_due is not None:
+            self.save()
+        if self.watcher is not None:
+            self.watcher.close()
+        if self.server is not None:
+            if self.server.family == getattr(socket, 'AF_UNIX', None):
+                try:
+                    os.unlink(self.server.getsockname())
+                except OSError:
+                    pass
+            self.server.close()
+        try:
+            self.endpoint_path.unlink()
+        except OSError:
+            pass
+
+def request_daemon(project_root: str, request: Dict[str, Any], timeout: float = 60.0) -> Optional[Dict[str, Any]]:
+    """Send one request to a running validation daemon; None if no daemon answers"""
+    endpoint_path = Path(project_root) / ResultCache.CACHE_DIR / ValidationDaemon.ENDPOINT_FILE
+    try:
+        with open(endpoint_path, 'r', encoding='utf-8') as f:
+            endpoint = json.load(f)
+        import socket
+        
+        if endpoint['family'] == 'unix':
+            client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            address = endpoint['path']
+        else:
+            client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            address = (endpoint['host'], endpoint['port'])
+        with client:
+            client.settimeout(timeout)
+            client.connect(address)
+            client.sendall(json.dumps({**request, 'token': endpoint['token']}).encode('utf-8') + b'\n')
+            data = b''
+            while not data.endswith(b'\n'):
+                chunk = client.recv(65536)
+                if not chunk:
+                    break
+                data += chunk
+        return json.loads(data)
+    except (OSError, ValueError, KeyError, AttributeError):
+        return None
+
+def run_daemon(project_root: str, debounce: float, force_polling: bool, large_file_threshold: int = LARGE_FILE_THRESHOLD):
+    """Run the watch daemon in the foreground until interrupted or asked to stop"""
+    import signal
+    
+    daemon = ValidationDaemon(project_root, debounce=debounce, force_polling=force_polling,
+                              large_file_threshold=large_file_threshold)
+    # Let SIGTERM unwind like Ctrl+C so the socket and endpoint files are removed
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        daemon.start()
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    except RuntimeError as e:
+        print(f"Error starting validation daemon: {e}")
+        exit(1)
+    finally:
+        daemon.close()
+        print("Validation daemon stopped")
+
+def print_summary(result: ValidationResult, show_cache: bool):
+    """Results summary and exit code shared by direct runs and daemon clients"""
     print()
     print("Results Summary:")
-    print(f"   Compliance Score: {results['compliance_score']}/100")
-    print(f"   Total Violations: {results['total_violations']}")
-    print(f"   Errors: {results['violations_by_severity']['errors']}")
-    print(f"   Warnings: {results['violations_by_severity']['warnings']}")
+    scope = ' (new violations only)' if result.baseline else ''
+    print(f"   Compliance Score: {result.compliance_score}/100{scope}")
+    print(f"   Total Violations: {result.total_violations}")
+    print(f"   Errors: {result.errors}")
+    print(f"   Warnings: {result.warnings}")
+    if show_cache:
+        print(f"   Cache: {result.cache_hits} hits, {result.cache_misses} misses")
+    if result.baseline:
+        print(f"   Known violations ({result.baseline}): {result.baseline_suppressed} not reported")
+    if result.generated and result.generated['files']:
+        generated = result.generated
+        print(f"   Generated code: {generated['files']} files, {generated['skipped_rule_runs']} rule runs skipped "
+              f"({generated['skipped_bytes'] / 1e6:.2f} MB, ~{generated['saved_ms']:.0f} ms saved; "
+              f"classifier {generated['header_bytes'] / 1e3:.1f} KB, {generated['classify_ms']:.1f} ms)")
     
     # Exit with error code if critical issues found
-    if results['violations_by_severity']['errors'] > 0:
+    if result.has_errors:
         print("\nERROR: Critical issues found! Please fix errors before proceeding.")
         exit(1)
     else:
         print("\nSUCCESS: No critical issues found!")
         exit(0)
 
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description='MeAndMyDog Code Validation Hook')
+    parser.add_argument('paths', nargs='*', help='validate only these files instead of finding changed ones')
+    parser.add_argument('--no-cache', action='store_true', help='re-validate every file, ignoring .validation-cache/')
+    parser.add_argument('--changes', choices=['mtime', 'index', 'commits', 'all'], default='mtime',
+                        help='find files by mtime in the last 2 days (default), from the git index, or from recent '
+                             'commits, or validate all files')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='worker processes (default: CPU count)')
+    parser.add_argument('--jsonl', default=os.path.join(ResultCache.CACHE_DIR, 'violations.jsonl'),
+                        help='JSON Lines file violations are streamed to while validating (default: %(default)s)')
+    parser.add_argument('--sarif', help='also stream violations to this SARIF 2.1.0 file')
+    parser.add_argument('--json', action='store_true', help='print only a machine-readable JSON result to stdout')
+    parser.add_argument('--watch', action='store_true', help='run as a daemon that keeps caches warm and serves clients')
+    parser.add_argument('--poll', action='store_true', help='with --watch, poll the tree instead of using inotify')
+    parser.add_argument('--debounce', type=float, default=0.2, help='with --watch, seconds of quiet before revalidating')
+    parser.add_argument('--client', action='store_true',
+                        help='ask a running --watch daemon to validate, validating in-process if none is running or '
+                             'an option the daemon cannot honour is given')
+    parser.add_argument('--stats', action='store_true',
+                        help='time discovery, reading, indexing, each rule and each file, and list the slowest')
+    parser.add_argument('--top', type=int, default=10, help='with --stats, how many rules and files to list')
+    parser.add_argument('--diff', action='store_true', help='check only lines changed since the --diff-base baseline')
+    parser.add_argument('--diff-base', choices=['head', 'index', 'snapshot'], default='head',
+                        help='with --diff, compare against HEAD (default), the git index, or the snapshot saved by the '
+                             'last --diff run; snapshots are used when there is no git repository')
+    parser.add_argument('--large-file-threshold', type=int, metavar='BYTES',
+                        help=f'validate files of at least this size in bounded-memory chunks (default: '
+                             f'{LARGE_FILE_THRESHOLD}; 0 reads every file whole)')
+    parser.add_argument('--include-generated', action='store_true',
+                        help='run every rule on generated code (migrations, designer files, <auto-generated> sources) '
+                             'instead of only the secret scan')
+    parser.add_argument('--baseline', default=BASELINE_FILE, metavar='PATH',
+                        help='report and fail only on violations not recorded in this baseline file, when it exists '
+                             '(default: %(default)s)')
+    parser.add_argument('--no-baseline', action='store_true', help='report every violation, ignoring the baseline')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='record the current violations of the given files, or of all files, as the baseline')
+    parser.add_argument('--profile', action='store_true',
+                        help='run under cProfile and write collapsed stacks for flame graph tools to --profile-output; '
+                             'implies --stats')
+    parser.add_argument('--profile-output', default=os.path.join(ResultCache.CACHE_DIR, 'profile.folded'),
+                        metavar='PATH', help='with --profile, where to write the collapsed stacks (default: %(default)s)')
+    args = parser.parse_args()
+    if args.profile:
+        refusal = profile_output_refusal(os.getcwd(), args.profile_output)
+        if refusal:
+            parser.error(f'refusing to write profile stacks to {args.profile_output}: {refusal}')
+    # Refreshing validates without the old baseline, and every file unless some are named
+    baseline = None if args.no_baseline or args.update_baseline else args.baseline
+    if args.update_baseline and not args.paths:
+        args.changes = 'all'
+    large_file_threshold = LARGE_FILE_THRESHOLD if args.large_file_threshold is None else args.large_file_threshold
+    
+    if args.watch:
+        run_daemon(os.getcwd(), args.debounce, args.poll, large_file_threshold)
+        return
+        
+    # The daemon's validator and caches are built once, so options that change them are honoured in-process
+    in_process = [option for option, given in [('--no-cache', args.no_cache), ('--stats', args.stats),
+                                               ('--profile', args.profile),
+                                               ('--include-generated', args.include_generated),
+                                               ('--large-file-threshold', args.large_file_threshold is not None),
+                                               ('--update-baseline', args.update_baseline)] if given]
+    if args.client and in_process and not args.json:
+        print(f"INFO: {', '.join(in_process)} cannot be served by the validation daemon, validating in-process...")
+    if args.client and not in_process:
+        response = request_daemon(os.getcwd(), {
+            'paths': args.paths, 'changes': args.changes, 'jsonl': args.jsonl, 'sarif': args.sarif,
+            'violations': args.json, 'diff': args.diff_base if args.diff else None, 'baseline': baseline
+        })
+        if response is not None and 'error' not in response:
+            response.pop('has_errors', None)
+            elapsed_ms = response.pop('elapsed_ms', None)
+            result = ValidationResult(**{**response, 'violations': [ValidationViolation(**v) for v in response['violations']]})
+            if args.json:
+                print(json.dumps(result.to_dict(), indent=2))
+                exit(1 if result.has_errors else 0)
+            print(f"Validated {result.files_checked} files via the validation daemon in {elapsed_ms} ms")
+            print(f"Report saved to: {result.report_path}")
+            if result.report_path is None:
+                return
+            print_summary(result, show_cache=False)
+        if not args.json:
+            if response is not None:
+                print(f"Warning: The validation daemon answered with an error ({response['error']}), "
+                      f"validating in-process...")
+            else:
+                print("INFO: No validation daemon is running, validating in-process...")
+    
+    profiler = None
+    if args.profile:
+        import cProfile
+        
+        if args.jobs > 1 and not args.json:
+            print("INFO: --profile only sees this process, validating with --jobs 1")
+        args.jobs = 1
+        profiler = cProfile.Profile()
+        profiler.enable()
+        
+    result = run_validation(changes=args.changes, use_cache=not args.no_cache, jobs=args.jobs,
+                            jsonl=args.jsonl, sarif=args.sarif, collect_violations=args.json, quiet=args.json,
+                            files=args.paths, profile=args.stats or bool(args.profile), top=args.top,
+                            diff=args.diff_base if args.diff else None,
+                            large_file_threshold=large_file_threshold, include_generated=args.include_generated,
+                            baseline=baseline)
+
+    if profiler is not None:
+        from profile_stacks import write_collapsed_stacks
+        
+        profiler.disable()
+        stack_count = write_collapsed_stacks(profiler, Path(args.profile_output))
+        if not args.json:
+            print(f"Collapsed stacks ({stack_count}) written to: {args.profile_output}")
+    
+    if args.update_baseline:
+        # The run saw every violation, so the baseline now holds them all and nothing fails
+        if result.violations_file is not None:
+            count = update_baseline(os.getcwd(), args.baseline, result,
+                                    normalize_paths(os.getcwd(), args.paths) if args.paths else None)
+            if not args.json:
+                print(f"\nBaseline updated: {count} known violations recorded in {args.baseline}")
+        if args.json:
+            print(json.dumps(result.to_dict(), indent=2))
+        exit(0)
+        
+    if args.json:
+        print(json.dumps(result.to_dict(), indent=2))
+        exit(1 if result.has_errors else 0)
+        
+    if result.report_path is None:
+        return
+    print_summary(result, show_cache=not args.no_cache)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+One-pass C# lexer for the code validation hook.
+Splits a source file into comment, string and code spans in a single left to
+right scan, so rules can search only the spans they care about: TODO markers
+in comments, `throw new NotImplementedException` and declarations in code,
+secrets in literals.
+
+Masked views keep every offset and line break of the original text and blank
+out the spans a rule should not see, so regex matches against a view report
+the same line numbers as matches against the file.
+
+Handles //, /// and /* */ comments, regular, verbatim (@"...") and raw
+(triple-quoted) strings with any $ prefix, and character literals.
+Interpolation holes are treated as part of their string.
+"""
+
+import re
+from bisect import bisect_right
+from typing import List, Optional, Tuple
+
+import lazy_regex
+
+COMMENT = 'comment'
+STRING = 'string'
+CODE = 'code'
+
+# Span kinds each rule scope keeps visible; 'text' is the unmasked file
+SCOPES = {
+    'code': frozenset({CODE}),
+    'comments': frozenset({COMMENT}),
+    'strings': frozenset({STRING}),
+    'literals': frozenset({COMMENT, STRING}),
+}
+
+# Every alternative starts with a literal character, so the regex engine skips plain code in C
+TOKEN = lazy_regex.compile(r'''
+    /(?: /[^\n]* | \*[\s\S]*?(?:\*/|\Z) )                                # // and /* */ comments
+  | '(?:[^'\\\n]|\\.)*'                                                # character literals
+  | @\$*"(?:[^"]|"")*(?:"|\Z)                                           # verbatim strings
+  | \$\$*(?: @\$*"(?:[^"]|"")*(?:"|\Z)                                  # interpolated verbatim,
+             | ("{3,})[\s\S]*?(?:\1|\Z)                                  # raw,
+             | "(?:[^"\\\n]|\\.)*(?:"|$) )                                #   and regular strings
+  | "(?: ("{2,})[\s\S]*?(?:"\2|\Z) | (?:[^"\\\n]|\\.)*(?:"|$) )          # raw and regular strings
+''', re.VERBOSE | re.MULTILINE)
+
+Span = Tuple[int, int, str]
+
+def lex(text: str) -> List[Span]:
+    """(start, end, kind) of every comment and string literal, in order; the gaps are code"""
+    return [(start, end, COMMENT if text[start] == '/' else STRING)
+            for start, end in map(re.Match.span, TOKEN.finditer(text))]
+
+def blank(text: str) -> str:
+    """Spaces in place of everything but line breaks"""
+    if '\n' not in text:
+        return ' ' * len(text)
+    return '\n'.join(' ' * len(line) for line in text.split('\n'))
+
+def mask(text: str, spans: List[Span], keep: frozenset, regions: Optional[List[Tuple[int, int]]] = None,
+         blanked: Optional[str] = None) -> str:
+    """The text with every span kind outside keep blanked, offsets unchanged; outside the sorted
+    (start, end) regions, when given, everything is blanked"""
+    # Slices of one blanked copy, rather than blanking every gap and token separately
+    if blanked is None:
+        blanked = blank(text)
+    code = text if CODE in keep else blanked
+    if regions is None:
+        regions = [(0, len(text))]
+    ends = [end for _, end, _ in spans]
+    pieces = []
+    position = 0
+    for region_start, region_end in regions:
+        pieces.append(blanked[position:region_start])
+        position = region_start
+        for start, end, kind in spans[bisect_right(ends, region_start):]:
+            if start >= region_end:
+                break
+            if start > position:
+                pieces.append(code[position:start])
+                position = start
+            end = min(end, region_end)
+            pieces.append((text if kind in keep else blanked)[position:end])
+            position = end
+        if position < region_end:
+            pieces.append(code[position:region_end])
+            position = region_end
+    pieces.append(blanked[position:])
+    return ''.join(pieces)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Changed line ranges for diff-scoped validation.
+Compares a file against a baseline and returns the line ranges that differ,
+so the validation hook can scan only those hunks and report only violations
+on lines the author actually touched.
+
+Baselines:
+  head      the file's blob in the HEAD commit (everything not yet committed)
+  index     the file's blob in .git/index (everything not yet staged)
+  snapshot  the content saved by the previous diff-scoped run, for trees
+            without a git repository
+
+Blobs are read in-process through git_changes. A file with no baseline (new,
+untracked, or not yet snapshotted) is changed from its first line to its last.
+"""
+
+import hashlib
+import os
+import zlib
+from bisect import bisect_right
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from git_changes import ObjectStore, find_git_dir, head_tree_sha, read_index, resolve_head, tree_entry
+
+BASELINES = ('head', 'index', 'snapshot')
+SNAPSHOT_DIR = Path('.validation-cache') / 'snapshots'
+
+class LineRanges:
+    """Sorted, merged 1-based inclusive line ranges"""
+
+    def __init__(self, ranges: List[Tuple[int, int]]):
+        merged: List[Tuple[int, int]] = []
+        for start, end in sorted(ranges):
+            if merged and start <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        self.ranges = merged
+        self._starts = [start for start, _ in merged]
+
+    def __bool__(self) -> bool:
+        return bool(self.ranges)
+
+    def __iter__(self):
+        return iter(self.ranges)
+
+    def __len__(self) -> int:
+        return sum(end - start + 1 for start, end in self.ranges)
+
+    def contains(self, line_number: int) -> bool:
+        """Whether a 1-based line lies in any range"""
+        index = bisect_right(self._starts, line_number) - 1
+        return index >= 0 and line_number <= self.ranges[index][1]
+
+    def expanded(self, context: int, line_count: int) -> 'LineRanges':
+        """The ranges widened by context lines on each side, clipped to the file"""
+        return LineRanges([(max(1, start - context), min(line_count, end + context)) for start, end in self.ranges])
+
+def changed_lines(baseline: str, current: str) -> LineRanges:
+    """Lines of current that differ from baseline; a deletion marks the line that now follows it"""
+    old = baseline.split('\n')
+    new = current.split('\n')
+    # Edits are usually small, so match the common head and tail before diffing what is left
+    prefix = 0
+    limit = min(len(old), len(new))
+    while prefix < limit and old[prefix] == new[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old[-1 - suffix] == new[-1 - suffix]:
+        suffix += 1
+
+    ranges = []
+    matcher = SequenceMatcher(None, old[prefix:len(old) - suffix], new[prefix:len(new) - suffix])
+    for tag, _, _, first, last in matcher.get_opcodes():
+        if tag == 'equal':
+            continue
+        first += prefix
+        last += prefix
+        if first == last:
+            line_number = min(first + 1, len(new))
+            ranges.append((line_number, line_number))
+        else:
+            ranges.append((first + 1, last))
+    return LineRanges(ranges)
+
+class DiffScope:
+    """Baseline lookups for one project root; git objects are read lazily and the index once"""
+
+    def __init__(self, project_root: Path, baseline: str = 'head'):
+        self.project_root = Path(project_root)
+        self.git_dir = find_git_dir(self.project_root) if baseline != 'snapshot' else None
+        if baseline != 'snapshot' and self.git_dir is None:
+            print(f"Warning: No git repository at {self.project_root}, diffing against saved snapshots")
+            baseline = 'snapshot'
+        self.baseline = baseline
+        self._store: Optional[ObjectStore] = None
+        self._tree: Optional[bytes] = None
+        self._index: Optional[Dict[str, bytes]] = None
+
+    def baseline_text(self, file_path: str) -> Optional[str]:
+        """The file's baseline content, or None when it has none"""
+        if self.baseline == 'snapshot':
+            try:
+                return zlib.decompress(self._snapshot_path(file_path).read_bytes()).decode('utf-8')
+            except (OSError, zlib.error, UnicodeDecodeError):
+                return None
+        try:
+            sha = self._blob_sha(file_path.replace(os.sep, '/'))
+            if sha is None:
+                return None
+            kind, data = self._store.read(sha)
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Warning: Could not read the {self.baseline} version of {file_path}: {e}")
+            return None
+        return data.decode('utf-8', errors='ignore') if kind == 'blob' else None
+
+    def changed(self, file_path: str, content: str) -> LineRanges:
+        """Lines of a file's current content that differ from its baseline"""
+        baseline = self.baseline_text(file_path)
+        if baseline is None:
+            return LineRanges([(1, content.count('\n') + 1)])
+        return changed_lines(baseline, content)
+
+    def record(self, file_path: str, content: str):
+        """Save the validated content as the next run's baseline; only snapshot baselines keep one"""
+        if self.baseline != 'snapshot':
+            return
+        path = self._snapshot_path(file_path)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(zlib.compress(content.encode('utf-8'), 1))
+        except OSError as e:
+            print(f"Warning: Could not save a snapshot of {file_path}: {e}")
+
+    def _snapshot_path(self, file_path: str) -> Path:
+        name = hashlib.sha1(file_path.replace(os.sep, '/').encode('utf-8')).hexdigest()
+        return self.project_root / SNAPSHOT_DIR / name[:2] / name[2:]
+
+    def _blob_sha(self, path: str) -> Optional[bytes]:
+        if self._store is None:
+            self._store = ObjectStore(self.git_dir)
+        if self.baseline == 'index':
+            if self._index is None:
+                self._index = {entry.path: entry.sha for entry in read_index(self.git_dir).entries
+                               if entry.stage == 0 and not entry.intent_to_add}
+            return self._index.get(path)
+        if self._tree is None:
+            head = resolve_head(self.git_dir)
+            if head is None:
+                return None
+            self._tree = head_tree_sha(self._store, head)
+        return tree_entry(self._store, self._tree, path)
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+File change watching for the code validation daemon.
+Uses Linux inotify through ctypes when it is available and falls back to
+re-walking the tree on an interval everywhere else (macOS, Windows, or when
+the inotify watch limit is exhausted).
+
+Both watchers report changed files as paths relative to the watched root.
+A read() result of None means events were lost and the caller should rescan.
+"""
+
+import os
+import sys
+import time
+import ctypes
+import ctypes.util
+import struct
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+# inotify event bits, from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct('iIII')
+
+# Snapshot of the tree: relative path -> (mtime, size)
+Snapshot = Dict[str, Tuple[float, int]]
+
+class InotifyWatcher:
+    """Recursive inotify watch over every directory the prune callback keeps"""
+
+    def __init__(self, root: str, prune: Callable[[str, str], bool], interesting: Callable[[str], bool]):
+        self.root = root
+        self.prune = prune
+        self.interesting = interesting
+        self.paths: Dict[int, str] = {}  # watch descriptor -> relative directory
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self._add_tree('')
+
+    def fileno(self) -> int:
+        return self.fd
+
+    def _add_tree(self, relative_dir: str) -> List[str]:
+        """Watch a directory and its kept subdirectories, returning the interesting files inside"""
+        found = []
+        pending = [relative_dir]
+        while pending:
+            current = pending.pop()
+            directory = os.path.join(self.root, current) if current else self.root
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                if current == relative_dir or errno == 28:  # ENOSPC: watch limit reached
+                    raise OSError(errno, f'inotify_add_watch failed for {directory}')
+                continue
+            self.paths[wd] = current
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                child = os.path.join(current, entry.name) if current else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if not self.prune(current, entry.name):
+                        pending.append(child)
+                elif self.interesting(entry.name):
+                    found.append(child)
+        return found
+
+    def read(self) -> Optional[Set[str]]:
+        """Drain pending events into a set of changed files; None if the kernel queue overflowed"""
+        changed: Set[str] = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            position = 0
+            while position < len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, position)
+                position += EVENT_HEADER.size
+                name = data[position:position + length].rstrip(b'\0').decode('utf-8', 'surrogateescape')
+                position += length
+
+                if mask & IN_Q_OVERFLOW:
+                    return None
+                parent = self.paths.get(wd)
+                if parent is None:
+                    continue
+                if mask & IN_IGNORED:
+                    del self.paths[wd]
+                    continue
+                relative_path = os.path.join(parent, name) if parent else name
+                if mask & IN_ISDIR:
+                    # A directory created or moved in may already hold files
+                    if mask & (IN_CREATE | IN_MOVED_TO) and not self.prune(parent, name):
+                        try:
+                            changed.update(self._add_tree(relative_path))
+                        except OSError:
+                            return None
+                    elif mask & (IN_DELETE | IN_MOVED_FROM):
+                        return None
+                elif name and self.interesting(name):
+                    changed.add(relative_path)
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+class PollingWatcher:
+    """Re-snapshots the tree on an interval and reports files whose (mtime, size) changed"""
+
+    def __init__(self, snapshot: Callable[[], Snapshot], interval: float = 1.0):
+        self.snapshot = snapshot
+        self.interval = interval
+        self.last = snapshot()
+        self.next_poll = time.monotonic() + interval
+
+    def fileno(self) -> Optional[int]:
+        return None
+
+    def timeout(self) -> float:
+        """Seconds until the next poll is due"""
+        return max(0.0, self.next_poll - time.monotonic())
+
+    def read(self) -> Optional[Set[str]]:
+        """Changed, added and deleted files since the previous poll, if a poll is due"""
+        if time.monotonic() < self.next_poll:
+            return set()
+        current = self.snapshot()
+        self.next_poll = time.monotonic() + self.interval
+        changed = {path for path, stamp in current.items() if self.last.get(path) != stamp}
+        changed.update(path for path in self.last if path not in current)
+        self.last = current
+        return changed
+
+    def close(self):
+        pass
+
+def create_watcher(root: str, prune: Callable[[str, str], bool], interesting: Callable[[str], bool],
+                   snapshot: Callable[[], Snapshot], force_polling: bool = False, interval: float = 1.0):
+    """inotify on Linux, otherwise (or if it cannot be set up) the polling watcher"""
+    if not force_polling and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(root, prune, interesting)
+        except (OSError, AttributeError) as e:
+            print(f"Warning: inotify unavailable ({e}), falling back to polling every {interval}s")
+    return PollingWatcher(snapshot, interval)
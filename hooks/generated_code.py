@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Generated-code classifier for the code validation hook.
+EF Core migrations and model snapshots, designer files and source generator
+output are written by tools, so documentation and structure rules only add
+noise and scan time there. A file is generated when its name follows a
+generator convention, or when the first few KB hold an <auto-generated>
+header, a [GeneratedCode] or [Migration] attribute, or a class deriving
+from Migration. Nothing past the header is read.
+
+Classifications are cached per (size, mtime) fingerprint in
+.validation-cache/generated.json, so unchanged files are never re-read.
+"""
+
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import lazy_regex
+
+HEADER_BYTES = 4096
+# Lowercase file names generators write: designers, source generators, EF model snapshots, assembly info
+GENERATED_NAMES = ('*.designer.cs', '*.g.cs', '*.g.i.cs', '*.generated.cs', '*.generated.ts', '*modelsnapshot.cs',
+                   '*.assemblyinfo.cs', '*.assemblyattributes.cs')
+GENERATED_HEADER = lazy_regex.compile(r'''
+    (?P<auto_generated> ^[ \t]*(?://+|/?\*+)[ \t]*<auto-generated\b )              # // <auto-generated />
+  | (?P<generated_code_attribute> \[(?:global::)?(?:System\.CodeDom\.Compiler\.)?GeneratedCode(?:Attribute)?\( )
+  | (?P<migration_attribute> ^[ \t]*\[(?:global::)?(?:Microsoft\.EntityFrameworkCore\.Migrations\.)?Migration\( )
+  | (?P<migration_class> ^[ \t]*(?:public\s+)?(?:partial\s+)?class\s+\w+\s*:\s*Migration\b )
+''', re.MULTILINE | re.VERBOSE)
+# Every header alternative contains one of these, so most hand-written headers are never searched
+GENERATED_TRIGGERS = ('auto-generated', 'GeneratedCode', 'Migration')
+
+def classify_name(file_path: str) -> Optional[str]:
+    """'file name' when a path's name follows a code generator's convention"""
+    name = os.path.basename(file_path).lower()
+    return 'file name' if any(fnmatchcase(name, pattern) for pattern in GENERATED_NAMES) else None
+
+def classify_header(header: str) -> Optional[str]:
+    """Why a file's first few KB mark it as generated, or None for hand-written code"""
+    if not any(trigger in header for trigger in GENERATED_TRIGGERS):
+        return None
+    match = GENERATED_HEADER.search(header)
+    return match.lastgroup.replace('_', ' ') if match else None
+
+class GeneratedCodeClassifier:
+    """Generated-code verdicts for one project root, keyed by path and cached by (size, mtime_ns)"""
+
+    CACHE_FILE = 'generated.json'
+
+    def __init__(self, project_root: Path, version: str, cache_dir: str, persist: bool = True):
+        self.project_root = Path(project_root)
+        self.path = self.project_root / cache_dir / self.CACHE_FILE
+        self.version = version
+        self.persist = persist
+        self.entries: Dict[str, list] = {}
+        self.dirty = False
+
+    def load(self):
+        """Load cached verdicts, discarding them if they were written by a different classifier"""
+        if not self.persist:
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == self.version:
+                self.entries = data.get('files', {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not load {self.CACHE_FILE}: {e}")
+
+    def save(self):
+        """Write the verdicts atomically if anything changed"""
+        if not self.persist or not self.dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_suffix('.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': self.version, 'files': self.entries}, f, separators=(',', ':'))
+            os.replace(temp_path, self.path)
+            self.dirty = False
+        except OSError as e:
+            print(f"Warning: Could not save {self.CACHE_FILE}: {e}")
+
+    def classify(self, file_path: str) -> Tuple[Optional[str], int, int]:
+        """(reason or None, file size, header bytes read) for a file; the header is only read on a cache miss"""
+        path = self.project_root / file_path
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None, 0, 0
+        entry = self.entries.get(file_path)
+        if entry is not None and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+            return entry[2], stat.st_size, 0
+
+        reason = classify_name(file_path)
+        header_bytes = 0
+        if reason is None:
+            try:
+                with open(path, 'rb') as f:
+                    header = f.read(HEADER_BYTES)
+            except OSError:
+                return None, stat.st_size, 0
+            header_bytes = len(header)
+            reason = classify_header(header.decode('utf-8-sig', errors='ignore'))
+        self.entries[file_path] = [stat.st_size, stat.st_mtime_ns, reason]
+        self.dirty = True
+        return reason, stat.st_size, header_bytes
+
+@dataclass
+class GeneratedCodeStats:
+    """What classifying generated code cost and saved in one run"""
+    files: int = 0
+    bytes: int = 0
+    reasons: Dict[str, int] = field(default_factory=dict)
+    header_bytes: int = 0
+    classify_seconds: float = 0.0
+    skipped_runs: int = 0
+    skipped_bytes: Dict[str, int] = field(default_factory=dict)  # per rule, bytes it did not scan
+    # Per rule seconds and bytes of the runs that did happen, to price the skipped ones
+    scan_seconds: Dict[str, float] = field(default_factory=dict)
+    scan_bytes: Dict[str, int] = field(default_factory=dict)
+
+    def record_file(self, reason: str, size: int):
+        self.files += 1
+        self.bytes += size
+        self.reasons[reason] = self.reasons.get(reason, 0) + 1
+
+    def record_skip(self, rule_id: str, size: int):
+        self.skipped_runs += 1
+        self.skipped_bytes[rule_id] = self.skipped_bytes.get(rule_id, 0) + size
+
+    def record_scan(self, rule_id: str, seconds: float, size: int):
+        self.scan_seconds[rule_id] = self.scan_seconds.get(rule_id, 0.0) + seconds
+        self.scan_bytes[rule_id] = self.scan_bytes.get(rule_id, 0) + size
+
+    def add(self, other: 'GeneratedCodeStats'):
+        """Fold in the statistics of a worker process"""
+        self.files += other.files
+        self.bytes += other.bytes
+        self.header_bytes += other.header_bytes
+        self.classify_seconds += other.classify_seconds
+        self.skipped_runs += other.skipped_runs
+        for mine, theirs in [(self.reasons, other.reasons), (self.skipped_bytes, other.skipped_bytes),
+                             (self.scan_seconds, other.scan_seconds), (self.scan_bytes, other.scan_bytes)]:
+            for key, value in theirs.items():
+                mine[key] = mine.get(key, 0) + value
+
+    @property
+    def saved_seconds(self) -> float:
+        """Estimated rule time skipped: each rule's skipped bytes at the rate it scanned hand-written files"""
+        return sum(size * self.scan_seconds[rule_id] / self.scan_bytes[rule_id]
+                   for rule_id, size in self.skipped_bytes.items() if self.scan_bytes.get(rule_id))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'files': self.files,
+            'bytes': self.bytes,
+            'reasons': dict(self.reasons),
+            'skipped_rule_runs': self.skipped_runs,
+            'skipped_bytes': sum(self.skipped_bytes.values()),
+            'saved_ms': round(self.saved_seconds * 1000, 2),
+            'header_bytes': self.header_bytes,
+            'classify_ms': round(self.classify_seconds * 1000, 2),
+        }
+
+    def report_lines(self, timings: bool = False) -> Iterator[str]:
+        """Markdown section: generated files found and, with timings, what skipping their rules saved and what
+        finding them cost. Those vary with wall-clock time and with what the cache already held, so a report
+        without timings depends on the tree alone"""
+        reasons = ', '.join(f'{count} by {reason}' for reason, count in sorted(self.reasons.items()))
+        yield "## Generated Code"
+        yield f"- **Files**: {self.files} ({self.bytes / 1e6:.2f} MB), {reasons}"
+        if timings:
+            yield (f"- **Saved**: {self.skipped_runs} rule runs skipped, "
+                   f"{sum(self.skipped_bytes.values()) / 1e6:.2f} MB not scanned, about {self.saved_seconds * 1000:.0f} ms")
+            yield (f"- **Classifier cost**: {self.header_bytes / 1e3:.1f} KB of headers read in "
+                   f"{self.classify_seconds * 1000:.1f} ms")
+        yield ""
@@ -0,0 +1,544 @@
+#!/usr/bin/env python3
+"""
+In-process Git change detection for the code validation hooks.
+Reads .git/index and the object database directly to find modified, added
+and untracked files the way `git status` does, without spawning git.
+
+Limitations: clean/smudge filters and end-of-line conversion are not applied,
+so a file whose stat data changed and whose content differs from the blob only
+by conversion is reported as modified.
+"""
+
+import os
+import re
+import mmap
+import stat
+import struct
+import zlib
+import hashlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+@dataclass
+class IndexEntry:
+    path: str
+    mtime_s: int
+    mtime_ns: int
+    mode: int
+    size: int
+    sha: bytes
+    stage: int
+    intent_to_add: bool = False
+    skip_worktree: bool = False
+
+@dataclass
+class GitIndex:
+    entries: List[IndexEntry]
+    cache_trees: Dict[str, bytes]  # directory ('' for the root) -> tree sha, for valid cache-tree records
+    mtime_s: int
+    mtime_ns: int
+
+@dataclass
+class WorkingTreeChanges:
+    modified: List[str] = field(default_factory=list)
+    added: List[str] = field(default_factory=list)
+    untracked: List[str] = field(default_factory=list)
+
+    def all(self) -> List[str]:
+        """Every changed path, sorted and without duplicates"""
+        return sorted(set(self.modified) | set(self.added) | set(self.untracked))
+
+def find_git_dir(worktree: Path) -> Optional[Path]:
+    """The repository directory for a worktree, following `gitdir:` files"""
+    dot_git = worktree / '.git'
+    if dot_git.is_dir():
+        return dot_git
+    if dot_git.is_file():
+        content = dot_git.read_text(encoding='utf-8').strip()
+        if content.startswith('gitdir:'):
+            git_dir = Path(content[len('gitdir:'):].strip())
+            return git_dir if git_dir.is_absolute() else (worktree / git_dir).resolve()
+    return None
+
+def _read_offset_varint(data, pos: int) -> Tuple[int, int]:
+    """Offset-style varint used by index v4 path prefixes and OFS_DELTA objects"""
+    byte = data[pos]
+    pos += 1
+    value = byte & 0x7f
+    while byte & 0x80:
+        byte = data[pos]
+        pos += 1
+        value = ((value + 1) << 7) | (byte & 0x7f)
+    return value, pos
+
+def read_index(git_dir: Path) -> GitIndex:
+    """Parse .git/index (versions 2, 3 and 4) and its cache-tree extension"""
+    index_path = git_dir / 'index'
+    data = index_path.read_bytes()
+    index_stat = index_path.stat()
+    signature, version, count = struct.unpack('>4sLL', data[:12])
+    if signature != b'DIRC' or version not in (2, 3, 4):
+        raise ValueError(f'Unsupported git index format: {signature!r} v{version}')
+
+    entries = []
+    pos = 12
+    previous_path = b''
+    for _ in range(count):
+        entry_start = pos
+        (_, _, mtime_s, mtime_ns, _, _, mode, _, _, size) = struct.unpack('>10L', data[pos:pos + 40])
+        sha = data[pos + 40:pos + 60]
+        flags, = struct.unpack('>H', data[pos + 60:pos + 62])
+        pos += 62
+        extended = 0
+        if version >= 3 and flags & 0x4000:
+            extended, = struct.unpack('>H', data[pos:pos + 2])
+            pos += 2
+
+        if version == 4:
+            strip, pos = _read_offset_varint(data, pos)
+            end = data.index(b'\0', pos)
+            path = previous_path[:len(previous_path) - strip] + data[pos:end]
+            pos = end + 1
+        else:
+            end = data.index(b'\0', pos)
+            path = data[pos:end]
+            # Entries are NUL-padded to a multiple of 8 bytes
+            pos = entry_start + ((end - entry_start + 8) // 8) * 8
+        previous_path = path
+
+        entries.append(IndexEntry(
+            path=path.decode('utf-8', errors='surrogateescape'),
+            mtime_s=mtime_s,
+            mtime_ns=mtime_ns,
+            mode=mode,
+            size=size,
+            sha=sha,
+            stage=(flags >> 12) & 0x3,
+            intent_to_add=bool(extended & 0x2000),
+            skip_worktree=bool(extended & 0x4000)
+        ))
+
+    cache_trees: Dict[str, bytes] = {}
+    end_of_extensions = len(data) - 20
+    while pos + 8 <= end_of_extensions:
+        extension, length = struct.unpack('>4sL', data[pos:pos + 8])
+        pos += 8
+        if extension == b'TREE':
+            _read_cache_tree(data, pos, '', cache_trees)
+        pos += length
+
+    return GitIndex(entries, cache_trees, int(index_stat.st_mtime), index_stat.st_mtime_ns % 1_000_000_000)
+
+def _read_cache_tree(data: bytes, pos: int, parent: str, cache_trees: Dict[str, bytes]) -> int:
+    """Pre-order cache-tree records: "<name>\\0<entries> <subtrees>\\n[sha]"; entries is -1 when invalidated"""
+    nul = data.index(b'\0', pos)
+    newline = data.index(b'\n', nul)
+    name = data[pos:nul].decode('utf-8', errors='surrogateescape')
+    path = f'{parent}/{name}' if parent else name
+    entry_count, subtree_count = (int(value) for value in data[nul + 1:newline].split(b' '))
+    pos = newline + 1
+    if entry_count >= 0:
+        cache_trees[path] = data[pos:pos + 20]
+        pos += 20
+    for _ in range(subtree_count):
+        pos = _read_cache_tree(data, pos, path, cache_trees)
+    return pos
+
+def common_dir(git_dir: Path) -> Path:
+    """The directory holding objects, refs and info/ shared by all worktrees; a linked worktree's git dir names it
+    in its commondir file"""
+    commondir = git_dir / 'commondir'
+    if commondir.exists():
+        return (git_dir / commondir.read_text(encoding='utf-8').strip()).resolve()
+    return git_dir
+
+def object_dirs(objects_dir: Path) -> List[Path]:
+    """An object directory followed by the alternates it borrows objects from, recursively, each once"""
+    dirs: List[Path] = []
+    pending = [objects_dir]
+    while pending:
+        directory = pending.pop(0)
+        if directory in dirs:
+            continue
+        dirs.append(directory)
+        alternates = directory / 'info' / 'alternates'
+        if alternates.exists():
+            for line in alternates.read_text(encoding='utf-8').splitlines():
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    pending.append((directory / line).resolve())  # relative paths are relative to directory
+    return dirs
+
+class ObjectStore:
+    """Reads loose and packed objects, resolving OFS_DELTA and REF_DELTA chains"""
+
+    TYPES = {1: 'commit', 2: 'tree', 3: 'blob', 4: 'tag'}
+
+    def __init__(self, git_dir: Path):
+        self.objects_dirs = object_dirs(common_dir(git_dir) / 'objects')
+        self._packs: Optional[List[Tuple[bytes, mmap.mmap]]] = None
+
+    def read(self, sha: bytes) -> Tuple[str, bytes]:
+        """Object type and content for a binary SHA-1"""
+        hex_sha = sha.hex()
+        for objects_dir in self.objects_dirs:
+            loose = objects_dir / hex_sha[:2] / hex_sha[2:]
+            if loose.exists():
+                raw = zlib.decompress(loose.read_bytes())
+                header, _, body = raw.partition(b'\0')
+                return header.split(b' ')[0].decode('ascii'), body
+
+        for index_data, pack in self._load_packs():
+            offset = self._find_in_index(index_data, sha)
+            if offset is not None:
+                return self._read_packed(pack, offset)
+        raise KeyError(f'Object {hex_sha} not found')
+
+    def _load_packs(self) -> List[Tuple[bytes, mmap.mmap]]:
+        if self._packs is None:
+            self._packs = []
+            for objects_dir in self.objects_dirs:
+                pack_dir = objects_dir / 'pack'
+                if not pack_dir.is_dir():
+                    continue
+                for index_path in sorted(pack_dir.glob('pack-*.idx')):
+                    pack_path = index_path.with_suffix('.pack')
+                    if not pack_path.exists():
+                        continue
+                    with open(pack_path, 'rb') as f:
+                        pack = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    self._packs.append((index_path.read_bytes(), pack))
+        return self._packs
+
+    @staticmethod
+    def _find_in_index(index_data: bytes, sha: bytes) -> Optional[int]:
+        """Binary search a version 2 pack index for an object's pack offset"""
+        if index_data[:4] != b'\377tOc' or struct.unpack('>L', index_data[4:8])[0] != 2:
+            raise ValueError('Only version 2 pack indexes are supported')
+        fanout = 8
+        first = sha[0]
+        low = struct.unpack('>L', index_data[fanout + (first - 1) * 4:fanout + first * 4])[0] if first else 0
+        high = struct.unpack('>L', index_data[fanout + first * 4:fanout + (first + 1) * 4])[0]
+        total = struct.unpack('>L', index_data[fanout + 255 * 4:fanout + 256 * 4])[0]
+        names = fanout + 256 * 4
+        while low < high:
+            middle = (low + high) // 2
+            candidate = index_data[names + middle * 20:names + middle * 20 + 20]
+            if candidate < sha:
+                low = middle + 1
+            elif candidate > sha:
+                high = middle
+            else:
+                offsets = names + total * 20 + total * 4
+                offset = struct.unpack('>L', index_data[offsets + middle * 4:offsets + middle * 4 + 4])[0]
+                if offset & 0x80000000:
+                    large = offsets + total * 4 + (offset & 0x7fffffff) * 8
+                    offset = struct.unpack('>Q', index_data[large:large + 8])[0]
+                return offset
+        return None
+
+    @staticmethod
+    def _inflate(pack: mmap.mmap, pos: int) -> bytes:
+        decompressor = zlib.decompressobj()
+        chunks = []
+        while not decompressor.eof:
+            chunk = pack[pos:pos + 65536]
+            if not chunk:
+                break
+            chunks.append(decompressor.decompress(chunk))
+            pos += len(chunk)
+        return b''.join(chunks)
+
+    def _read_packed(self, pack: mmap.mmap, offset: int) -> Tuple[str, bytes]:
+        pos = offset
+        byte = pack[pos]
+        pos += 1
+        object_type = (byte >> 4) & 0x7
+        while byte & 0x80:
+            byte = pack[pos]
+            pos += 1
+
+        if object_type == 6:  # OFS_DELTA
+            distance, pos = _read_offset_varint(pack, pos)
+            base_type, base = self._read_packed(pack, offset - distance)
+            return base_type, _apply_delta(base, self._inflate(pack, pos))
+        if object_type == 7:  # REF_DELTA
+            base_type, base = self.read(pack[pos:pos + 20])
+            return base_type, _apply_delta(base, self._inflate(pack, pos + 20))
+        return self.TYPES[object_type], self._inflate(pack, pos)
+
+def _apply_delta(base: bytes, delta: bytes) -> bytes:
+    """Apply a git delta instruction stream to its base object"""
+    def read_size(pos: int) -> Tuple[int, int]:
+        value = shift = 0
+        while True:
+            byte = delta[pos]
+            pos += 1
+            value |= (byte & 0x7f) << shift
+            shift += 7
+            if not byte & 0x80:
+                return value, pos
+
+    _, pos = read_size(0)
+    _, pos = read_size(pos)
+    result = bytearray()
+    while pos < len(delta):
+        opcode = delta[pos]
+        pos += 1
+        if opcode & 0x80:
+            copy_offset = copy_size = 0
+            for bit in range(4):
+                if opcode & (1 << bit):
+                    copy_offset |= delta[pos] << (8 * bit)
+                    pos += 1
+            for bit in range(3):
+                if opcode & (0x10 << bit):
+                    copy_size |= delta[pos] << (8 * bit)
+                    pos += 1
+            result += base[copy_offset:copy_offset + (copy_size or 0x10000)]
+        else:
+            result += delta[pos:pos + opcode]
+            pos += opcode
+    return bytes(result)
+
+def resolve_head(git_dir: Path) -> Optional[bytes]:
+    """Binary SHA-1 of the commit HEAD points at, or None on an unborn branch"""
+    head = (git_dir / 'HEAD').read_text(encoding='utf-8').strip()
+    if not head.startswith('ref:'):
+        return bytes.fromhex(head)
+    ref = head[4:].strip()
+    # Linked worktrees keep refs in the common directory
+    shared_dir = common_dir(git_dir)
+    for base in (git_dir, shared_dir):
+        ref_path = base / ref
+        if not ref_path.is_file():
+            continue
+        return bytes.fromhex(ref_path.read_text(encoding='utf-8').strip())
+    packed_refs = shared_dir / 'packed-refs'
+    if packed_refs.exists():
+        for line in packed_refs.read_text(encoding='utf-8').splitlines():
+            if line.endswith(' ' + ref) and not line.startswith(('#', '^')):
+                return bytes.fromhex(line.split(' ')[0])
+    return None
+
+def read_tree(store: ObjectStore, tree_sha: bytes, prefix: str = '',
+              cache_trees: Optional[Dict[str, bytes]] = None, unchanged: Optional[set] = None) -> Dict[str, bytes]:
+    """Flatten a tree object into {path: blob sha}, skipping submodules and, when cache-tree
+    records are given, directories whose index tree matches (recorded in unchanged)"""
+    files = {}
+    if cache_trees is not None and cache_trees.get(prefix.rstrip('/')) == tree_sha:
+        unchanged.add(prefix.rstrip('/'))
+        return files
+    _, data = store.read(tree_sha)
+    pos = 0
+    while pos < len(data):
+        space = data.index(b' ', pos)
+        nul = data.index(b'\0', space)
+        mode = int(data[pos:space], 8)
+        name = data[space + 1:nul].decode('utf-8', errors='surrogateescape')
+        sha = data[nul + 1:nul + 21]
+        pos = nul + 21
+        path = prefix + name
+        if stat.S_ISDIR(mode):
+            files.update(read_tree(store, sha, path + '/', cache_trees, unchanged))
+        elif mode != 0o160000:
+            files[path] = sha
+    return files
+
+def tree_entry(store: ObjectStore, tree_sha: bytes, path: str) -> Optional[bytes]:
+    """Sha of the object at a slash-separated path under a tree, reading only the trees on the way"""
+    sha = tree_sha
+    for name in path.split('/'):
+        _, data = store.read(sha)
+        wanted = name.encode('utf-8', errors='surrogateescape')
+        pos = 0
+        while pos < len(data):
+            space = data.index(b' ', pos)
+            nul = data.index(b'\0', space)
+            if data[space + 1:nul] == wanted:
+                sha = data[nul + 1:nul + 21]
+                break
+            pos = nul + 21
+        else:
+            return None
+    return sha
+
+def head_tree_sha(store: ObjectStore, commit_sha: bytes) -> bytes:
+    """Root tree of a commit"""
+    _, data = store.read(commit_sha)
+    return bytes.fromhex(data.split(b'\n', 1)[0].split(b' ')[1].decode('ascii'))
+
+def blob_sha(path: Path) -> bytes:
+    """The SHA-1 git would assign to a file's content"""
+    data = path.read_bytes()
+    return hashlib.sha1(b'blob %d\0' % len(data) + data).digest()
+
+class IgnoreRules:
+    """A subset of gitignore matching: globs, **, anchoring, directory-only and negated patterns"""
+
+    def __init__(self):
+        self.rules: List[Tuple[str, re.Pattern, bool, bool]] = []  # (base, regex, negated, directory_only)
+
+    def add_file(self, path: Path, base: str = ''):
+        """Add the patterns of one ignore file, relative to base ('' for the worktree root)"""
+        try:
+            lines = path.read_text(encoding='utf-8', errors='ignore').splitlines()
+        except OSError:
+            return
+        for line in lines:
+            line = line.rstrip()
+            if not line or line.startswith('#'):
+                continue
+            negated = line.startswith('!')
+            if negated:
+                line = line[1:]
+            directory_only = line.endswith('/')
+            line = line.rstrip('/')
+            anchored = '/' in line
+            line = line.lstrip('/')
+            regex = self._translate(line)
+            if not anchored:
+                regex = '(?:.*/)?' + regex
+            self.rules.append((base, re.compile(regex + r'\Z'), negated, directory_only))
+
+    @staticmethod
+    def _translate(pattern: str) -> str:
+        result = []
+        i = 0
+        while i < len(pattern):
+            char = pattern[i]
+            if pattern.startswith('**/', i):
+                result.append('(?:.*/)?')
+                i += 3
+            elif pattern.startswith('**', i):
+                result.append('.*')
+                i += 2
+            elif char == '*':
+                result.append('[^/]*')
+                i += 1
+            elif char == '?':
+                result.append('[^/]')
+                i += 1
+            elif char == '[':
+                end = pattern.find(']', i + 1)
+                if end == -1:
+                    result.append(re.escape(char))
+                    i += 1
+                else:
+                    body = pattern[i + 1:end]
+                    if body.startswith('!'):
+                        body = '^' + body[1:]
+                    result.append('[' + body.replace('\\', '\\\\') + ']')
+                    i = end + 1
+            else:
+                result.append(re.escape(char))
+                i += 1
+        return ''.join(result)
+
+    def ignored(self, path: str, is_dir: bool) -> bool:
+        """Whether a worktree-relative path is ignored; the last matching rule wins"""
+        result = False
+        for base, regex, negated, directory_only in self.rules:
+            if directory_only and not is_dir:
+                continue
+            if base:
+                if not path.startswith(base + '/'):
+                    continue
+                relative = path[len(base) + 1:]
+            else:
+                relative = path
+            if regex.match(relative):
+                result = not negated
+        return result
+
+def _walk_untracked(worktree: Path, tracked: set, extensions: Tuple[str, ...],
+                    excluded_dirs: set, ignore: IgnoreRules) -> Iterator[str]:
+    """Untracked, non-ignored files with the given extensions, pruning excluded and ignored directories"""
+    pending = ['']
+    while pending:
+        relative_dir = pending.pop()
+        directory = worktree / relative_dir if relative_dir else worktree
+        nested_ignore = directory / '.gitignore'
+        if relative_dir and nested_ignore.exists():
+            ignore.add_file(nested_ignore, relative_dir)
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            relative_path = f'{relative_dir}/{entry.name}' if relative_dir else entry.name
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name == '.git' or entry.name in excluded_dirs:
+                    continue
+                if not ignore.ignored(relative_path, True):
+                    pending.append(relative_path)
+            elif entry.name.endswith(extensions) and relative_path not in tracked:
+                if not ignore.ignored(relative_path, False):
+                    yield relative_path
+
+def detect_changes(worktree: Path, extensions: Tuple[str, ...], excluded_dirs=()) -> WorkingTreeChanges:
+    """Modified, added and untracked files with the given extensions, compared like `git status`"""
+    worktree = Path(worktree)
+    git_dir = find_git_dir(worktree)
+    if git_dir is None:
+        raise FileNotFoundError(f'No git repository at {worktree}')
+
+    index = read_index(git_dir)
+    changes = WorkingTreeChanges()
+    tracked = set()
+    present = set()
+    root = os.fspath(worktree)
+
+    # Working tree against the index: trust matching stat data, hash only when it differs
+    # or when the entry is racily clean (written in the same instant as the index)
+    for entry in index.entries:
+        tracked.add(entry.path)
+        if entry.skip_worktree or not entry.path.endswith(extensions):
+            continue
+        full_path = os.path.join(root, entry.path)
+        try:
+            file_stat = os.lstat(full_path)
+        except OSError:
+            continue  # deleted files have nothing left to validate
+        present.add(entry.path)
+        if entry.stage != 0:
+            changes.modified.append(entry.path)
+            continue
+        if entry.intent_to_add:
+            changes.added.append(entry.path)
+            continue
+        same_mtime = int(file_stat.st_mtime) == entry.mtime_s and file_stat.st_mtime_ns % 1_000_000_000 == entry.mtime_ns
+        racy = (entry.mtime_s, entry.mtime_ns) >= (index.mtime_s, index.mtime_ns)
+        if file_stat.st_size != entry.size:
+            changes.modified.append(entry.path)
+        elif (not same_mtime or racy) and blob_sha(Path(full_path)) != entry.sha:
+            changes.modified.append(entry.path)
+
+    # Index against HEAD, skipping every directory whose cache-tree matches the HEAD tree
+    store = ObjectStore(git_dir)
+    head = resolve_head(git_dir)
+    unchanged: set = set()
+    head_files = read_tree(store, head_tree_sha(store, head), '', index.cache_trees, unchanged) if head else {}
+    if '' not in unchanged:
+        modified = set(changes.modified)
+        for entry in index.entries:
+            if entry.stage != 0 or entry.intent_to_add or entry.path not in present:
+                continue
+            parts = entry.path.split('/')[:-1]
+            if any('/'.join(parts[:depth]) in unchanged for depth in range(1, len(parts) + 1)):
+                continue
+            head_sha = head_files.get(entry.path)
+            if head_sha is None:
+                changes.added.append(entry.path)
+            elif head_sha != entry.sha and entry.path not in modified:
+                changes.modified.append(entry.path)
+
+    ignore = IgnoreRules()
+    ignore.add_file(worktree / '.gitignore')
+    ignore.add_file(common_dir(git_dir) / 'info' / 'exclude')
+    changes.untracked.extend(_walk_untracked(worktree, tracked, extensions, set(excluded_dirs), ignore))
+
+    for paths in (changes.modified, changes.added, changes.untracked):
+        paths.sort()
+    return changes
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Lazily compiled regular expressions for fast hook startup.
+The hook modules declare a few dozen patterns at import time, but a per-save
+run only searches with the rules that apply to the files it validates. A
+LazyPattern compiles with re.compile the first time it is used, so patterns
+a run never touches cost nothing. After that first use each attribute of
+the compiled pattern is stored on the holder, and later calls go straight to
+the compiled pattern's methods.
+"""
+
+import re
+from typing import Any, Pattern
+
+class LazyPattern:
+    """A regular expression compiled on first use, standing in for the compiled pattern"""
+
+    def __init__(self, pattern: str, flags: int = 0):
+        self._source = pattern
+        self._flags = flags
+        self._compiled = None
+
+    def compiled(self) -> Pattern:
+        """The compiled pattern, compiling it on first use"""
+        if self._compiled is None:
+            self._compiled = re.compile(self._source, self._flags)
+        return self._compiled
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for attributes not yet on the holder: search, finditer, groups, groupindex, ...
+        if name.startswith('_'):
+            raise AttributeError(name)
+        value = getattr(self.compiled(), name)
+        setattr(self, name, value)
+        return value
+
+    def __getstate__(self):
+        return {'_source': self._source, '_flags': self._flags, '_compiled': None}
+
+    def __repr__(self) -> str:
+        return f'LazyPattern({self._source!r}, {self._flags!r})'
+
+def compile(pattern: str, flags: int = 0) -> LazyPattern:
+    """A pattern that compiles with re.compile the first time it is used"""
+    return LazyPattern(pattern, flags)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Collapsed-stack output for cProfile runs of the code validation hook.
+Writes one "frame;frame;frame count" line per call path, the format read by
+flamegraph.pl, speedscope, inferno and most other flame graph tools.
+
+cProfile only records caller/callee pairs, not whole stacks, so paths are
+rebuilt from the call graph: a function's time is split between its callers
+in proportion to the time each caller spent in it. Recursive calls are folded
+into the first occurrence of the function on a path.
+"""
+
+import os
+import pstats
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+# Paths carrying less than this share of the total time are dropped, bounding the output size
+MIN_SHARE = 0.0001
+MAX_DEPTH = 128
+
+def frame_label(function: Tuple[str, int, str]) -> str:
+    """'name (file.py:line)' for Python code, the bare name for built-ins"""
+    filename, line_number, name = function
+    label = name if filename == '~' else f"{name} ({os.path.basename(filename)}:{line_number})"
+    return label.replace(';', ',')
+
+def collapsed_stacks(stats: Dict[Any, Tuple]) -> Dict[str, float]:
+    """Self time in seconds of every call path reconstructed from pstats data"""
+    callees: Dict[Any, List[Tuple[Any, float]]] = defaultdict(list)
+    roots = []
+    for function, (_, _, _, _, callers) in stats.items():
+        if not callers:
+            roots.append(function)
+        for caller, edge in callers.items():
+            callees[caller].append((function, edge[3]))
+
+    total = sum(stats[root][3] for root in roots) or 1.0
+    stacks: Dict[str, float] = defaultdict(float)
+    pending = [(root, frame_label(root), 1.0, (root,)) for root in roots]
+    while pending:
+        function, path, share, on_path = pending.pop()
+        _, _, self_time, cumulative, _ = stats[function]
+        stacks[path] += self_time * share
+        if len(on_path) >= MAX_DEPTH:
+            continue
+        for callee, edge_time in callees.get(function, ()):
+            callee_time = stats[callee][3]
+            if callee in on_path or callee_time <= 0:
+                continue
+            callee_share = share * min(1.0, edge_time / callee_time)
+            if callee_time * callee_share >= total * MIN_SHARE:
+                pending.append((callee, f"{path};{frame_label(callee)}", callee_share, on_path + (callee,)))
+    return stacks
+
+def write_collapsed_stacks(profiler: Any, output_path: Path) -> int:
+    """Write a profiler's stacks with microsecond counts, returning how many paths were written"""
+    stacks = collapsed_stacks(pstats.Stats(profiler).stats)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    written = 0
+    with open(output_path, 'w', encoding='utf-8') as f:
+        for path, seconds in sorted(stacks.items()):
+            microseconds = int(round(seconds * 1_000_000))
+            if microseconds > 0:
+                f.write(f"{path} {microseconds}\n")
+                written += 1
+    return written
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Single-pass HTML + Razor tokenizer for the inline CSS/JavaScript rule.
+Walks a .cshtml file once, emitting every start tag with its attributes and
+the raw text of every <script> and <style> element. Razor constructs are
+followed rather than read as markup: @* comments *@, @{ code blocks },
+@( expressions ), implicit @Model.Expressions, directives such as @model,
+and @if/@foreach/@using statements. Markup written inside Razor code
+(<p>...</p> after a brace or semicolon, <text>, @: lines) and inside
+@section blocks is tokenized like the rest of the document.
+
+This is a linting tokenizer, not a parser: malformed markup never raises, it
+only ends the current tag or element early.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional, Union
+
+import csharp_lexer
+import lazy_regex
+
+@dataclass
+class Attribute:
+    """An attribute as written; value is None when it has no '='"""
+    name: str
+    offset: int
+    value: Optional[str] = None
+    quoted: bool = False
+
+@dataclass
+class Element:
+    """A start tag, wherever it appears: the document, a section, or markup inside Razor code"""
+    name: str
+    offset: int
+    attributes: List[Attribute] = field(default_factory=list)
+    self_closing: bool = False
+
+    def attribute(self, name: str) -> Optional[Attribute]:
+        """First attribute with a name, compared case-insensitively"""
+        name = name.lower()
+        return next((attribute for attribute in self.attributes if attribute.name.lower() == name), None)
+
+@dataclass
+class RawText:
+    """The body of a <script> or <style> element, never tokenized as markup"""
+    element: Element
+    start: int
+    end: int
+
+Token = Union[Element, RawText]
+
+VOID_ELEMENTS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+RAW_TEXT_END = {name: lazy_regex.compile(rf'</{name}\s*>', re.IGNORECASE) for name in ('script', 'style')}
+# Razor directives that take the rest of their line
+LINE_DIRECTIVES = {'model', 'using', 'inject', 'page', 'inherits', 'addTagHelper', 'removeTagHelper',
+                   'tagHelperPrefix', 'layout', 'namespace', 'attribute', 'implements', 'typeparam'}
+CODE_DIRECTIVES = {'code', 'functions'}
+STATEMENT_KEYWORDS = {'if', 'for', 'foreach', 'while', 'switch', 'try', 'lock', 'do', 'using'}
+CONTINUATION = lazy_regex.compile(r'\s*(?:else\s+if|else|catch|finally)\b')
+# Characters after which '<' inside Razor code starts markup rather than a comparison or generic
+MARKUP_AFTER = set('{};:>')
+
+MARKUP_EVENT = lazy_regex.compile(r'[<@}]')
+CODE_EVENT = lazy_regex.compile(r'[{}()\[\]<@"\'/]')
+TAG_NAME = lazy_regex.compile(r'[A-Za-z][\w:.-]*')
+# An attribute, with its value when it is quoted and free of Razor; anything else goes through attribute_value
+ATTRIBUTE = lazy_regex.compile(r'''([^\s"'<>/=@]+)\s*(?:(=)\s*(?:"([^"@]*)"|'([^'@]*)')?)?''')
+UNQUOTED_VALUE = lazy_regex.compile(r'[^\s>]*')
+IDENTIFIER = lazy_regex.compile(r'[A-Za-z_]\w*')
+SPACE = lazy_regex.compile(r'\s*')
+BRACKETS = {'}': '{', ')': '(', ']': '['}
+
+class _Scanner:
+    """Mutually recursive markup and Razor code scanners over one text"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens: List[Token] = []
+
+    def markup(self, pos: int, mode: str) -> int:
+        """Scan markup: 'document' to the end, 'section' to its closing brace, 'element' to the end of
+        the element starting at pos, 'line' to the end of the line; returns where scanning stopped"""
+        text = self.text
+        end = len(text)
+        if mode == 'line':
+            newline = text.find('\n', pos)
+            end = end if newline == -1 else newline
+        depth = 0
+        while True:
+            match = MARKUP_EVENT.search(text, pos, end)
+            if match is None:
+                return max(pos, end)
+            pos = match.start()
+            char = text[pos]
+            if char == '}':
+                if mode == 'section' and depth <= 0:
+                    return pos + 1
+                pos += 1
+            elif char == '@':
+                pos = self.transition(pos, statements=True)
+            else:
+                pos, opened = self.tag(pos)
+                depth += opened
+                if mode == 'element' and depth <= 0:
+                    return pos
+
+    def tag(self, pos: int):
+        """Consume the tag at pos; returns (next position, +1 for an element left open, -1 for an end tag)"""
+        text = self.text
+        if text.startswith('<!--', pos):
+            close = text.find('-->', pos + 4)
+            return (len(text) if close == -1 else close + 3), 0
+        if text.startswith(('<!', '<?', '</'), pos):
+            close = text.find('>', pos)
+            opened = -1 if text.startswith('</', pos) and TAG_NAME.match(text, pos + 2) else 0
+            return (len(text) if close == -1 else close + 1), opened
+        name = TAG_NAME.match(text, pos + 1)
+        if name is None:
+            return pos + 1, 0
+
+        element = Element(name.group(0), pos)
+        self.tokens.append(element)
+        pos = self.attributes(name.end(), element)
+        lowered = element.name.lower()
+        if element.self_closing or lowered in VOID_ELEMENTS:
+            return pos, 0
+        if lowered in RAW_TEXT_END:
+            close = RAW_TEXT_END[lowered].search(text, pos)
+            self.tokens.append(RawText(element, pos, len(text) if close is None else close.start()))
+            return (len(text) if close is None else close.end()), 0
+        return pos, 1
+
+    def attributes(self, pos: int, element: Element) -> int:
+        """Attributes of a start tag up to and including its '>' or '/>'"""
+        text = self.text
+        length = len(text)
+        while True:
+            pos = SPACE.match(text, pos).end()
+            if pos >= length:
+                return length
+            char = text[pos]
+            if char == '>':
+                return pos + 1
+            if text.startswith('/>', pos):
+                element.self_closing = True
+                return pos + 2
+            if char == '<':
+                return pos
+            if char == '@':
+                # Razor in attribute position, e.g. <option @(selected ? "selected" : "")>
+                pos = self.transition(pos)
+                continue
+            if char in '"\'':
+                close = text.find(char, pos + 1)
+                pos = length if close == -1 else close + 1
+                continue
+            match = ATTRIBUTE.match(text, pos)
+            if match is None:
+                pos += 1
+                continue
+            name, equals, double_quoted, single_quoted = match.groups()
+            attribute = Attribute(name, pos)
+            element.attributes.append(attribute)
+            pos = match.end()
+            if double_quoted is not None or single_quoted is not None:
+                attribute.value = double_quoted if double_quoted is not None else single_quoted
+                attribute.quoted = True
+            elif equals:
+                pos = self.attribute_value(pos, attribute)
+
+    def attribute_value(self, pos: int, attribute: Attribute) -> int:
+        """A quoted or bare value; quotes inside Razor expressions do not end it"""
+        text = self.text
+        if pos >= len(text) or text[pos] not in '"\'':
+            value = UNQUOTED_VALUE.match(text, pos)
+            attribute.value = value.group(0)
+            return value.end()
+
+        quote = text[pos]
+        start = pos = pos + 1
+        while True:
+            close = text.find(quote, pos)
+            razor = text.find('@', pos, len(text) if close == -1 else close)
+            if razor != -1:
+                pos = self.transition(razor)
+                continue
+            attribute.value = text[start:len(text) if close == -1 else close]
+            attribute.quoted = True
+            return len(text) if close == -1 else close + 1
+
+    def transition(self, pos: int, statements: bool = False) -> int:
+        """Skip the Razor construct at an '@'; statements and directives only count in markup"""
+        text = self.text
+        length = len(text)
+        if pos > 0 and text[pos - 1].isalnum():
+            return pos + 1  # an e-mail address, not Razor
+        following = text[pos + 1] if pos + 1 < length else ''
+        if following == '@':
+            return pos + 2
+        if following == '*':
+            close = text.find('*@', pos + 2)
+            return length if close == -1 else close + 2
+        if following == '{':
+            return self.code(pos + 2, '}')
+        if following == '(':
+            return self.code(pos + 2, ')')
+        word = IDENTIFIER.match(text, pos + 1)
+        if word is None:
+            return pos + 1
+
+        keyword = word.group(0)
+        after = SPACE.match(text, word.end()).end()
+        if statements:
+            if keyword in CODE_DIRECTIVES or keyword == 'section':
+                brace = text.find('{', word.end())
+                if brace == -1:
+                    return length
+                return self.code(brace + 1, '}') if keyword in CODE_DIRECTIVES else self.markup(brace + 1, 'section')
+            if keyword in STATEMENT_KEYWORDS and not (keyword == 'using' and text[after:after + 1] != '('):
+                return self.statement(word.end())
+            if keyword in LINE_DIRECTIVES:
+                newline = text.find('\n', word.end())
+                return length if newline == -1 else newline
+        if keyword == 'await':
+            word = IDENTIFIER.match(text, after) or word
+        return self.implicit(word.end())
+
+    def implicit(self, pos: int) -> int:
+        """The rest of an implicit expression: member access, calls and indexers, no spaces"""
+        text = self.text
+        length = len(text)
+        while pos < length:
+            char = text[pos]
+            if char == '(':
+                pos = self.code(pos + 1, ')')
+            elif char == '[':
+                pos = self.code(pos + 1, ']')
+            elif char in '.?!':
+                member = IDENTIFIER.match(text, pos + 2 if text.startswith('?.', pos) else pos + 1)
+                if member is None:
+                    break
+                pos = member.end()
+            else:
+                break
+        return pos
+
+    def statement(self, pos: int) -> int:
+        """An @if/@foreach/@using/... statement with its condition, body and else/catch/finally parts"""
+        text = self.text
+        while True:
+            pos = SPACE.match(text, pos).end()
+            if text.startswith('(', pos):
+                pos = SPACE.match(text, self.code(pos + 1, ')')).end()
+            if not text.startswith('{', pos):
+                return pos
+            pos = self.code(pos + 1, '}')
+            continuation = CONTINUATION.match(text, pos)
+            if continuation is None:
+                return pos
+            pos = continuation.end()
+
+    def code(self, pos: int, closer: str) -> int:
+        """C# up to the matching closer, skipping literals and comments; inside braces markup may start"""
+        text = self.text
+        opener = BRACKETS[closer]
+        allow_markup = closer == '}'
+        depth = 0
+        while True:
+            match = CODE_EVENT.search(text, pos)
+            if match is None:
+                return len(text)
+            pos = match.start()
+            char = text[pos]
+            if char == '<':
+                if allow_markup and TAG_NAME.match(text, pos + 1) and self._markup_position(pos):
+                    pos = self.markup(pos, 'element')
+                else:
+                    pos += 1
+            elif char in '"\'/@':
+                if allow_markup and text.startswith('@:', pos):
+                    pos = self.markup(pos + 2, 'line')
+                    continue
+                literal = csharp_lexer.TOKEN.match(text, pos)
+                pos = literal.end() if literal else pos + 1
+            elif char == opener:
+                depth += 1
+                pos += 1
+            elif char == closer:
+                if depth == 0:
+                    return pos + 1
+                depth -= 1
+                pos += 1
+            else:
+                pos += 1
+
+    def _markup_position(self, pos: int) -> bool:
+        """Whether '<' starts a statement, which is where Razor switches from code to markup"""
+        text = self.text
+        pos -= 1
+        while pos >= 0 and text[pos].isspace():
+            pos -= 1
+        return pos < 0 or text[pos] in MARKUP_AFTER
+
+def tokenize(text: str) -> List[Token]:
+    """Elements and raw text of a Razor view in document order"""
+    scanner = _Scanner(text)
+    scanner.markup(0, 'document')
+    return scanner.tokens
@@ -23,7 +23,8 @@ echo.
 
 REM Run the code validation hook
 echo 🔍 Running code validation...
-python hooks\code-validation-hook.py
+REM Uses a running --watch daemon when there is one, otherwise validates in-process
+python hooks\code-validation-hook.py --client
 
 REM Check the result
 if %errorlevel% equ 0 (
@@ -12,6 +12,8 @@
     
 .NOTES
     Requires Python 3.7+ to be installed and available in PATH
+    If a validation daemon is running (python hooks\code-validation-hook.py --watch),
+    the check is answered from its warm caches; otherwise it runs in-process.
 #>
 
 Write-Host ""
@@ -52,7 +54,7 @@ if (-not (Test-Path $hookPath)) {
 # Run the code validation hook
 Write-Host "🔍 Running code validation..." -ForegroundColor Yellow
 try {
-    $process = Start-Process -FilePath "python" -ArgumentList $hookPath -Wait -PassThru -NoNewWindow
+    $process = Start-Process -FilePath "python" -ArgumentList @($hookPath, "--client") -Wait -PassThru -NoNewWindow
     $exitCode = $process.ExitCode
     
     if ($exitCode -eq 0) {
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Literal-prefilter secret scanner for the code validation hook.
+Instead of running every secret pattern over the whole file, one search for
+the union of all the patterns' trigger literals walks the case-folded text
+once and yields candidate lines. Only the patterns whose triggers occur on a
+candidate line are run, anchored to that line, so a file without any trigger
+costs a single linear scan however many signatures are configured.
+
+Patterns with a named 'value' group are then checked for placeholder values
+("your-secret-here", "${TOKEN}", "changeme"), and patterns with a minimum
+entropy only report values whose Shannon entropy reaches it, which separates
+random keys from words and sentences.
+
+Secret patterns are confirmed within the line holding their trigger, so they
+must not span line breaks.
+"""
+
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, List, Sequence, Tuple
+
+import lazy_regex
+
+# Values that are templates, test fixtures or documentation rather than credentials
+PLACEHOLDER = lazy_regex.compile(r'your|replace|change.?me|example|placeholder|sample|dummy|fake|mock|test|xxx|^[{$%<*]', re.IGNORECASE)
+
+def shannon_entropy(value: str) -> float:
+    """Bits per character of a string's character distribution"""
+    if not value:
+        return 0.0
+    length = len(value)
+    return -sum(count / length * math.log2(count / length) for count in Counter(value).values())
+
+def is_placeholder(value: str) -> bool:
+    """Whether a matched value is a template or sample rather than a real secret"""
+    return PLACEHOLDER.search(value) is not None
+
+def confirmed(pattern: Any, match: Any) -> bool:
+    """Whether a pattern match survives the placeholder and entropy checks on its value"""
+    if 'value' not in pattern.regex.groupindex:
+        return True
+    value = match.group('value') or ''
+    if is_placeholder(value):
+        return False
+    return shannon_entropy(value) >= pattern.min_entropy
+
+class SecretScanner:
+    """One prefilter search over the triggers of a set of secret patterns, confirmed line by line"""
+
+    def __init__(self, patterns: Sequence[Any]):
+        self.patterns = tuple(patterns)
+        self.by_trigger: Dict[str, List[int]] = {}
+        for index, pattern in enumerate(self.patterns):
+            for trigger in pattern.triggers:
+                self.by_trigger.setdefault(trigger, []).append(index)
+        self.unfiltered = [index for index, pattern in enumerate(self.patterns) if not pattern.triggers]
+        # Longest first so a trigger that contains another is preferred at the same offset
+        alternation = '|'.join(re.escape(trigger) for trigger in sorted(self.by_trigger, key=len, reverse=True))
+        self.prefilter = lazy_regex.compile(alternation) if alternation else None
+        self.prefilter_ignorecase = lazy_regex.compile(alternation, re.IGNORECASE) if alternation else None
+
+    def candidate_lines(self, ctx: Any) -> Dict[int, Tuple[int, int, List[int]]]:
+        """(start, end, pattern indices) of every line holding a trigger, keyed by line start
+
+        Triggers never contain line breaks, so every line with a trigger yields a prefilter hit even though the
+        alternation only reports non-overlapping matches; the line itself is then checked for every trigger."""
+        content = ctx.content
+        folded = ctx.folded
+        # Case folding can change the length of some characters (ß -> ss); offsets must stay aligned
+        text, prefilter = (folded, self.prefilter) if len(folded) == len(content) else (content, self.prefilter_ignorecase)
+        lines: Dict[int, Tuple[int, int, List[int]]] = {}
+        if prefilter is None:
+            return lines
+        for pos, region_end in ctx.regions():
+            while True:
+                hit = prefilter.search(text, pos, region_end)
+                if hit is None:
+                    break
+                start = text.rfind('\n', 0, hit.start()) + 1
+                end = text.find('\n', hit.end())
+                end = len(text) if end == -1 else end
+                line = text[start:end] if text is folded else text[start:end].casefold()
+                indices = sorted({index for trigger, owners in self.by_trigger.items() if trigger in line
+                                  for index in owners})
+                lines[start] = (start, end, indices)
+                pos = end + 1
+        return lines
+
+    def scan(self, ctx: Any) -> List[Tuple[Any, Any]]:
+        """(pattern index, match) of every confirmed secret, at most one per line, in pattern then offset order
+
+        When a line matches several patterns the earliest wins, so specific signatures take precedence over
+        the generic assignment detectors listed after them."""
+        findings: List[Tuple[int, int, Any]] = []
+        for index in (range(len(self.patterns)) if not ctx.prefilter else self.unfiltered):
+            pattern = self.patterns[index]
+            view = ctx.view(pattern.scope)
+            findings.extend((index, match.start(), match) for start, end in ctx.regions()
+                            for match in pattern.regex.finditer(view, start, end) if confirmed(pattern, match))
+        if ctx.prefilter:
+            for start, end, indices in self.candidate_lines(ctx).values():
+                for index in indices:
+                    pattern = self.patterns[index]
+                    findings.extend((index, match.start(), match)
+                                    for match in pattern.regex.finditer(ctx.view(pattern.scope), start, end)
+                                    if confirmed(pattern, match))
+        if ctx.count_matches:
+            ctx.match_count += len(findings)
+
+        reported = set()
+        results = []
+        for index, offset, match in sorted(findings, key=lambda finding: (finding[0], finding[1])):
+            line_number = ctx.line_number(offset)
+            if line_number in reported:
+                continue
+            reported.add(line_number)
+            results.append((index, match))
+        return results
+
+@lru_cache(maxsize=None)
+def scanner_for(patterns: Tuple[Any, ...]) -> SecretScanner:
+    """The scanner for a rule's patterns, built once per process"""
+    return SecretScanner(patterns)
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Reproducible synthetic project trees for benchmarking the code validation hook.
+The same seed and sizes always produce byte-identical trees, so timings from
+different commits are measured against the same input.
+
+Layout mirrors the real solution: src/API/MeAndMyDog.API with entities, DTOs,
+services, a DbContext and migration-sized files; src/Web/MeAndMyDog.WebApp
+with Razor views and TypeScript; and a decoy node_modules that the validator
+must never descend into.
+"""
+
+import random
+from pathlib import Path
+from typing import Any, Dict, List
+
+API_ROOT = Path('src') / 'API' / 'MeAndMyDog.API'
+WEB_ROOT = Path('src') / 'Web' / 'MeAndMyDog.WebApp'
+AREAS = ['Booking', 'Messaging', 'Billing', 'Pets', 'Providers', 'Calendar', 'Auth', 'Dashboard']
+PROPERTY_TYPES = ['string', 'int', 'decimal', 'bool', 'DateTimeOffset', 'string?', 'List<string>']
+
+def _class_block(rng: random.Random, name: str, documented: bool, properties: int, key: str = '') -> List[str]:
+    """One public class with a few properties, optionally XML-documented"""
+    lines = []
+    if documented:
+        lines += ['/// <summary>', f'/// {name} synthetic type', '/// </summary>']
+    lines += [f'public class {name}', '{']
+    if key:
+        if documented:
+            lines += ['    /// <summary>', '    /// Primary key', '    /// </summary>']
+        lines += [f'    public string {key} {{ get; set; }} = Guid.NewGuid().ToString();', '']
+    for index in range(properties):
+        if documented:
+            lines += ['    /// <summary>', f'    /// Property {index}', '    /// </summary>']
+        lines += [f'    public {rng.choice(PROPERTY_TYPES)} Value{index} {{ get; set; }}', '']
+    lines.append('}')
+    return lines
+
+def csharp_source(rng: random.Random, index: int, area: str) -> str:
+    """A service or DTO file: usually one class, sometimes several, with TODOs and secrets sprinkled in"""
+    classes = 1 if rng.random() < 0.85 else rng.randint(2, 4)
+    lines = ['using System;', 'using System.Collections.Generic;', '',
+             f'namespace MeAndMyDog.API.{area};', '']
+    for class_index in range(classes):
+        name = f'{area}Item{index}' + (f'Part{class_index}' if class_index else '')
+        lines += _class_block(rng, name, documented=rng.random() < 0.6, properties=rng.randint(2, 12))
+        lines.append('')
+    if rng.random() < 0.2:
+        lines.insert(5, '// TODO: replace the placeholder implementation')
+    if rng.random() < 0.05:
+        lines.insert(5, 'public static class Defaults { public const string Password = "password123"; }')
+    if rng.random() < 0.05:
+        lines.insert(5, '// HACK: throw new NotImplementedException until the provider is wired up')
+    return '\n'.join(lines) + '\n'
+
+def entity_source(rng: random.Random, name: str) -> str:
+    """An entity whose key follows the {TableName}Id convention about half the time"""
+    key = f'{name}Id' if rng.random() < 0.5 else 'Id'
+    lines = ['namespace MeAndMyDog.API.Models.Entities;', '']
+    lines += _class_block(rng, name, documented=True, properties=rng.randint(3, 10), key=key)
+    return '\n'.join(lines) + '\n'
+
+def db_context_source(entities: List[str]) -> str:
+    """A DbContext registering every entity, with one composite HasKey"""
+    lines = ['using Microsoft.EntityFrameworkCore;', 'using MeAndMyDog.API.Models.Entities;', '',
+             'namespace MeAndMyDog.API.Data;', '',
+             '/// <summary>', '/// Synthetic database context', '/// </summary>',
+             'public class ApplicationDbContext : DbContext', '{']
+    for entity in entities:
+        lines += ['    /// <summary>', f'    /// {entity} table', '    /// </summary>',
+                  f'    public DbSet<{entity}> {entity}s {{ get; set; }}', '']
+    lines += ['    /// <summary>', '    /// Model configuration', '    /// </summary>',
+              '    protected override void OnModelCreating(ModelBuilder builder)', '    {']
+    if entities:
+        lines += [f'        builder.Entity<{entities[0]}>(entity =>', '        {',
+                  f'            entity.HasKey(e => new {{ e.{entities[0]}Id, e.Value0 }});', '        });']
+    lines += ['    }', '}']
+    return '\n'.join(lines) + '\n'
+
+def migration_source(index: int, lines: int) -> str:
+    """A migration-sized file: one huge undocumented method of builder calls"""
+    body = ['using Microsoft.EntityFrameworkCore.Migrations;', '',
+            'namespace MeAndMyDog.API.Migrations;', '',
+            f'public partial class Synthetic{index:04d}Migration : Migration', '{',
+            '    protected override void Up(MigrationBuilder migrationBuilder)', '    {']
+    for line in range(lines):
+        body.append(f'        migrationBuilder.AddColumn<string>(name: "Column{line}", table: "Table{line % 97}", '
+                    f'nullable: true);')
+    body += ['    }', '}']
+    return '\n'.join(body) + '\n'
+
+def razor_view(rng: random.Random, index: int) -> str:
+    """A view that sometimes inlines styles, scripts and event handlers"""
+    lines = ['@model MeAndMyDog.WebApp.Models.ViewModel', f'@{{ ViewData["Title"] = "Page {index}"; }}', '',
+             '<div class="container">', f'    <h1>Page {index}</h1>']
+    for row in range(rng.randint(5, 40)):
+        if rng.random() < 0.05:
+            lines.append(f'    <p style="color: #{row:06x}">Styled row {row}</p>')
+        elif rng.random() < 0.03:
+            lines.append(f'    <button onclick="doThing({row})">Go</button>')
+        else:
+            lines.append(f'    <p class="row-{row}">@Model.Value{row % 5}</p>')
+    lines.append('</div>')
+    if rng.random() < 0.1:
+        lines += ['<style>', '    .row-0 { margin: 0; }', '</style>']
+    if rng.random() < 0.1:
+        lines += ['<script>', '    document.querySelector(".row-0").focus();', '</script>']
+    lines += ['@section Scripts {', f'    <script src="~/js/page{index}.js"></script>', '}']
+    return '\n'.join(lines) + '\n'
+
+def typescript_source(rng: random.Random, index: int) -> str:
+    """A module that occasionally leaves console statements behind"""
+    lines = [f'export class Widget{index} {{', '    private count = 0;', '']
+    for method in range(rng.randint(2, 8)):
+        lines += [f'    step{method}(value: number): number {{']
+        if rng.random() < 0.1:
+            lines.append(f'        console.log("step{method}", value);')
+        lines += ['        this.count += value;', '        return this.count;', '    }', '']
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+def generate_corpus(root: Path, files: int = 2000, seed: int = 0, giant_files: int = 3, giant_lines: int = 20000,
+                    dependency_files: int = 2000) -> Dict[str, Any]:
+    """Write a synthetic tree under root and return a manifest of what it contains"""
+    rng = random.Random(seed)
+    manifest: Dict[str, Any] = {'seed': seed, 'files': files, 'giant_files': giant_files,
+                                'giant_lines': giant_lines, 'dependency_files': dependency_files, 'counts': {}}
+    counts = manifest['counts']
+
+    def write(relative_path: Path, content: str, kind: str):
+        path = root / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding='utf-8', newline='\n')
+        counts[kind] = counts.get(kind, 0) + 1
+
+    entities = []
+    for index in range(files):
+        area = AREAS[index % len(AREAS)]
+        roll = rng.random()
+        if roll < 0.08:
+            name = f'{area}Record{index}'
+            entities.append(name)
+            write(API_ROOT / 'Models' / 'Entities' / f'{name}.cs', entity_source(rng, name), 'entity')
+        elif roll < 0.55:
+            write(API_ROOT / 'Services' / area / f'{area}Item{index}.cs', csharp_source(rng, index, area), 'csharp')
+        elif roll < 0.75:
+            write(API_ROOT / 'Models' / 'DTOs' / area / f'{area}Item{index}.cs', csharp_source(rng, index, area),
+                  'csharp')
+        elif roll < 0.9:
+            write(WEB_ROOT / 'Views' / area / f'Page{index}.cshtml', razor_view(rng, index), 'razor')
+        else:
+            write(WEB_ROOT / 'wwwroot' / 'ts' / f'widget{index}.ts', typescript_source(rng, index), 'typescript')
+
+    write(API_ROOT / 'Data' / 'ApplicationDbContext.cs', db_context_source(entities), 'csharp')
+    for index in range(giant_files):
+        write(API_ROOT / 'Migrations' / f'2025010100{index:04d}_Synthetic{index:04d}.cs',
+              migration_source(index, giant_lines), 'migration')
+
+    # Decoy dependencies full of violations; the walker must prune them unseen
+    for index in range(dependency_files):
+        package = WEB_ROOT / 'node_modules' / f'package{index % 100}' / 'dist'
+        write(package / f'index{index}.ts', 'console.log("dependency");\nexport const password = "password123";\n',
+              'dependency')
+    for build_dir in ['bin', 'obj']:
+        write(API_ROOT / build_dir / 'Debug' / 'Generated.cs', 'public class A {}\npublic class B {}\n', 'build_output')
+    return manifest
@@ -8,7 +8,7 @@ Integrates with Claude Code's TodoWrite tool to maintain code quality standards.
 import os
 import sys
 import json
-import subprocess
+import importlib.util
 from pathlib import Path
 from typing import Dict, List, Any
 
@@ -53,6 +53,14 @@ def check_task_completion_status(todos: List[Dict[str, Any]]) -> Dict[str, Any]:
         'completed_low_priority': len(completed_low_tasks)
     }
 
+def load_code_validation_hook(hook_path: Path):
+    """Import code-validation-hook.py in-process; its hyphenated name rules out a plain import"""
+    spec = importlib.util.spec_from_file_location('code_validation_hook', hook_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
 def run_code_validation() -> Dict[str, Any]:
     """Run the code validation hook"""
     print("\n🔧 Running automatic code validation...")
@@ -69,44 +77,33 @@ def run_code_validation() -> Dict[str, Any]:
         }
     
     try:
-        # Run the code validation hook
-        result = subprocess.run([
-            sys.executable, str(hook_path)
-        ], capture_output=True, text=True, cwd=project_root)
-        
-        # Check if validation report was generated
-        report_path = project_root / "CODE_VALIDATION_REPORT.md"
+        # Run the validator in this interpreter and read its structured result
+        validation_hook = load_code_validation_hook(hook_path)
+        result = validation_hook.run_validation(str(project_root), quiet=True)
         
-        if report_path.exists():
-            print(f"📊 Code validation report generated: {report_path}")
-            
-            # Try to extract compliance score from the output
-            compliance_score = None
-            if "Compliance Score:" in result.stdout:
-                try:
-                    for line in result.stdout.split('\n'):
-                        if "Compliance Score:" in line:
-                            score_text = line.split("Compliance Score:")[1].strip()
-                            compliance_score = float(score_text.split('/')[0])
-                            break
-                except:
-                    pass
+        if result.report_path is not None:
+            print(f"📊 Code validation report generated: {result.report_path}")
             
             return {
-                'success': result.returncode == 0,
+                'success': not result.has_errors,
                 'message': 'Code validation completed',
-                'compliance_score': compliance_score,
-                'has_errors': result.returncode != 0,
-                'output': result.stdout,
-                'errors': result.stderr if result.stderr else None
+                'compliance_score': result.compliance_score,
+                'baseline': result.baseline,
+                'baseline_suppressed': result.baseline_suppressed,
+                'has_errors': result.has_errors,
+                'errors_count': result.errors,
+                'warnings_count': result.warnings,
+                'violations': result.violations,
+                'output': result.output,
+                'errors': None
             }
         else:
             return {
                 'success': False,
                 'message': 'Code validation hook ran but no report was generated',
                 'compliance_score': None,
-                'output': result.stdout,
-                'errors': result.stderr
+                'output': result.output,
+                'errors': None
             }
             
     except Exception as e:
@@ -154,6 +151,10 @@ def generate_task_completion_summary(task_status: Dict[str, Any], validation_res
         compliance_score = validation_result.get('compliance_score', 'Unknown')
         lines.append(f"- **Status**: PASSED")
         lines.append(f"- **Compliance Score**: {compliance_score}/100")
+        if validation_result.get('baseline'):
+            # The score and the gate ignore the known violations the baseline records
+            lines.append(f"- **Scope**: new violations only; {validation_result['baseline_suppressed']} known "
+                         f"violations in {validation_result['baseline']} are not scored")
         lines.append(f"- **Quality Gate**: {'PASSED' if not validation_result.get('has_errors') else 'FAILED'}")
     else:
         lines.append(f"- **Status**: FAILED")
@@ -190,7 +191,8 @@ def main():
     if validation_result['success']:
         print("✅ Code validation passed!")
         if validation_result.get('compliance_score'):
-            print(f"📈 Compliance Score: {validation_result['compliance_score']}/100")
+            scope = ' (new violations only)' if validation_result.get('baseline') else ''
+            print(f"📈 Compliance Score: {validation_result['compliance_score']}/100{scope}")
     else:
         print("❌ Code validation failed!")
         print(f"❗ Error: {validation_result.get('message')}")
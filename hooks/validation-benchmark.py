@@ -0,0 +1,1126 @@
+#!/usr/bin/env python3
+"""
+MeAndMyDog Validation Benchmarks
+Measures the performance of the code validation hook against the project tree.
+Run from the project root: python hooks/validation-benchmark.py <benchmark>
+"""
+
+import argparse
+import builtins
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+HOOKS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(HOOKS_DIR))
+
+import synthetic_corpus
+
+# -X importtime log of a one-file run, committed so startup regressions are caught against it
+IMPORTTIME_BASELINE = HOOKS_DIR / 'benchmarks' / 'importtime-baseline.txt'
+STARTUP_BUDGET_MS = 250.0  # one-file run over the bare interpreter
+
+def load_validator_module():
+    """Import code-validation-hook.py, whose hyphenated name rules out a plain import"""
+    spec = importlib.util.spec_from_file_location('code_validation_hook', HOOKS_DIR / 'code-validation-hook.py')
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+class IOCounter:
+    """Counts file opens, read calls and decoded characters while active"""
+
+    def __init__(self):
+        self.opens = 0
+        self.reads = 0
+        self.chars = 0
+        self._original_open = builtins.open
+
+    def __enter__(self):
+        counter = self
+        original_open = self._original_open
+
+        def counting_open(*args, **kwargs):
+            handle = original_open(*args, **kwargs)
+            counter.opens += 1
+            original_read = handle.read
+
+            def counting_read(*read_args):
+                data = original_read(*read_args)
+                counter.reads += 1
+                counter.chars += len(data)
+                return data
+
+            handle.read = counting_read
+            return handle
+
+        builtins.open = counting_open
+        return self
+
+    def __exit__(self, *exc_info):
+        builtins.open = self._original_open
+        return False
+
+def select_files(validator, args) -> List[str]:
+    """Files for the full fallback scan, optionally size-capped and truncated"""
+    files = sorted(validator.get_all_source_files())
+    if args.max_size:
+        files = [f for f in files if os.path.getsize(validator.project_root / f) <= args.max_size]
+    if args.limit:
+        files = files[:args.limit]
+    return files
+
+def measure(run: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """Best wall time over several runs, with I/O counters from the last run"""
+    best = None
+    for _ in range(repeat):
+        with IOCounter() as counter, contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return {'seconds': best, 'opens': counter.opens, 'reads': counter.reads, 'chars': counter.chars}
+
+def print_table(rows: List[Dict[str, Any]], columns: List[str]):
+    """Print benchmark rows as an aligned plain-text table"""
+    widths = {c: max(len(c), *(len(str(r[c])) for r in rows)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for row in rows:
+        print("  ".join(str(row[c]).ljust(widths[c]) for c in columns))
+
+def bench_pipeline(module, args):
+    """Per-rule file reads versus the shared single-read pipeline"""
+    # The per-rule entry points validate generated code too, so the pipeline must as well
+    validator = module.CodeValidator(args.root, classify_generated=False)
+    files = select_files(validator, args)
+    print(f"Full fallback scan: {len(files)} files")
+
+    def per_rule():
+        for file_path in files:
+            validator.validate_single_class_per_file(file_path)
+            validator.validate_xml_documentation(file_path)
+            validator.validate_console_statements(file_path)
+            validator.validate_hardcoded_secrets(file_path)
+            validator.validate_incomplete_implementations(file_path)
+            validator.validate_inline_css_javascript(file_path)
+
+    rows = []
+    for mode, run in [('per-rule reads', per_rule), ('single read', lambda: validator.validate_all_files(files))]:
+        result = measure(run, args.repeat)
+        rows.append({
+            'mode': mode,
+            'opens': result['opens'],
+            'reads': result['reads'],
+            'decoded MB': f"{result['chars'] / 1e6:.1f}",
+            'wall s': f"{result['seconds']:.3f}",
+        })
+    print_table(rows, ['mode', 'opens', 'reads', 'decoded MB', 'wall s'])
+
+def synthetic_csharp(lines: int) -> str:
+    """A large C# file with a rule match every few lines"""
+    body = []
+    for i in range(lines):
+        if i % 10 == 0:
+            body.append(f"        // TODO: finish step {i}")
+        elif i % 25 == 1:
+            body.append(f'        var connection = "Server=localhost;password123;"; // {i}')
+        elif i % 40 == 2:
+            body.append("        throw new NotImplementedException();")
+        else:
+            body.append(f"        total += values[{i}] * factor;")
+    return "\n".join(body) + "\n"
+
+def bench_line_index(module, args):
+    """Prefix-slice line numbering versus the bisect line-offset index"""
+    content = synthetic_csharp(args.lines)
+    validator = module.CodeValidator(args.root)
+
+    class PrefixCountContext(module.FileContext):
+        def line_number(self, offset: int) -> int:
+            return self.content[:offset].count('\n') + 1
+
+    def run(context_class):
+        ctx = context_class(file_path='Synthetic.cs', extension='.cs', content=content)
+        return (validator.run_rule(validator.registry['no_incomplete_implementations'], ctx)
+                + validator.run_rule(validator.registry['no_hardcoded_secrets'], ctx))
+
+    rows = []
+    results = {}
+    for mode, context_class in [('prefix count', PrefixCountContext), ('line index', module.FileContext)]:
+        timing = measure(lambda: results.__setitem__(mode, run(context_class)), args.repeat)
+        rows.append({
+            'mode': mode,
+            'lines': args.lines,
+            'matches': len(results[mode]),
+            'wall s': f"{timing['seconds']:.3f}",
+        })
+    print_table(rows, ['mode', 'lines', 'matches', 'wall s'])
+
+    if results['prefix count'] != results['line index']:
+        print("ERROR: line numbers differ between prefix count and line index")
+        sys.exit(1)
+
+def bench_scanner(module, args):
+    """Per-rule scan throughput with and without the trigger-literal prefilter"""
+    validator = module.CodeValidator(args.root)
+    files = select_files(validator, args)
+    print(f"Scanning {len(files)} files")
+
+    rows = []
+    for mode, prefilter in [('regex only', False), ('prefilter', True)]:
+        validator.use_prefilter = prefilter
+        with contextlib.redirect_stdout(io.StringIO()):
+            contexts = [ctx for ctx in map(validator.load_file_context, files) if ctx is not None]
+        totals = {'bytes': 0, 'seconds': 0.0, 'skipped': 0}
+        for rule in validator.registry.rules:
+            scanned = skipped = 0
+            started = time.perf_counter()
+            for ctx in contexts:
+                if rule not in validator.rules_for(ctx.file_path):
+                    continue
+                scanned += len(ctx.content)
+                if not ctx.contains_any(rule.triggers):
+                    skipped += 1
+                    continue
+                validator.run_rule(rule, ctx)
+            elapsed = time.perf_counter() - started
+            totals['bytes'] += scanned
+            totals['seconds'] += elapsed
+            totals['skipped'] += skipped
+            rows.append({
+                'mode': mode,
+                'rule': rule.rule_id,
+                'MB': f"{scanned / 1e6:.2f}",
+                'files skipped': skipped,
+                'wall s': f"{elapsed:.3f}",
+                'MB/s': f"{scanned / 1e6 / max(elapsed, 1e-9):.1f}",
+            })
+        rows.append({
+            'mode': mode,
+            'rule': 'all rules',
+            'MB': f"{totals['bytes'] / 1e6:.2f}",
+            'files skipped': totals['skipped'],
+            'wall s': f"{totals['seconds']:.3f}",
+            'MB/s': f"{totals['bytes'] / 1e6 / max(totals['seconds'], 1e-9):.1f}",
+        })
+    print_table(rows, ['mode', 'rule', 'MB', 'files skipped', 'wall s', 'MB/s'])
+
+LEXER_RULES = ['class_single_per_file', 'xml_documentation_required', 'no_incomplete_implementations',
+               'no_hardcoded_secrets']
+
+def bench_lexer(module, args):
+    """C# rule throughput on raw text versus lexer-masked views, plus the lexer on its own"""
+    validator = module.CodeValidator(args.root)
+    api_dir = os.path.join('src', 'API') + os.sep
+    files = [f for f in select_files(validator, args) if f.startswith(api_dir) and f.endswith('.cs')]
+    with contextlib.redirect_stdout(io.StringIO()):
+        sources = [(ctx.file_path, ctx.content) for ctx in map(validator.load_file_context, files) if ctx is not None]
+    total_mb = sum(len(content) for _, content in sources) / 1e6
+    print(f"Scanning {len(sources)} C# files ({total_mb:.1f} MB) under {api_dir}")
+    rules = [validator.registry[rule_id] for rule_id in LEXER_RULES]
+
+    def scan(lexer: bool) -> Dict[str, List[Any]]:
+        found = {rule.rule_id: [] for rule in rules}
+        for file_path, content in sources:
+            ctx = module.FileContext(file_path, '.cs', content, lexer=lexer)
+            for rule in rules:
+                if ctx.contains_any(rule.triggers):
+                    found[rule.rule_id].extend(validator.run_rule(rule, ctx))
+        return found
+
+    rows = []
+    results = {}
+    lex_only = measure(lambda: [module.csharp_lexer.lex(content) for _, content in sources], args.repeat)
+    rows.append({'mode': 'lexer only', 'wall s': f"{lex_only['seconds']:.3f}",
+                 'MB/s': f"{total_mb / max(lex_only['seconds'], 1e-9):.1f}", 'violations': '-'})
+    for mode, lexer in [('regex on raw text', False), ('regex on lexed views', True)]:
+        timing = measure(lambda: results.__setitem__(mode, scan(lexer)), args.repeat)
+        rows.append({'mode': mode, 'wall s': f"{timing['seconds']:.3f}",
+                     'MB/s': f"{total_mb / max(timing['seconds'], 1e-9):.1f}",
+                     'violations': sum(len(found) for found in results[mode].values())})
+    print_table(rows, ['mode', 'wall s', 'MB/s', 'violations'])
+
+    # Raw-text matches the lexer drops are ones inside comments or strings (or, for TODOs, in code)
+    print()
+    for rule in rules:
+        raw = {(v.file_path, v.message) for v in results['regex on raw text'][rule.rule_id]}
+        lexed = {(v.file_path, v.message) for v in results['regex on lexed views'][rule.rule_id]}
+        print(f"{rule.rule_id}: {len(raw - lexed)} raw-only, {len(lexed - raw)} lexed-only")
+
+    # A line of attribute groups with no class after it must not backtrack: doubling the groups about doubles the time
+    def bracket_seconds(groups: int) -> float:
+        line = '[a]' * groups + ' class\n'
+        return measure(lambda: module.CLASS_DECLARATION.regex.search(line), max(args.repeat, 5))['seconds']
+    growth = bracket_seconds(24) / max(bracket_seconds(12), 1e-9)
+    print(f"\nClass declaration search from 12 to 24 attribute groups grows {growth:.1f}x (linear: ~2x)")
+    if growth > 8.0:
+        print("ERROR: the class declaration pattern backtracks over attribute groups")
+        sys.exit(1)
+
+def legacy_recent_files(project_root: Path, days: int) -> List[str]:
+    """The pre-walker discovery: one glob per extension, filtered after descending"""
+    cutoff_time = datetime.now() - timedelta(days=days)
+    recently_modified = []
+    for ext in ['.cs', '.ts', '.tsx', '.cshtml']:
+        for file_path in project_root.glob(f'**/*{ext}'):
+            path_str = str(file_path)
+            if any(skip_dir in path_str for skip_dir in ['node_modules', 'bin', 'obj', '.git', 'packages', 'wwwroot/lib']):
+                continue
+            if datetime.fromtimestamp(file_path.stat().st_mtime) > cutoff_time:
+                recently_modified.append(str(file_path.relative_to(project_root)))
+    recently_modified.sort(key=lambda f: os.path.getmtime(project_root / f), reverse=True)
+    return recently_modified
+
+def build_walk_tree(root: Path, source_files: int, dependency_files: int):
+    """A project tree with C#/Razor/TypeScript sources and a populated node_modules"""
+    for i in range(source_files):
+        folder = root / 'src' / f'Area{i % 20}' / ('Views' if i % 10 == 0 else 'Services')
+        folder.mkdir(parents=True, exist_ok=True)
+        ext = '.cshtml' if i % 10 == 0 else '.ts' if i % 7 == 0 else '.cs'
+        (folder / f'File{i}{ext}').write_text('// source\n')
+    for i in range(dependency_files):
+        folder = root / 'src' / 'Web' / 'node_modules' / f'package{i % 200}' / 'dist' / f'lib{i % 3}'
+        folder.mkdir(parents=True, exist_ok=True)
+        (folder / f'index{i}.ts').write_text('export {};\n')
+    for build_dir in ['bin', 'obj']:
+        folder = root / 'src' / 'Area0' / build_dir / 'Debug'
+        folder.mkdir(parents=True, exist_ok=True)
+        (folder / 'Generated.cs').write_text('// build output\n')
+
+def bench_walk(module, args):
+    """Per-extension globbing versus the single pruned scandir walk"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(args.root) if args.use_root else Path(temp_dir)
+        if not args.use_root:
+            build_walk_tree(root, args.files, args.dependency_files)
+            print(f"Synthetic tree: {args.files} source files, {args.dependency_files} files in node_modules")
+
+        def walker():
+            return module.CodeValidator(str(root)).get_recently_modified_files(days=args.days)
+
+        results = {}
+        rows = []
+        for mode, run in [('glob per extension', lambda: legacy_recent_files(root, args.days)), ('scandir walk', walker)]:
+            timing = measure(lambda: results.__setitem__(mode, run()), args.repeat)
+            rows.append({'mode': mode, 'files': len(results[mode]), 'wall s': f"{timing['seconds']:.3f}"})
+        print_table(rows, ['mode', 'files', 'wall s'])
+
+def bench_jobs(module, args):
+    """Process pool scaling, checking every report is byte-identical to the serial one"""
+    files = select_files(module.CodeValidator(args.root), args)
+    print(f"Validating {len(files)} files on {os.cpu_count()} CPUs")
+
+    rows = []
+    reports = {}
+    for jobs in args.jobs:
+        validator = module.CodeValidator(args.root, jobs=jobs)
+        results = {}
+        timing = measure(lambda: results.setdefault('run', validator.validate_all_files(files)), args.repeat)
+        reports[jobs] = validator.generate_report(results['run'])
+        rows.append({
+            'jobs': jobs,
+            'violations': results['run']['total_violations'],
+            'wall s': f"{timing['seconds']:.3f}",
+            'speedup': f"{rows[0]['seconds'] / timing['seconds']:.2f}x" if rows else '1.00x',
+            'seconds': timing['seconds'],
+        })
+    print_table(rows, ['jobs', 'violations', 'wall s', 'speedup'])
+
+    if len(set(reports.values())) > 1:
+        print("ERROR: parallel reports differ from the serial report")
+        sys.exit(1)
+
+def build_history_repo(root: Path, commits: int, files: int):
+    """A git repository with a long commit history, packed by fast-import, plus uncommitted edits"""
+    subprocess.run(['git', 'init', '-q', str(root)], check=True)
+    now = int(time.time())
+    stream = io.BytesIO()
+    for i in range(commits):
+        message = f'Commit {i}'.encode()
+        stream.write(b'commit refs/heads/master\n')
+        stream.write(f'committer Bench <bench@localhost> {now - (commits - i) * 30} +0000\n'.encode())
+        stream.write(b'data %d\n%s\n' % (len(message), message))
+        for j in range(5 if i else files):
+            index = (i * 7 + j) % files if i else j
+            ext = '.cshtml' if index % 10 == 0 else '.cs'
+            body = f'public class File{index} {{ }} // revision {i}\n'.encode()
+            stream.write(f'M 644 inline src/Area{index % 25}/File{index}{ext}\n'.encode())
+            stream.write(b'data %d\n%s\n' % (len(body), body))
+    subprocess.run(['git', 'fast-import', '--quiet'], input=stream.getvalue(), cwd=root, check=True)
+    subprocess.run(['git', 'checkout', '-q', '-f', 'master'], cwd=root, check=True)
+    add_uncommitted_work(root, files)
+
+def add_uncommitted_work(root: Path, files: int):
+    """Uncommitted work in a checkout of a history repo: edits, a staged addition and untracked files"""
+    for index in range(0, files, max(1, files // 20)):
+        ext = '.cshtml' if index % 10 == 0 else '.cs'
+        with open(root / f'src/Area{index % 25}/File{index}{ext}', 'a') as f:
+            f.write('// edited\n')
+    (root / 'src/Area0/Staged.cs').write_text('public class Staged { }\n')
+    subprocess.run(['git', 'add', 'src/Area0/Staged.cs'], cwd=root, check=True)
+    for index in range(10):
+        (root / f'src/Area1/Untracked{index}.cs').write_text('public class Untracked { }\n')
+
+def bench_baseline(module, args):
+    """Refreshing a baseline from a full run, loading it, and filtering the run's violations against it"""
+    import violation_baseline
+
+    validator = module.CodeValidator(args.root)
+    files = select_files(validator, args)
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        violations = validator.validate_all_files(files)['violations']
+        validate_seconds = time.perf_counter() - started
+    by_file: Dict[str, List[Any]] = {}
+    for violation in violations:
+        by_file.setdefault(violation.file_path, []).append(violation)
+
+    with tempfile.TemporaryDirectory() as temp:
+        path = Path(temp) / violation_baseline.BASELINE_FILE
+        baseline = module.new_baseline(validator.project_root, path, validator.registry)
+        refresh = measure(lambda: baseline.update(None, violations), args.repeat)
+        loaded = module.new_baseline(validator.project_root, path, validator.registry)
+        load = measure(loaded.load, args.repeat)
+        new: List[Any] = []
+        check = measure(lambda: new.__setitem__(slice(None), [v for file_path, found in by_file.items()
+                                                              for v in loaded.new_violations(file_path, found)]),
+                        args.repeat)
+        size = path.stat().st_size
+
+    print(f"Full fallback scan: {len(files)} files, {len(violations)} violations in {validate_seconds:.3f} s")
+    print_table([
+        {'step': 'refresh (one pass)', 'wall ms': f"{refresh['seconds'] * 1000:.1f}", 'note': f"{size / 1e3:.1f} KB"},
+        {'step': 'load', 'wall ms': f"{load['seconds'] * 1000:.1f}", 'note': f"{len(loaded.fingerprints)} fingerprints"},
+        {'step': 'filter', 'wall ms': f"{check['seconds'] * 1000:.1f}", 'note': f"{len(new)} new"},
+    ], ['step', 'wall ms', 'note'])
+    # Secrets are never baselined, so they are the only violations left
+    unbaselined = sum(violation.rule_id in violation_baseline.NEVER_BASELINED for violation in violations)
+    if len(new) != unbaselined or len(loaded.fingerprints) != len(violations) - unbaselined:
+        print("ERROR: the baseline did not record every violation of the run it was refreshed from")
+        sys.exit(1)
+
+def bench_changes(module, args):
+    """git log/status subprocesses versus reading .git/index in-process"""
+    sys.path.insert(0, str(HOOKS_DIR))
+    from git_changes import detect_changes
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(args.root) if args.use_root else Path(temp_dir)
+        if not args.use_root:
+            build_history_repo(root, args.commits, args.files)
+            print(f"Synthetic repository: {args.commits} commits over {args.files} files")
+
+        extensions = module.SOURCE_EXTENSIONS
+
+        def commit_window():
+            since_date = (datetime.now() - timedelta(days=args.days)).strftime('%Y-%m-%d')
+            result = subprocess.run(['git', 'log', '--since', since_date, '--name-only', '--pretty=format:', '--diff-filter=AM'],
+                                    capture_output=True, text=True, cwd=root)
+            return sorted({f for f in result.stdout.split('\n') if f.endswith(extensions) and os.path.exists(root / f)})
+
+        def git_status(checkout: Path = root):
+            result = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=all'],
+                                    capture_output=True, text=True, cwd=checkout)
+            return sorted({line[3:] for line in result.stdout.splitlines()
+                           if line[3:].endswith(extensions) and os.path.exists(checkout / line[3:])})
+
+        results = {}
+        rows = []
+        for mode, run in [('git log (commit window)', commit_window),
+                          ('git status', git_status),
+                          ('index in-process', lambda: detect_changes(root, extensions, module.EXCLUDED_DIRS).all())]:
+            timing = measure(lambda: results.__setitem__(mode, run()), args.repeat)
+            rows.append({'mode': mode, 'files': len(results[mode]), 'wall s': f"{timing['seconds']:.3f}"})
+        print_table(rows, ['mode', 'files', 'wall s'])
+        checkouts = [('working tree', root, results['git status'], results['index in-process'])]
+
+        if not args.use_root:
+            # A linked worktree reads objects and refs through commondir, a shared clone through info/alternates
+            linked, shared = Path(temp_dir) / 'linked', Path(temp_dir) / 'shared'
+            subprocess.run(['git', 'worktree', 'add', '-q', '-b', 'linked', str(linked)], cwd=root, check=True)
+            subprocess.run(['git', 'clone', '-q', '--shared', str(root), str(shared)], check=True)
+            for label, checkout in [('linked worktree', linked), ('shared clone', shared)]:
+                add_uncommitted_work(checkout, args.files)
+                checkouts.append((label, checkout, git_status(checkout),
+                                  detect_changes(checkout, extensions, module.EXCLUDED_DIRS).all()))
+                print(f"{label}: {len(checkouts[-1][2])} changed files")
+
+        for label, checkout, expected, found in checkouts:
+            if expected != found:
+                print(f"ERROR: in-process changes differ from git status in the {label}")
+                print(f"   only git status: {sorted(set(expected) - set(found))[:10]}")
+                print(f"   only in-process: {sorted(set(found) - set(expected))[:10]}")
+                sys.exit(1)
+
+# The XML documentation pattern before the linear rewrite, kept for comparison
+LEGACY_XML_DOC_PATTERN = re.compile(r'(?:^|\n)(\s*)(?:(?!\/\/\/).*\n)*\s*public\s+(?:partial\s+)?class\s+(\w+)', re.MULTILINE)
+
+def legacy_xml_doc_scan(content: str) -> int:
+    """Undocumented classes found by the legacy backtracking pattern"""
+    found = 0
+    for match in LEGACY_XML_DOC_PATTERN.finditer(content):
+        if '///' not in '\n'.join(content[:match.start()].split('\n')[-5:]):
+            found += 1
+    return found
+
+def adversarial_csharp(lines: int) -> str:
+    """Input shaped to trigger backtracking: long undocumented runs with no class declaration to end them"""
+    body = []
+    for i in range(lines):
+        if i % 50 == 49:
+            body.append(f"    public {'List<' * 20}int{'>' * 20} Method{i}()")
+        elif i % 7 == 0:
+            body.append(f"    [Attribute{i}({' ' * 40})]")
+        elif i % 5 == 0:
+            body.append(f"    public {'Dictionary<string, ' * 5}int{'>' * 5} Property{i}          ")
+        else:
+            body.append(f"    var value{i} = {'(' * 10}{i}{')' * 10};                ")
+    return "\n".join(body) + "\n"
+
+def bench_xmldoc(module, args):
+    """Legacy backtracking XML documentation pattern versus the linear declaration walk"""
+    validator = module.CodeValidator(args.root)
+    rule = validator.registry['xml_documentation_required']
+
+    def rule_seconds(content: str) -> float:
+        ctx = module.FileContext(file_path='Adversarial.cs', extension='.cs', content=content)
+        return measure(lambda: validator.run_rule(rule, ctx), args.repeat)['seconds']
+
+    rows = []
+    for lines in (100, 200, 400):
+        content = adversarial_csharp(lines)
+        legacy = measure(lambda: legacy_xml_doc_scan(content), 1)['seconds']
+        rows.append({'input': f'adversarial {lines} lines', 'legacy s': f"{legacy:.3f}", 'linear s': f"{rule_seconds(content):.4f}"})
+
+    files = select_files(validator, args)
+    with contextlib.redirect_stdout(io.StringIO()):
+        contexts = [ctx for ctx in map(validator.load_file_context, files) if ctx is not None and ctx.extension == '.cs']
+    if contexts:
+        scanned = sum(len(ctx.content) for ctx in contexts)
+        timing = measure(lambda: [validator.run_rule(rule, ctx) for ctx in contexts], args.repeat)
+        rows.append({'input': f'{len(contexts)} .cs files, {scanned / 1e6:.1f} MB', 'legacy s': 'n/a', 'linear s': f"{timing['seconds']:.4f}"})
+    print_table(rows, ['input', 'legacy s', 'linear s'])
+
+    # Linear-time check: time per line must stay flat as the adversarial input grows 8x
+    base_lines = args.lines // 8
+    sizes = [base_lines * factor for factor in (1, 2, 4, 8)]
+    per_line = [rule_seconds(adversarial_csharp(lines)) / lines for lines in sizes]
+    growth = per_line[-1] / per_line[0]
+    print(f"Time per line from {sizes[0]} to {sizes[-1]} lines grows {growth:.2f}x (linear: ~1x)")
+    if growth > 2.0:
+        print("ERROR: XML documentation rule is not linear in input size")
+        sys.exit(1)
+
+    # Documentation above an attribute that spans lines still documents the declaration
+    documented = ("/// <summary>Documented</summary>\n[ProducesResponseType(\n    typeof(string),\n    200)]\n"
+                  "public class Documented { }\n")
+    if validator.run_rule(rule, module.FileContext(file_path='Documented.cs', extension='.cs', content=documented)):
+        print("ERROR: XML documentation above a multi-line attribute was not found")
+        sys.exit(1)
+
+LEGACY_INLINE_PATTERNS = [
+    re.compile(r'<style\b[^>]*>(.*?)</style>', re.IGNORECASE | re.DOTALL),
+    re.compile(r'style\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE),
+    re.compile(r'<script\b[^>]*>(.*?)</script>', re.IGNORECASE | re.DOTALL),
+    re.compile(r'\bon\w+\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE),
+]
+
+def legacy_inline_scan(content: str) -> int:
+    """Matches of the four per-pattern scans the inline CSS/JavaScript rule used to make"""
+    return sum(1 for pattern in LEGACY_INLINE_PATTERNS for _ in pattern.finditer(content))
+
+def adversarial_razor(lines: int) -> str:
+    """A view full of unclosed <script> and <style> tags, each of which the DOTALL scans chase to the end"""
+    body = ['@model ViewModel']
+    for i in range(lines):
+        if i % 10 == 0:
+            body.append(f'<script data-index="{i}">')
+        elif i % 10 == 5:
+            body.append(f'<style data-index="{i}">')
+        else:
+            body.append(f'<p class="row-{i}">@Model.Value{i % 5}</p>')
+    return "\n".join(body) + "\n"
+
+def bench_razor(module, args):
+    """Legacy four-regex inline CSS/JavaScript scans versus one pass of the Razor tokenizer"""
+    validator = module.CodeValidator(args.root)
+    rule = validator.registry['no_inline_css_javascript']
+
+    def rule_seconds(content: str) -> float:
+        ctx = module.FileContext(file_path='Adversarial.cshtml', extension='.cshtml', content=content)
+        return measure(lambda: validator.run_rule(rule, ctx), args.repeat)['seconds']
+
+    rows = []
+    for lines in (1000, 2000, 4000):
+        content = adversarial_razor(lines)
+        legacy = measure(lambda: legacy_inline_scan(content), 1)['seconds']
+        rows.append({'input': f'adversarial {lines} lines', 'legacy s': f"{legacy:.3f}",
+                     'tokenizer s': f"{rule_seconds(content):.4f}"})
+
+    files = select_files(validator, args)
+    with contextlib.redirect_stdout(io.StringIO()):
+        contexts = [ctx for ctx in map(validator.load_file_context, files)
+                    if ctx is not None and ctx.extension == '.cshtml']
+    if contexts:
+        scanned = sum(len(ctx.content) for ctx in contexts)
+        legacy = measure(lambda: [legacy_inline_scan(ctx.content) for ctx in contexts], args.repeat)
+        timing = measure(lambda: [validator.run_rule(rule, ctx) for ctx in contexts], args.repeat)
+        rows.append({'input': f'{len(contexts)} views, {scanned / 1e6:.1f} MB', 'legacy s': f"{legacy['seconds']:.4f}",
+                     'tokenizer s': f"{timing['seconds']:.4f}"})
+    print_table(rows, ['input', 'legacy s', 'tokenizer s'])
+
+    # Linear-time check: time per line must stay flat as the adversarial input grows 8x
+    base_lines = args.lines // 8
+    sizes = [base_lines * factor for factor in (1, 2, 4, 8)]
+    per_line = [rule_seconds(adversarial_razor(lines)) / lines for lines in sizes]
+    growth = per_line[-1] / per_line[0]
+    print(f"Time per line from {sizes[0]} to {sizes[-1]} lines grows {growth:.2f}x (linear: ~1x)")
+    if growth > 2.0:
+        print("ERROR: inline CSS/JavaScript rule is not linear in input size")
+        sys.exit(1)
+
+def bench_secrets(module, args):
+    """Secret scan throughput, per-pattern regex versus the literal prefilter, against an MB/s budget"""
+    validator = module.CodeValidator(args.root)
+    rule = validator.registry['no_hardcoded_secrets']
+    with contextlib.redirect_stdout(io.StringIO()):
+        sources = [(ctx.file_path, ctx.extension, ctx.content)
+                   for ctx in map(validator.load_file_context, select_files(validator, args)) if ctx is not None]
+    total_mb = sum(len(content) for _, _, content in sources) / 1e6
+    print(f"Scanning {len(sources)} files ({total_mb:.1f} MB) with {len(rule.patterns)} secret patterns")
+
+    def scan(prefilter: bool) -> List[Any]:
+        found = []
+        for file_path, extension, content in sources:
+            ctx = module.FileContext(file_path, extension, content, prefilter=prefilter)
+            found.extend(validator.run_rule(rule, ctx))
+        return found
+
+    rows = []
+    results = {}
+    for mode, prefilter in [('per-pattern regex', False), ('literal prefilter', True)]:
+        timing = measure(lambda: results.__setitem__(mode, scan(prefilter)), args.repeat)
+        rows.append({'mode': mode, 'wall s': f"{timing['seconds']:.3f}",
+                     'MB/s': f"{total_mb / max(timing['seconds'], 1e-9):.1f}", 'violations': len(results[mode])})
+    print_table(rows, ['mode', 'wall s', 'MB/s', 'violations'])
+
+    if results['per-pattern regex'] != results['literal prefilter']:
+        print("ERROR: the literal prefilter changed the secret findings")
+        sys.exit(1)
+    mbps = total_mb / max(timing['seconds'], 1e-9)
+    if mbps < args.min_mbps:
+        print(f"ERROR: secret scan ran at {mbps:.1f} MB/s, below the {args.min_mbps:.1f} MB/s budget")
+        sys.exit(1)
+
+def bench_diff(module, args):
+    """Whole-file validation versus diff-scoped validation after a one-line edit to every file"""
+    import diff_scope
+
+    validator = module.CodeValidator(args.root)
+    files = [f for f in select_files(validator, args) if f.endswith(('.cs', '.cshtml'))]
+    with contextlib.redirect_stdout(io.StringIO()):
+        sources = [(ctx.file_path, ctx.extension, ctx.content)
+                   for ctx in map(validator.load_file_context, files) if ctx is not None]
+    edits = []
+    for file_path, extension, content in sources:
+        lines = content.split('\n')
+        lines.insert(len(lines) // 2, '    // TODO: reviewed')
+        edits.append((file_path, extension, content, '\n'.join(lines)))
+    total_mb = sum(len(edited) for _, _, _, edited in edits) / 1e6
+    print(f"Editing one line in each of {len(edits)} files ({total_mb:.1f} MB)")
+
+    def whole_file() -> List[Any]:
+        found = []
+        for file_path, extension, original, edited in edits:
+            changed = diff_scope.changed_lines(original, edited)
+            found.extend(v for v in validator.validate_file(file_path, module.FileContext(file_path, extension, edited))
+                         if changed.contains(v.line_number))
+        return found
+
+    def diff_scoped() -> List[Any]:
+        found = []
+        for file_path, extension, original, edited in edits:
+            ctx = module.FileContext(file_path, extension, edited)
+            changed = diff_scope.changed_lines(original, edited)
+            ctx.restrict_to_lines(changed.expanded(module.DIFF_CONTEXT_LINES, len(ctx.lines)))
+            found.extend(v for v in validator.validate_file(file_path, ctx) if changed.contains(v.line_number))
+        return found
+
+    rows = []
+    results = {}
+    for mode, run in [('whole file', whole_file), ('changed lines', diff_scoped)]:
+        timing = measure(lambda: results.__setitem__(mode, run()), args.repeat)
+        rows.append({'mode': mode, 'wall s': f"{timing['seconds']:.3f}",
+                     'MB/s': f"{total_mb / max(timing['seconds'], 1e-9):.1f}", 'violations': len(results[mode])})
+    print_table(rows, ['mode', 'wall s', 'MB/s', 'violations'])
+    if results['whole file'] != results['changed lines']:
+        print("ERROR: diff-scoped validation reported different violations on the changed lines")
+        sys.exit(1)
+
+def bench_large_files(module, args):
+    """Whole-file versus chunked validation of the files over the large-file threshold, with peak memory"""
+    # The largest files are usually migrations, which would otherwise only get the secret scan
+    validator = module.CodeValidator(args.root, large_file_threshold=args.large_file_threshold,
+                                     classify_generated=False)
+    validator.chunk_chars = args.chunk_chars
+    files = [f for f in select_files(validator, args) if validator.is_large_file(f)]
+    if not files:
+        print(f"No files of {args.large_file_threshold} bytes or more under {args.root}")
+        return
+    total_mb = sum(os.path.getsize(validator.project_root / f) for f in files) / 1e6
+    print(f"Validating {len(files)} files of {args.large_file_threshold} bytes or more ({total_mb:.1f} MB) "
+          f"in chunks of {args.chunk_chars} characters")
+
+    def whole_file(file_path: str) -> List[Any]:
+        return validator.validate_file(file_path, validator.load_file_context(file_path))
+
+    rows = []
+    results = {}
+    for mode, validate in [('whole file', whole_file), ('chunked', validator.validate_large_file)]:
+        timing = measure(lambda: results.__setitem__(mode, [validate(f) for f in files]), args.repeat)
+        # Peak memory of the largest single file, over what was allocated before it
+        peak = 0
+        tracemalloc.start()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for file_path in files:
+                before, _ = tracemalloc.get_traced_memory()
+                tracemalloc.reset_peak()
+                validate(file_path)
+                peak = max(peak, tracemalloc.get_traced_memory()[1] - before)
+        tracemalloc.stop()
+        rows.append({'mode': mode, 'wall s': f"{timing['seconds']:.3f}", 'peak MB/file': f"{peak / 1e6:.2f}",
+                     'violations': sum(map(len, results[mode]))})
+    print_table(rows, ['mode', 'wall s', 'peak MB/file', 'violations'])
+
+    if results['whole file'] != results['chunked']:
+        print("ERROR: chunked validation reported different violations than whole-file validation")
+        sys.exit(1)
+
+    # A configured rule reports one message for all its patterns, so chunks are reordered by pattern index
+    rule = module.configured_rule({'id': 'even_odd', 'extensions': ['.cs'],
+                                   'patterns': [{'pattern': r'EVEN\d+'}, {'pattern': r'ODD\d+'}]})
+    with tempfile.TemporaryDirectory() as temp:
+        Path(temp, 'EvenOdd.cs').write_text(''.join(f'var x{i} = "{"ODD" if i % 2 else "EVEN"}{i}";\n'
+                                                    for i in range(1, 4001)))
+        ordered = module.CodeValidator(temp, classify_generated=False)
+        ordered.chunk_chars = args.chunk_chars
+        whole = ordered.run_rule(rule, ordered.load_file_context('EvenOdd.cs'))
+        if whole != ordered.validate_large_file('EvenOdd.cs', rules=(rule,)):
+            print("ERROR: chunked validation reordered the matches of a multi-pattern configured rule")
+            sys.exit(1)
+
+def bench_generated(module, args):
+    """Every rule on every file versus generated code getting only the rules that check it, with what the
+    classifier cost and what it saved"""
+    files = select_files(module.CodeValidator(args.root), args)
+    validators = {'all rules': module.CodeValidator(args.root, classify_generated=False),
+                  'generated skipped': module.CodeValidator(args.root)}
+    results = {}
+    rows = []
+    for mode, validator in validators.items():
+        timing = measure(lambda: results.__setitem__(mode, validator.validate_all_files(files)), args.repeat)
+        stats = results[mode]['generated']
+        rows.append({
+            'mode': mode,
+            'wall s': f"{timing['seconds']:.3f}",
+            'decoded MB': f"{timing['chars'] / 1e6:.1f}",
+            'generated files': stats.files if stats is not None else '-',
+            'runs skipped': stats.skipped_runs if stats is not None else '-',
+            'est. saved ms': f"{stats.saved_seconds * 1000:.0f}" if stats is not None else '-',
+            'classifier ms': f"{stats.classify_seconds * 1000:.1f}" if stats is not None else '-',
+            'violations': results[mode]['total_violations'],
+        })
+    print(f"Full fallback scan: {len(files)} files")
+    print_table(rows, ['mode', 'wall s', 'decoded MB', 'generated files', 'runs skipped', 'est. saved ms',
+                       'classifier ms', 'violations'])
+
+    # Hand-written files must get exactly the violations they got before
+    generated = validators['generated skipped'].generated
+    def hand_written(mode: str) -> List[Any]:
+        return [v for v in results[mode]['violations'] if generated.get(v.file_path, (None,))[0] is None]
+    if hand_written('all rules') != hand_written('generated skipped'):
+        print("ERROR: skipping generated code changed the violations of hand-written files")
+        sys.exit(1)
+
+def parse_importtime(log: str) -> List[Tuple[str, int]]:
+    """(module, cumulative microseconds) of every top-level import in a -X importtime log"""
+    imports = []
+    for line in log.splitlines():
+        match = re.match(r'import time:\s*(\d+) \|\s*(\d+) \| ( *)(\S+)', line)
+        if match and not match.group(3):
+            imports.append((match.group(4), int(match.group(2))))
+    return imports
+
+def measure_startup(corpus: Path, files: int, seed: int, dependency_files: int,
+                    repeat: int) -> Tuple[float, float, str]:
+    """(bare interpreter s, one-file hook run s, -X importtime log with the fewest import microseconds) of a
+    per-save run on one explicit file in a synthetic corpus, best of repeat runs"""
+    hook = [sys.executable, str(HOOKS_DIR / 'code-validation-hook.py'), '--json', '--jobs', '1']
+    synthetic_corpus.generate_corpus(corpus, files=files, seed=seed, giant_files=0, dependency_files=dependency_files)
+    target = str(sorted(corpus.rglob('*.cs'))[0].relative_to(corpus))
+    bare = measure(lambda: subprocess.run([sys.executable, '-c', 'pass']), repeat)['seconds']
+    # The first run saves the source index and the result cache, as a save would
+    subprocess.run(hook + [target], capture_output=True, cwd=corpus)
+    cold = measure(lambda: subprocess.run(hook + [target], capture_output=True, cwd=corpus), repeat)['seconds']
+    logs = [subprocess.run([sys.executable, '-X', 'importtime'] + hook[1:] + [target],
+                           capture_output=True, text=True, cwd=corpus).stderr for _ in range(repeat)]
+    return bare, cold, min(logs, key=lambda log: sum(us for _, us in parse_importtime(log)))
+
+def importtime_regressions(baseline_log: str, current_log: str, max_ratio: float = 1.5, slack_ms: float = 20.0,
+                           new_import_ms: float = 5.0) -> List[str]:
+    """How a run's top-level imports cost more than the recorded baseline: a total above max_ratio times the
+    baseline plus slack_ms, or an import the baseline does not have that takes over new_import_ms"""
+    baseline = dict(parse_importtime(baseline_log))
+    current = parse_importtime(current_log)
+    problems = []
+    baseline_ms = sum(baseline.values()) / 1000
+    current_ms = sum(us for _, us in current) / 1000
+    if current_ms > baseline_ms * max_ratio + slack_ms:
+        problems.append(f"top-level imports take {current_ms:.1f} ms, recorded {baseline_ms:.1f} ms")
+    for name, us in current:
+        if name not in baseline and us / 1000 > new_import_ms:
+            problems.append(f"new top-level import {name} takes {us / 1000:.1f} ms")
+    return problems
+
+def bench_startup(module, args):
+    """Cold start of a per-save run on one explicit file, against a budget over the bare interpreter and the
+    recorded -X importtime baseline"""
+    repeat = max(args.repeat, 5)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        corpus = Path(args.corpus_dir) if args.corpus_dir else Path(temp_dir) / 'corpus'
+        print(f"Validating one file in a {args.files}-file corpus, best of {repeat} runs")
+        bare, cold, importtime = measure_startup(corpus, args.files, args.seed, args.dependency_files, repeat)
+
+    log = Path(args.importtime_log)
+    log.parent.mkdir(parents=True, exist_ok=True)
+    log.write_text(f"# {git_commit()} python {sys.version.split()[0]}\n{importtime}", encoding='utf-8')
+    imports = sorted(parse_importtime(importtime), key=lambda item: item[1], reverse=True)
+    print_table([{'import': name, 'cumulative ms': f"{us / 1000:.1f}"} for name, us in imports[:args.top]],
+                ['import', 'cumulative ms'])
+    print(f"Import time log written to {log}")
+    if args.record_importtime:
+        IMPORTTIME_BASELINE.write_text(log.read_text(encoding='utf-8'), encoding='utf-8')
+        print(f"Import time baseline recorded in {IMPORTTIME_BASELINE.relative_to(HOOKS_DIR.parent)}")
+
+    overhead_ms = (cold - bare) * 1000
+    print_table([{'run': 'python -c pass', 'wall ms': f"{bare * 1000:.0f}"},
+                 {'run': 'hook, one file', 'wall ms': f"{cold * 1000:.0f}"}], ['run', 'wall ms'])
+    if overhead_ms > args.startup_budget_ms:
+        print(f"ERROR: single-file validation took {overhead_ms:.0f} ms over the bare interpreter, "
+              f"above the {args.startup_budget_ms:.0f} ms budget")
+        sys.exit(1)
+    regressions = importtime_regressions(IMPORTTIME_BASELINE.read_text(encoding='utf-8'), importtime)
+    for regression in regressions:
+        print(f"ERROR: {regression} (baseline: {IMPORTTIME_BASELINE.relative_to(HOOKS_DIR.parent)})")
+    if regressions:
+        sys.exit(1)
+
+def bench_symbols(module, args):
+    """Cold source index builds versus an incremental refresh after a single-file edit"""
+    validator = module.CodeValidator(args.root)
+    inventory = validator.walk_source_files()
+    version = module.rule_set_version()
+    index_classes = [module.SymbolIndex, module.EntityIndex]
+    covered = [entry[0] for entry in inventory if all(cls.covers(entry[0]) for cls in index_classes)]
+    if not covered:
+        print("No C# files covered by the source indexes")
+        return
+    edited = covered[len(covered) // 2]
+    print(f"Edited file: {edited}")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        def open_index(index_class):
+            index = index_class(validator.project_root, version)
+            index.path = Path(temp_dir) / index_class.INDEX_FILE
+            return index
+
+        def cold():
+            indexes = [open_index(index_class) for index_class in index_classes]
+            for index in indexes:
+                index.refresh(inventory)
+                index.save()
+            return indexes
+
+        def single_edit():
+            indexes = [open_index(index_class) for index_class in index_classes]
+            current = validator.walk_source_files()
+            for index in indexes:
+                index.load()
+                # Pretend one file changed on disk since the index was written
+                index.entries[edited]['mtime'] = -1
+                index.refresh(current)
+                validator._indexes[type(index)] = index
+            validator.validate_cross_file(edited)
+            return indexes
+
+        rows = []
+        results = {}
+        for mode, run in [('cold build', cold), ('single-file edit', single_edit)]:
+            timing = measure(lambda: results.__setitem__(mode, run()), args.repeat)
+            rows.append({
+                'mode': mode,
+                'files parsed': sum(index.parsed for index in results[mode]),
+                'wall ms': f"{timing['seconds'] * 1000:.1f}",
+            })
+        print_table(rows, ['mode', 'files parsed', 'wall ms'])
+
+    incremental_ms = float(rows[-1]['wall ms'])
+    if incremental_ms > args.budget_ms:
+        print(f"ERROR: single-file index refresh took {incremental_ms:.1f} ms (budget {args.budget_ms} ms)")
+        sys.exit(1)
+
+def bench_stream(module, args):
+    """Peak memory of the in-memory report versus the streamed JSON Lines report"""
+    validator = module.CodeValidator(args.root)
+    files = select_files(validator, args)
+    print(f"Validating {len(files)} files")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp = Path(temp_dir)
+
+        def in_memory():
+            results = validator.validate_all_files(files)
+            (temp / 'memory.md').write_text(validator.generate_report(results), encoding='utf-8')
+
+        def streamed():
+            stream = module.ViolationStream(temp / 'violations.jsonl', temp / 'violations.sarif')
+            results = validator.validate_all_files(files, stream=stream)
+            validator.write_report(results, temp / 'stream.md')
+
+        rows = []
+        for mode, run in [('in memory', in_memory), ('streamed', streamed)]:
+            tracemalloc.start()
+            with contextlib.redirect_stdout(io.StringIO()):
+                timing = measure(run, 1)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            rows.append({'mode': mode, 'peak MB': f"{peak / 1e6:.1f}", 'wall s': f"{timing['seconds']:.3f}"})
+        print_table(rows, ['mode', 'peak MB', 'wall s'])
+
+        if (temp / 'memory.md').read_bytes() != (temp / 'stream.md').read_bytes():
+            print("ERROR: streamed report differs from the in-memory report")
+            sys.exit(1)
+
+@dataclass
+class LegacyViolation:
+    """The per-instance dataclass violations used before rule metadata was shared"""
+    file_path: str
+    line_number: int
+    violation_type: str
+    severity: str
+    rule_id: str
+    message: str
+    suggestion: str
+
+def fresh(value):
+    """A new copy of a string, as an f-string per violation would have produced"""
+    return (value + '.')[:-1] if isinstance(value, str) else value
+
+def bench_violations(module, args):
+    """Memory held by violations as per-instance dataclasses versus compact records with shared metadata"""
+    validator = module.CodeValidator(args.root)
+    files = select_files(validator, args)
+    with contextlib.redirect_stdout(io.StringIO()):
+        found = validator.validate_all_files(files)['violations']
+    if not found:
+        print("No violations found to measure")
+        return
+    records = [violation.astuple() for violation in found]
+    count = max(args.files * 50, len(records))
+    print(f"Building {count} violations from the {len(records)} found in {len(files)} files")
+
+    rows = []
+    lists = {}
+    for mode, factory in [('dataclass', LegacyViolation), ('compact', module.ValidationViolation)]:
+        tracemalloc.start()
+        started = time.perf_counter()
+        lists[mode] = [factory(*map(fresh, records[index % len(records)])) for index in range(count)]
+        elapsed = time.perf_counter() - started
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        rows.append({'mode': mode, 'MB': f"{size / 1e6:.1f}", 'bytes/violation': f"{size / count:.0f}",
+                     'build s': f"{elapsed:.3f}"})
+    print_table(rows, ['mode', 'MB', 'bytes/violation', 'build s'])
+
+    if [v.__dict__ for v in lists['dataclass']] != [v.to_dict() for v in lists['compact']]:
+        print("ERROR: compact violations do not round-trip the dataclass fields")
+        sys.exit(1)
+
+def git_commit() -> str:
+    """Commit the benchmarked hook comes from, so result files can be compared across commits"""
+    result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, cwd=HOOKS_DIR)
+    commit = result.stdout.strip() if result.returncode == 0 else 'unknown'
+    status = subprocess.run(['git', 'status', '--porcelain', '--', '.'], capture_output=True, text=True, cwd=HOOKS_DIR)
+    return commit + ('-dirty' if status.stdout.strip() else '')
+
+def suite_timings(module, corpus: Path, repeat: int) -> Tuple[Dict[str, float], Dict[str, int]]:
+    """Discovery, every rule, report generation and end-to-end hook runs over one corpus"""
+    timings: Dict[str, float] = {}
+    timings['discovery'] = measure(lambda: module.CodeValidator(str(corpus)).walk_source_files(), repeat)['seconds']
+
+    validator = module.CodeValidator(str(corpus))
+    files = validator.get_all_source_files()
+    with contextlib.redirect_stdout(io.StringIO()):
+        contexts = [ctx for ctx in map(validator.load_file_context, files) if ctx is not None]
+    for rule in validator.registry.rules:
+        if rule.cross_file:
+            def run_rule(rule=rule):
+                validator._indexes.clear()
+                for file_path in files:
+                    if rule in validator.cross_file_rules_for(file_path):
+                        getattr(validator, rule.check)(file_path, rule)
+        else:
+            def run_rule(rule=rule):
+                for ctx in contexts:
+                    if rule in validator.rules_for(ctx.file_path) and ctx.contains_any(rule.triggers):
+                        validator.run_rule(rule, ctx)
+        timings[f'rule.{rule.rule_id}'] = measure(run_rule, repeat)['seconds']
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = validator.validate_all_files(files)
+    violations = {'total': results['total_violations'], **results['violations_by_severity']}
+    timings['report.in_memory'] = measure(lambda: validator.generate_report(results), repeat)['seconds']
+    with tempfile.TemporaryDirectory() as temp_dir:
+        def streamed_report():
+            stream = module.ViolationStream(Path(temp_dir) / 'violations.jsonl')
+            with contextlib.redirect_stdout(io.StringIO()):
+                streamed = validator.validate_all_files(files, stream=stream)
+            validator.write_report(streamed, Path(temp_dir) / 'report.md')
+        timings['validate_and_report.streamed'] = measure(streamed_report, repeat)['seconds']
+
+    hook = [sys.executable, str(HOOKS_DIR / 'code-validation-hook.py'), '--jobs', '1']
+    for mode, extra in [('cold', ['--no-cache']), ('warm', [])]:
+        if mode == 'warm':
+            subprocess.run(hook, capture_output=True, cwd=corpus)
+        timings[f'end_to_end.{mode}'] = measure(
+            lambda: subprocess.run(hook + extra, capture_output=True, cwd=corpus), repeat)['seconds']
+    return timings, violations
+
+def bench_suite(module, args):
+    """Timings over a reproducible synthetic corpus, saved as JSON and optionally compared to a baseline"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        corpus = Path(args.corpus_dir) if args.corpus_dir else Path(temp_dir) / 'corpus'
+        started = time.perf_counter()
+        manifest = synthetic_corpus.generate_corpus(corpus, files=args.files, seed=args.seed,
+                                                    giant_files=args.giant_files, giant_lines=args.giant_lines,
+                                                    dependency_files=args.dependency_files)
+        print(f"Generated corpus in {time.perf_counter() - started:.1f}s: "
+              + ', '.join(f'{count} {kind}' for kind, count in sorted(manifest['counts'].items())))
+        timings, violations = suite_timings(module, corpus, args.repeat)
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+        'cpus': os.cpu_count(),
+        'corpus': manifest,
+        'violations': violations,
+        'timings': timings,
+    }
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + '\n', encoding='utf-8')
+    print(f"Results written to {output}")
+
+    baseline = json.loads(Path(args.compare).read_text(encoding='utf-8')) if args.compare else None
+    if baseline is not None and baseline.get('corpus') != manifest:
+        print("WARNING: baseline was measured on a different corpus; ratios are not comparable")
+    elif baseline is not None and baseline.get('violations') != violations:
+        print(f"WARNING: violations changed from {baseline.get('violations')} to {violations}")
+    rows = []
+    regressions = []
+    for name, seconds in timings.items():
+        row = {'measurement': name, 'seconds': f"{seconds:.4f}"}
+        if baseline is not None:
+            before = baseline.get('timings', {}).get(name)
+            ratio = seconds / before if before else None
+            row['baseline'] = f"{before:.4f}" if before is not None else '-'
+            row['ratio'] = f"{ratio:.2f}x" if ratio is not None else '-'
+            # Ignore noise on measurements too short to time reliably
+            if ratio is not None and ratio > args.max_regression and seconds - before > 0.01:
+                regressions.append(name)
+        rows.append(row)
+    print_table(rows, ['measurement', 'seconds'] + (['baseline', 'ratio'] if baseline is not None else []))
+
+    if regressions:
+        print(f"ERROR: {len(regressions)} measurements regressed beyond {args.max_regression}x "
+              f"against {baseline.get('commit')}: {', '.join(regressions)}")
+        sys.exit(1)
+
+BENCHMARKS = {
+    'jobs': bench_jobs,
+    'baseline': bench_baseline,
+    'changes': bench_changes,
+    'diff': bench_diff,
+    'generated': bench_generated,
+    'large-files': bench_large_files,
+    'lexer': bench_lexer,
+    'line-index': bench_line_index,
+    'pipeline': bench_pipeline,
+    'razor': bench_razor,
+    'scanner': bench_scanner,
+    'secrets': bench_secrets,
+    'startup': bench_startup,
+    'stream': bench_stream,
+    'suite': bench_suite,
+    'symbols': bench_symbols,
+    'violations': bench_violations,
+    'walk': bench_walk,
+    'xmldoc': bench_xmldoc,
+}
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description='Benchmark the MeAndMyDog code validation hook')
+    parser.add_argument('benchmark', choices=sorted(BENCHMARKS), help='benchmark to run')
+    parser.add_argument('--root', default=os.getcwd(), help='project root to scan (default: cwd)')
+    parser.add_argument('--limit', type=int, default=0, help='only use the first N files')
+    parser.add_argument('--max-size', type=int, default=0, help='skip files larger than N bytes')
+    parser.add_argument('--repeat', type=int, default=1, help='runs per measurement, best time wins')
+    parser.add_argument('--lines', type=int, default=50000, help='lines in synthetic files')
+    parser.add_argument('--files', type=int, default=2000, help='source files in synthetic trees')
+    parser.add_argument('--dependency-files', type=int, default=20000, help='files in the synthetic node_modules')
+    parser.add_argument('--commits', type=int, default=5000, help='commits in the synthetic repository')
+    parser.add_argument('--days', type=int, default=2, help='recency window for discovery benchmarks')
+    parser.add_argument('--jobs', type=int, nargs='+', default=[1, 2, 4, 8], help='worker counts to compare')
+    parser.add_argument('--budget-ms', type=float, default=50.0, help='time budget for incremental benchmarks')
+    parser.add_argument('--min-mbps', type=float, default=10.0, help='throughput budget for the secrets benchmark')
+    parser.add_argument('--large-file-threshold', type=int, default=128 * 1024,
+                        help='files the large-files benchmark validates in chunks, in bytes (default: %(default)s)')
+    parser.add_argument('--chunk-chars', type=int, default=64 * 1024, help='chunk size for the large-files benchmark')
+    parser.add_argument('--startup-budget-ms', type=float, default=STARTUP_BUDGET_MS,
+                        help='cold start budget for one-file validation, over the bare interpreter')
+    parser.add_argument('--importtime-log', default=os.path.join('.validation-cache', 'importtime.txt'),
+                        help='where the startup benchmark writes its -X importtime log (default: %(default)s)')
+    parser.add_argument('--record-importtime', action='store_true',
+                        help='also record the startup benchmark\'s log as the committed import time baseline')
+    parser.add_argument('--top', type=int, default=10, help='slowest imports the startup benchmark lists')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the synthetic corpus')
+    parser.add_argument('--giant-files', type=int, default=3, help='migration-sized files in the synthetic corpus')
+    parser.add_argument('--giant-lines', type=int, default=20000, help='lines in each migration-sized file')
+    parser.add_argument('--corpus-dir', help='generate the suite corpus here and keep it, instead of a temp dir')
+    parser.add_argument('--output', default=os.path.join('.validation-cache', 'benchmark-results.json'),
+                        help='suite results file (default: %(default)s)')
+    parser.add_argument('--compare', help='suite results file from another commit to compare against')
+    parser.add_argument('--max-regression', type=float, default=1.5, help='slowdown ratio that fails --compare')
+    parser.add_argument('--use-root', action='store_true', help='run discovery benchmarks on --root instead of a synthetic tree')
+    args = parser.parse_args()
+
+    BENCHMARKS[args.benchmark](load_validator_module(), args)
+
+if __name__ == "__main__":
+    main()
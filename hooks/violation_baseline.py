@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Violation baseline for the code validation hook.
+A baseline records the violations a project already has, so a run reports
+and fails only on violations that are new. Each violation is fingerprinted
+from its rule id, its file, its line's text with whitespace collapsed and a
+hash of the lines around it, never from its line number, so a known
+violation keeps its fingerprint when code above it moves. Violations of
+file-scoped rules, which report a fixed line such as line 1, are
+fingerprinted from their rule id and file alone, so edits near the top of
+the file keep them known. Identical violations in one file are told apart
+by their order.
+
+The baseline is a JSON file of fingerprints per file, meant to be committed.
+It is loaded into one set, so checking a violation is a single lookup, and
+refreshing it is one pass over a run's violations that re-fingerprints only
+the files that run validated. Hard-coded secrets are never baselined: a
+leaked credential fails every run until it is removed.
+"""
+
+import hashlib
+import json
+import os
+from collections import deque
+from itertools import groupby
+from pathlib import Path
+from typing import AbstractSet, Any, Dict, Iterable, List, Mapping, Optional, Set
+
+BASELINE_FILE = '.validation-baseline.json'
+CONTEXT_LINES = 2  # lines above and below a violation hashed into its fingerprint
+# Rules whose violations a baseline never records or suppresses
+NEVER_BASELINED = frozenset({'no_hardcoded_secrets'})
+
+def normalize(line: str) -> str:
+    """A line with its whitespace collapsed, so re-indenting it keeps its fingerprint"""
+    return ' '.join(line.split())
+
+def read_lines(path: Path, line_numbers: Set[int], radius: int) -> Dict[int, str]:
+    """The lines within radius of the wanted 1-based line numbers, read one at a time in bounded memory"""
+    lines: Dict[int, str] = {}
+    last = max(line_numbers, default=0) + radius
+    recent: deque = deque(maxlen=radius + 1)  # (number, text) of the lines just read
+    pending = 0  # lines still to keep after a wanted line
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        for number, text in enumerate(f, 1):
+            recent.append((number, text.rstrip('\r\n')))
+            if number in line_numbers:
+                lines.update(recent)
+                pending = radius
+            elif pending:
+                lines[number] = recent[-1][1]
+                pending -= 1
+            if number >= last:
+                break
+    return lines
+
+def fingerprints_of(project_root: Path, file_path: str, violations: List[Any],
+                    file_scoped: AbstractSet[str] = frozenset(), lines: Optional[Mapping[int, str]] = None) -> List[str]:
+    """One fingerprint per violation of a file, in order; a file that cannot be read fingerprints as empty lines.
+    Violations of the file_scoped rule ids ignore their line. lines, the text around the violations from a copy
+    of the file already in memory, saves reading it again when it covers every line a fingerprint hashes"""
+    wanted = {violation.line_number for violation in violations if violation.rule_id not in file_scoped}
+    needed = {number for line_number in wanted for number in range(line_number - CONTEXT_LINES,
+                                                                   line_number + CONTEXT_LINES + 1)}
+    if lines is None or not needed.issubset(lines):
+        lines = {}
+        if wanted:
+            try:
+                lines = read_lines(project_root / file_path, wanted, CONTEXT_LINES)
+            except OSError:
+                pass
+    seen: Dict[str, int] = {}
+    fingerprints = []
+    for violation in violations:
+        if violation.rule_id in file_scoped:
+            key = '\0'.join((violation.rule_id, file_path.replace(os.sep, '/')))
+        else:
+            number = violation.line_number
+            context = [normalize(lines.get(line, '')) for line in range(number - CONTEXT_LINES,
+                                                                        number + CONTEXT_LINES + 1)
+                       if line != number]
+            context_hash = hashlib.sha1('\n'.join(filter(None, context)).encode('utf-8')).hexdigest()[:12]
+            key = '\0'.join((violation.rule_id, file_path.replace(os.sep, '/'), normalize(lines.get(number, '')),
+                             context_hash))
+        occurrence = seen[key] = seen.get(key, -1) + 1
+        digest = hashlib.sha1(f'{key}\0{occurrence}'.encode('utf-8')).hexdigest()[:20]
+        fingerprints.append(f'{violation.rule_id}:{digest}')
+    return fingerprints
+
+class ViolationBaseline:
+    """Known violation fingerprints of a project, per file on disk and as one set in memory"""
+
+    VERSION = 1
+
+    def __init__(self, project_root: Path, path: Path, file_scoped: Iterable[str] = ()):
+        self.project_root = Path(project_root)
+        self.path = self.project_root / path
+        self.file_scoped = frozenset(file_scoped)  # ids of rules whose violations are fingerprinted without a line
+        self.files: Dict[str, List[str]] = {}
+        self.fingerprints: Set[str] = set()
+        self.suppressed = 0
+
+    def load(self) -> bool:
+        """Load the baseline file, returning whether there was one"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not load baseline {self.path}: {e}")
+            return False
+        if data.get('version') != self.VERSION:
+            print(f"Warning: Ignoring baseline {self.path} written by another version")
+            return False
+        self.files = data.get('files', {})
+        self.fingerprints = {fingerprint for fingerprints in self.files.values() for fingerprint in fingerprints}
+        return True
+
+    def new_violations(self, file_path: str, violations: List[Any],
+                       lines: Optional[Mapping[int, str]] = None) -> List[Any]:
+        """The violations of one file that are not in the baseline, counting the rest as suppressed; lines, when
+        given, is the text around them from a copy of the file already in memory"""
+        known = [violation for violation in violations if violation.rule_id not in NEVER_BASELINED]
+        if not known or not self.fingerprints:
+            return violations
+        fingerprints = fingerprints_of(self.project_root, file_path, known, self.file_scoped, lines)
+        suppressed = {id(violation) for violation, fingerprint in zip(known, fingerprints)
+                      if fingerprint in self.fingerprints}
+        self.suppressed += len(suppressed)
+        return [violation for violation in violations if id(violation) not in suppressed]
+
+    def update(self, file_paths: Optional[Iterable[str]], violations: Iterable[Any]) -> int:
+        """Replace the fingerprints of the validated files (every file when None) with those of their current
+        violations, in one pass over a run's violations grouped by file, and write the baseline; returns the
+        fingerprint count"""
+        if file_paths is None:
+            self.files = {}
+        for file_path in file_paths or ():
+            self.files.pop(file_path.replace(os.sep, '/'), None)
+        violations = (violation for violation in violations if violation.rule_id not in NEVER_BASELINED)
+        for file_path, group in groupby(violations, key=lambda violation: violation.file_path):
+            self.files.setdefault(file_path.replace(os.sep, '/'), []).extend(
+                fingerprints_of(self.project_root, file_path, list(group), self.file_scoped))
+        self.fingerprints = {fingerprint for fingerprints in self.files.values() for fingerprint in fingerprints}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            # Sorted, one fingerprint per line, so baseline changes review like code
+            json.dump({'version': self.VERSION, 'files': dict(sorted(self.files.items()))}, f, indent=0,
+                      separators=(',', ':'))
+            f.write('\n')
+        os.replace(temp_path, self.path)
+        return len(self.fingerprints)